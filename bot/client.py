@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from datetime import datetime, timezone
 from typing import Any
@@ -8,12 +9,16 @@ from discord.ext import commands
 from bot.commands import register_commands
 from bot.events import register_event_handlers
 from config.settings import Settings
-from services.firestore import FirestoreService
 from services.member_profile import MemberProfileService
+from services.channel_summary import ChannelSummarizer
+from services.llm_usage import LlmUsageTracker
+from services.message_log import MessageLogWriter
 from services.outreach import OutreachService
 from services.primary_judge import PrimaryJudgeService
+from services.profile_coalescer import ProfileCoalescer
 from services.scheduler import SchedulerService
 from services.secondary_judge import SecondaryJudgeService
+from services.storage import StorageBackend
 from services.topic_generator import TopicGeneratorService
 from services.welcome import WelcomeService
 
@@ -24,10 +29,14 @@ class CommunityBot(commands.Bot):
     def __init__(
         self,
         settings: Settings,
-        firestore: FirestoreService,
+        storage: StorageBackend,
         primary_judge: PrimaryJudgeService,
         secondary_judge: SecondaryJudgeService,
         member_profile: MemberProfileService,
+        profile_coalescer: ProfileCoalescer,
+        message_log: MessageLogWriter,
+        llm_usage: LlmUsageTracker,
+        channel_summaries: ChannelSummarizer,
         welcome: WelcomeService,
         topic_generator: TopicGeneratorService,
         outreach: OutreachService,
@@ -39,10 +48,14 @@ class CommunityBot(commands.Bot):
 
         super().__init__(command_prefix="!", intents=intents)
         self.settings = settings
-        self.firestore = firestore
+        self.storage = storage
         self.primary_judge = primary_judge
         self.secondary_judge = secondary_judge
         self.member_profile = member_profile
+        self.profile_coalescer = profile_coalescer
+        self.message_log = message_log
+        self.llm_usage = llm_usage
+        self.channel_summaries = channel_summaries
         self.welcome = welcome
         self.topic_generator = topic_generator
         self.outreach = outreach
@@ -74,12 +87,20 @@ class CommunityBot(commands.Bot):
         }
 
     async def setup_hook(self) -> None:
-        loaded_config = await self.firestore.load_config()
+        await self.storage.start()
+        await self.profile_coalescer.start()
+        await self.llm_usage.start()
+        loaded_config = await self.storage.load_config()
         if loaded_config:
             bot_enabled = loaded_config.get("bot_enabled")
             if isinstance(bot_enabled, bool):
                 self.runtime["bot_enabled"] = bot_enabled
-            logger.info("Loaded bot config from Firestore.")
+            logger.info("Loaded bot config from storage.")
+        await self.storage.load_topic_ledger()
+        await asyncio.gather(
+            self.primary_judge.gemini.warm_up(),
+            self.secondary_judge.claude.warm_up(),
+        )
 
         register_event_handlers(self)
         register_commands(self)
@@ -96,4 +117,9 @@ class CommunityBot(commands.Bot):
 
     async def close(self) -> None:
         await self.scheduler.stop()
+        await self.profile_coalescer.close()
+        await self.channel_summaries.close()
+        await self.llm_usage.close()
+        await self.storage.close()
+        await self.secondary_judge.claude.aclose()
         await super().close()
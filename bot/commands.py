@@ -26,7 +26,7 @@ def _is_admin(interaction: discord.Interaction) -> bool:
 
 async def _set_bot_enabled(bot: discord.Client, enabled: bool) -> None:
     bot.runtime["bot_enabled"] = enabled
-    await bot.firestore.save_config_partial({"bot_enabled": enabled})
+    await bot.storage.save_config_partial({"bot_enabled": enabled})
 
 
 def register_commands(bot: discord.Client) -> None:
@@ -38,7 +38,10 @@ def register_commands(bot: discord.Client) -> None:
                 (datetime.now(timezone.utc) - started_at).total_seconds()
             )
 
-        firestore_state = "enabled" if bot.firestore.enabled else "disabled"
+        storage_label = bot.storage.name
+        if bot.storage.backend != bot.storage.name:
+            storage_label = f"{bot.storage.name}/{bot.storage.backend}"
+        storage_state = f"enabled ({storage_label})" if bot.storage.enabled else "disabled"
         primary_judge_state = "enabled" if bot.primary_judge.gemini.enabled else "fallback"
         secondary_judge_state = (
             "enabled" if bot.secondary_judge.claude.enabled else "fallback"
@@ -48,9 +51,48 @@ def register_commands(bot: discord.Client) -> None:
         lines = [
             "Bot status",
             f"- Bot enabled: {bot_enabled}",
-            f"- Firestore: {firestore_state}",
+            f"- Storage: {storage_state}",
+            (
+                "- Storage pending writes: "
+                f"{bot.storage.pending_writes}"
+                f"{' (write-ahead log)' if bot.storage.durable_queue else ''}"
+            ),
             f"- Primary judge (Gemini): {primary_judge_state}",
             f"- Secondary judge (Claude): {secondary_judge_state}",
+            f"- Gemini prompt cache: {bot.primary_judge.gemini.cache_stats.summary()}",
+            f"- Primary decision cache: {bot.primary_judge.cache.summary()}",
+            (
+                "- Primary decided by: "
+                + ", ".join(
+                    f"{stage}={count}"
+                    for stage, count in bot.primary_judge.stage_counts.items()
+                )
+            ),
+            f"- Claude prompt cache: {bot.secondary_judge.claude.cache_stats.summary()}",
+            f"- Claude early stream exits: {bot.secondary_judge.claude.early_exits}",
+            f"- Secondary context: {bot.secondary_judge.context_builder.summary()}",
+            (
+                "- Speculative retries: "
+                f"{bot.secondary_judge.speculation_stats['started']} started / "
+                f"{bot.secondary_judge.speculation_stats['used']} used / "
+                f"{bot.secondary_judge.speculation_stats['cancelled']} cancelled"
+            ),
+            f"- Channel summaries: {bot.channel_summaries.summary()}",
+            f"- Secondary alternatives used: {bot.secondary_judge.alternatives_used}",
+            (
+                "- Quality checks: "
+                f"{bot.secondary_judge.eval_stats['local']} local / "
+                f"{bot.secondary_judge.eval_stats['llm']} LLM"
+            ),
+            f"- Gemini limiter: {bot.primary_judge.gemini.limiter.summary()}",
+            f"- Claude limiter: {bot.secondary_judge.claude.limiter.summary()}",
+            f"- Gemini circuit: {bot.primary_judge.gemini.breaker.summary()}",
+            f"- Claude circuit: {bot.secondary_judge.claude.breaker.summary()}",
+            (
+                "- Primary hedges: "
+                f"{bot.primary_judge.hedge_stats['fired']} fired / "
+                f"{bot.primary_judge.hedge_stats['won']} won"
+            ),
             f"- Scheduler running: {bot.runtime.get('scheduler_running', False)}",
             (
                 "- Next topic run: "
@@ -67,6 +109,7 @@ def register_commands(bot: discord.Client) -> None:
                 f"{bot.runtime.get('primary_needs_intervention_count', 0)}"
             ),
             f"- Member profiles updated: {bot.runtime.get('member_profiles_updated', 0)}",
+            f"- Member profiles pending: {bot.profile_coalescer.dirty_count}",
             f"- Interventions today: {bot.runtime.get('interventions_today', 0)}",
             f"- Last message at: {_format_timestamp(bot.runtime.get('last_message_at'))}",
             f"- Last action at: {_format_timestamp(bot.runtime.get('last_action_at'))}",
@@ -94,6 +137,28 @@ def register_commands(bot: discord.Client) -> None:
         await _set_bot_enabled(bot, True)
         await interaction.response.send_message("Botを再開しました。", ephemeral=True)
 
+    async def bot_usage(interaction: discord.Interaction) -> None:
+        if not _is_admin(interaction):
+            await interaction.response.send_message(
+                "管理者のみ実行できます。",
+                ephemeral=True,
+            )
+            return
+        totals = bot.llm_usage.totals()
+        if not totals:
+            await interaction.response.send_message("LLM呼び出しはまだありません。", ephemeral=True)
+            return
+
+        lines = ["LLM usage since start"]
+        for key, usage in totals.items():
+            lines.append(
+                f"- {key}: {usage.calls} calls "
+                f"(err {usage.errors}, rej {usage.rejected}, cxl {usage.cancelled}) | "
+                f"tok in {usage.input_tokens} out {usage.output_tokens} cached {usage.cached_tokens} | "
+                f"avg {usage.avg_latency_seconds:.2f}s max {usage.max_latency_seconds:.2f}s"
+            )
+        await interaction.response.send_message("\n".join(lines), ephemeral=True)
+
     commands_to_add = [
         app_commands.Command(
             name="bot-status",
@@ -110,6 +175,11 @@ def register_commands(bot: discord.Client) -> None:
             description="Resume bot actions (admin only).",
             callback=bot_resume,
         ),
+        app_commands.Command(
+            name="bot-usage",
+            description="Show LLM token and latency usage by call site (admin only).",
+            callback=bot_usage,
+        ),
     ]
 
     if bot.settings.discord_guild_id is not None:
@@ -5,6 +5,8 @@ from uuid import uuid4
 import discord
 
 from models.message import MessageRecord
+from services.deadline import Deadline
+from services.message_log import MessageLifecycle
 
 logger = logging.getLogger(__name__)
 
@@ -303,7 +305,7 @@ async def _apply_feedback_on_new_user_message(
 
     pending[user_id] = keep_entries
     if user_scores:
-        await bot.firestore.update_member_intervention_preference(
+        await bot.storage.update_member_intervention_preference(
             member_id=user_id,
             preferences=user_scores,
         )
@@ -362,6 +364,260 @@ async def _resolve_text_channel(bot: discord.Client, channel_id: int) -> discord
     return None
 
 
+async def _handle_message(
+    bot: discord.Client,
+    message: discord.Message,
+    record: MessageRecord,
+    lifecycle: MessageLifecycle,
+    now: datetime,
+) -> None:
+    deadline = Deadline.after(bot.settings.message_deadline_seconds)
+    await lifecycle.ingest()
+
+    channel_name = getattr(message.channel, "name", "unknown")
+    channel_id = str(message.channel.id)
+    channel_type = _infer_channel_type(channel_name)
+
+    joined_at = getattr(message.author, "joined_at", None)
+    author_is_new = False
+    if isinstance(joined_at, datetime):
+        if joined_at.tzinfo is None:
+            joined_at = joined_at.replace(tzinfo=timezone.utc)
+        author_is_new = (now - joined_at) <= timedelta(days=7)
+
+    author_stats = _update_member_stats(
+        bot=bot,
+        member_id=str(message.author.id),
+        channel_name=channel_name,
+        now=now,
+        content=message.content,
+    )
+    _append_channel_history(
+        bot=bot,
+        channel_id=channel_id,
+        author_name=getattr(message.author, "display_name", message.author.name),
+        content=message.content,
+        created_at=record.timestamp,
+    )
+    channel_history = bot.runtime.get("channel_history", {}).get(channel_id, [])
+    await bot.channel_summaries.observe(channel_id, channel_history[-1])
+    recent_posts = [
+        str(item.get("content", ""))
+        for item in channel_history
+        if item.get("author")
+        == getattr(message.author, "display_name", message.author.name)
+    ][-10:]
+
+    profile_payload = bot.member_profile.build_realtime_profile(
+        message=message,
+        stats=author_stats,
+        recent_posts=recent_posts,
+        now=now,
+    )
+    await bot.profile_coalescer.submit(
+        str(message.author.id),
+        profile_payload,
+        counters={
+            "stats": {
+                "total_posts": 1,
+                "total_post_length": len(message.content),
+                "active_channel_counts": {channel_name: 1},
+                "active_hours": {str(now.astimezone().hour): 1},
+            },
+        },
+    )
+    bot.runtime["member_profiles_updated"] = int(bot.runtime["member_profiles_updated"]) + 1
+
+    if not bot.runtime.get("bot_enabled", True):
+        logger.info("Bot is paused. Skipping active intervention pipeline.")
+        return
+
+    recent_activity = _recent_channel_activity_count(bot, channel_id, now)
+    in_quiet_hours = _is_quiet_hours(
+        now.astimezone(),
+        bot.settings.bot_quiet_hours_start,
+        bot.settings.bot_quiet_hours_end,
+    )
+
+    primary_input = {
+        "message_content": message.content,
+        "channel_type": channel_type,
+        "hours_since_post": 0.0,
+        "has_reply": False,
+        "has_reaction": len(message.reactions) > 0,
+        "is_bot_mentioned": bool(bot.user and bot.user in message.mentions),
+        "author_is_new": author_is_new,
+        "recent_channel_activity": recent_activity,
+        "in_quiet_hours": in_quiet_hours,
+    }
+
+    decision = await bot.primary_judge.judge(primary_input, deadline=deadline)
+    await lifecycle.primary(primary_input, decision)
+    if decision.needs_intervention:
+        bot.runtime["primary_needs_intervention_count"] = int(
+            bot.runtime["primary_needs_intervention_count"]
+        ) + 1
+
+        can_intervene, skip_reason = _can_intervene(bot, in_quiet_hours)
+        secondary_result = None
+        action_outcome = "skipped"
+        action_ref: str | None = None
+        action_reason = skip_reason
+
+        if can_intervene:
+            channel_context = bot.channel_summaries.recent(channel_history)
+            author_profile = _make_author_profile(message, author_stats)
+            author_profile["interests"] = profile_payload.get("interests", {})
+            author_profile["context"] = profile_payload.get("context", {})
+            emotional_tone = _estimate_emotional_tone(channel_history)
+            recent_bot_interventions_for_author = _count_recent_bot_interventions_for_user(
+                bot=bot,
+                user_id=str(message.author.id),
+                now=now,
+            )
+            preferred_types = _collect_preferred_types(bot, str(message.author.id))
+            secondary_input = {
+                "message_content": message.content,
+                "channel_summary": bot.channel_summaries.summary_for(channel_id),
+                "channel_context": channel_context,
+                "channel_type": channel_type,
+                "author_profile": author_profile,
+                "conversation_signals": {
+                    "emotional_tone": emotional_tone,
+                    "recent_bot_interventions_for_author": recent_bot_interventions_for_author,
+                    "hours_since_author_last_post": _estimated_hours_since_last_post(
+                        author_stats,
+                        now,
+                    ),
+                    "estimated_unreplied_hours": 0.0,
+                    "preferred_intervention_types": preferred_types,
+                },
+                "time_context": {
+                    "now": now.astimezone().isoformat(),
+                    "weekday": now.astimezone().strftime("%A"),
+                    "hour": now.astimezone().hour,
+                },
+                "bot_recent_actions": bot.runtime.get("bot_recent_actions", []),
+            }
+            secondary_result = await bot.secondary_judge.judge(secondary_input, deadline=deadline)
+
+            if _is_same_type_on_cooldown(
+                bot=bot,
+                user_id=str(message.author.id),
+                intervention_type=secondary_result.intervention_type,
+                now=now,
+            ):
+                secondary_result.intervention_type = "silent"
+                secondary_result.content = ""
+                secondary_result.reasoning += " / same_type_cooldown"
+                secondary_result.silence_confidence = max(
+                    secondary_result.silence_confidence,
+                    0.85,
+                )
+
+            try:
+                action_outcome, action_ref = await _execute_secondary_action(
+                    message=message,
+                    intervention_type=secondary_result.intervention_type,
+                    content=secondary_result.content,
+                    mention_users=secondary_result.mention_users,
+                    reaction_emoji=secondary_result.reaction_emoji,
+                )
+                action_reason = secondary_result.reasoning
+                if action_outcome != "silent":
+                    bot.runtime["interventions_today"] = int(
+                        bot.runtime["interventions_today"]
+                    ) + 1
+                    bot.runtime["last_action_at"] = now
+                    _append_recent_bot_action(
+                        bot=bot,
+                        intervention_type=secondary_result.intervention_type,
+                        channel_id=channel_id,
+                        target_message_id=record.message_id,
+                        target_user_id=str(message.author.id),
+                        timestamp=now,
+                    )
+                    _set_type_cooldown(
+                        bot=bot,
+                        user_id=str(message.author.id),
+                        intervention_type=secondary_result.intervention_type,
+                        now=now,
+                    )
+                    _register_pending_intervention_feedback(
+                        bot=bot,
+                        user_id=str(message.author.id),
+                        intervention_type=secondary_result.intervention_type,
+                        now=now,
+                    )
+                    await lifecycle.mark_bot_action(
+                        action_type=secondary_result.intervention_type,
+                        action_at=now,
+                    )
+            except Exception:
+                logger.exception("Failed to execute secondary action.")
+                action_outcome = "failed"
+                action_reason = "action_execution_failed"
+
+        action_id = f"{record.message_id}-{uuid4().hex[:8]}"
+        if secondary_result is None:
+            secondary_payload: dict[str, object] = {
+                "intervention_type": "silent",
+                "tone": "warm",
+                "content": "",
+                "mention_users": [],
+                "reaction_emoji": None,
+                "confidence": 0.0,
+                "silence_confidence": 1.0,
+                "quality_score": 0.0,
+                "reasoning": f"skipped:{skip_reason}",
+                "model": "skip-rule",
+            }
+        else:
+            secondary_payload = secondary_result.to_dict()
+
+        await lifecycle.action(
+            action_id=action_id,
+            payload={
+                "type": secondary_payload.get("intervention_type"),
+                "channel_id": channel_id,
+                "target_user_id": str(message.author.id),
+                "target_message_id": record.message_id,
+                "content": secondary_payload.get("content", ""),
+                "reasoning": action_reason,
+                "confidence": secondary_payload.get("confidence", 0.0),
+                "silence_confidence": secondary_payload.get("silence_confidence", 0.0),
+                "quality_score": secondary_payload.get("quality_score", 0.0),
+                "timestamp": now,
+                "model": secondary_payload.get("model"),
+                "primary_decision": decision.to_dict(),
+                "secondary_decision": secondary_payload,
+                "outcome": {
+                    "status": action_outcome,
+                    "action_ref": action_ref,
+                },
+            },
+        )
+
+    logger.info(
+        "[#%s] %s: %s",
+        channel_name,
+        getattr(message.author, "display_name", message.author.name),
+        message.content[:80],
+    )
+    logger.info(
+        "PrimaryJudge => needs_intervention=%s priority=%s reason=%s",
+        decision.needs_intervention,
+        decision.priority,
+        decision.reason,
+    )
+    if decision.needs_intervention:
+        logger.info(
+            "Intervention runtime count: %s/%s",
+            bot.runtime.get("interventions_today", 0),
+            bot.settings.bot_daily_intervention_limit,
+        )
+
+
 def register_event_handlers(bot: discord.Client) -> None:
     @bot.event
     async def on_ready() -> None:
@@ -382,238 +638,11 @@ def register_event_handlers(bot: discord.Client) -> None:
         bot.runtime["last_message_at"] = now
 
         record = MessageRecord.from_discord(message)
-        await bot.firestore.save_message(record)
-
-        channel_name = getattr(message.channel, "name", "unknown")
-        channel_id = str(message.channel.id)
-        channel_type = _infer_channel_type(channel_name)
-
-        joined_at = getattr(message.author, "joined_at", None)
-        author_is_new = False
-        if isinstance(joined_at, datetime):
-            if joined_at.tzinfo is None:
-                joined_at = joined_at.replace(tzinfo=timezone.utc)
-            author_is_new = (now - joined_at) <= timedelta(days=7)
-
-        author_stats = _update_member_stats(
-            bot=bot,
-            member_id=str(message.author.id),
-            channel_name=channel_name,
-            now=now,
-            content=message.content,
-        )
-        _append_channel_history(
-            bot=bot,
-            channel_id=channel_id,
-            author_name=getattr(message.author, "display_name", message.author.name),
-            content=message.content,
-            created_at=record.timestamp,
-        )
-        channel_history = bot.runtime.get("channel_history", {}).get(channel_id, [])
-        recent_posts = [
-            str(item.get("content", ""))
-            for item in channel_history
-            if item.get("author")
-            == getattr(message.author, "display_name", message.author.name)
-        ][-10:]
-
-        profile_payload = bot.member_profile.build_realtime_profile(
-            message=message,
-            stats=author_stats,
-            recent_posts=recent_posts,
-            now=now,
-        )
-        await bot.firestore.save_member_profile(str(message.author.id), profile_payload)
-        bot.runtime["member_profiles_updated"] = int(bot.runtime["member_profiles_updated"]) + 1
-
-        if not bot.runtime.get("bot_enabled", True):
-            logger.info("Bot is paused. Skipping active intervention pipeline.")
-            return
-
-        recent_activity = _recent_channel_activity_count(bot, channel_id, now)
-        in_quiet_hours = _is_quiet_hours(
-            now.astimezone(),
-            bot.settings.bot_quiet_hours_start,
-            bot.settings.bot_quiet_hours_end,
-        )
-
-        primary_input = {
-            "message_content": message.content,
-            "channel_type": channel_type,
-            "hours_since_post": 0.0,
-            "has_reply": False,
-            "has_reaction": len(message.reactions) > 0,
-            "is_bot_mentioned": bool(bot.user and bot.user in message.mentions),
-            "author_is_new": author_is_new,
-            "recent_channel_activity": recent_activity,
-            "in_quiet_hours": in_quiet_hours,
-        }
-
-        decision = await bot.primary_judge.judge(primary_input)
-        await bot.firestore.save_primary_decision(record.message_id, primary_input, decision)
-        if decision.needs_intervention:
-            bot.runtime["primary_needs_intervention_count"] = int(
-                bot.runtime["primary_needs_intervention_count"]
-            ) + 1
-
-            can_intervene, skip_reason = _can_intervene(bot, in_quiet_hours)
-            secondary_result = None
-            action_outcome = "skipped"
-            action_ref: str | None = None
-            action_reason = skip_reason
-
-            if can_intervene:
-                channel_context = channel_history
-                author_profile = _make_author_profile(message, author_stats)
-                author_profile["interests"] = profile_payload.get("interests", {})
-                author_profile["context"] = profile_payload.get("context", {})
-                emotional_tone = _estimate_emotional_tone(channel_context)
-                recent_bot_interventions_for_author = _count_recent_bot_interventions_for_user(
-                    bot=bot,
-                    user_id=str(message.author.id),
-                    now=now,
-                )
-                preferred_types = _collect_preferred_types(bot, str(message.author.id))
-                secondary_input = {
-                    "message_content": message.content,
-                    "channel_context": channel_context,
-                    "channel_type": channel_type,
-                    "author_profile": author_profile,
-                    "conversation_signals": {
-                        "emotional_tone": emotional_tone,
-                        "recent_bot_interventions_for_author": recent_bot_interventions_for_author,
-                        "hours_since_author_last_post": _estimated_hours_since_last_post(
-                            author_stats,
-                            now,
-                        ),
-                        "estimated_unreplied_hours": 0.0,
-                        "preferred_intervention_types": preferred_types,
-                    },
-                    "time_context": {
-                        "now": now.astimezone().isoformat(),
-                        "weekday": now.astimezone().strftime("%A"),
-                        "hour": now.astimezone().hour,
-                    },
-                    "bot_recent_actions": bot.runtime.get("bot_recent_actions", []),
-                }
-                secondary_result = await bot.secondary_judge.judge(secondary_input)
-
-                if _is_same_type_on_cooldown(
-                    bot=bot,
-                    user_id=str(message.author.id),
-                    intervention_type=secondary_result.intervention_type,
-                    now=now,
-                ):
-                    secondary_result.intervention_type = "silent"
-                    secondary_result.content = ""
-                    secondary_result.reasoning += " / same_type_cooldown"
-                    secondary_result.silence_confidence = max(
-                        secondary_result.silence_confidence,
-                        0.85,
-                    )
-
-                try:
-                    action_outcome, action_ref = await _execute_secondary_action(
-                        message=message,
-                        intervention_type=secondary_result.intervention_type,
-                        content=secondary_result.content,
-                        mention_users=secondary_result.mention_users,
-                        reaction_emoji=secondary_result.reaction_emoji,
-                    )
-                    action_reason = secondary_result.reasoning
-                    if action_outcome != "silent":
-                        bot.runtime["interventions_today"] = int(
-                            bot.runtime["interventions_today"]
-                        ) + 1
-                        bot.runtime["last_action_at"] = now
-                        _append_recent_bot_action(
-                            bot=bot,
-                            intervention_type=secondary_result.intervention_type,
-                            channel_id=channel_id,
-                            target_message_id=record.message_id,
-                            target_user_id=str(message.author.id),
-                            timestamp=now,
-                        )
-                        _set_type_cooldown(
-                            bot=bot,
-                            user_id=str(message.author.id),
-                            intervention_type=secondary_result.intervention_type,
-                            now=now,
-                        )
-                        _register_pending_intervention_feedback(
-                            bot=bot,
-                            user_id=str(message.author.id),
-                            intervention_type=secondary_result.intervention_type,
-                            now=now,
-                        )
-                        await bot.firestore.update_message_bot_action(
-                            message_id=record.message_id,
-                            action_type=secondary_result.intervention_type,
-                            action_at=now,
-                        )
-                except Exception:
-                    logger.exception("Failed to execute secondary action.")
-                    action_outcome = "failed"
-                    action_reason = "action_execution_failed"
-
-            action_id = f"{record.message_id}-{uuid4().hex[:8]}"
-            if secondary_result is None:
-                secondary_payload: dict[str, object] = {
-                    "intervention_type": "silent",
-                    "tone": "warm",
-                    "content": "",
-                    "mention_users": [],
-                    "reaction_emoji": None,
-                    "confidence": 0.0,
-                    "silence_confidence": 1.0,
-                    "quality_score": 0.0,
-                    "reasoning": f"skipped:{skip_reason}",
-                    "model": "skip-rule",
-                }
-            else:
-                secondary_payload = secondary_result.to_dict()
-
-            await bot.firestore.save_bot_action(
-                action_id=action_id,
-                payload={
-                    "type": secondary_payload.get("intervention_type"),
-                    "channel_id": channel_id,
-                    "target_user_id": str(message.author.id),
-                    "target_message_id": record.message_id,
-                    "content": secondary_payload.get("content", ""),
-                    "reasoning": action_reason,
-                    "confidence": secondary_payload.get("confidence", 0.0),
-                    "silence_confidence": secondary_payload.get("silence_confidence", 0.0),
-                    "quality_score": secondary_payload.get("quality_score", 0.0),
-                    "timestamp": now,
-                    "model": secondary_payload.get("model"),
-                    "primary_decision": decision.to_dict(),
-                    "secondary_decision": secondary_payload,
-                    "outcome": {
-                        "status": action_outcome,
-                        "action_ref": action_ref,
-                    },
-                },
-            )
-
-        logger.info(
-            "[#%s] %s: %s",
-            channel_name,
-            getattr(message.author, "display_name", message.author.name),
-            message.content[:80],
-        )
-        logger.info(
-            "PrimaryJudge => needs_intervention=%s priority=%s reason=%s",
-            decision.needs_intervention,
-            decision.priority,
-            decision.reason,
-        )
-        if decision.needs_intervention:
-            logger.info(
-                "Intervention runtime count: %s/%s",
-                bot.runtime.get("interventions_today", 0),
-                bot.settings.bot_daily_intervention_limit,
-            )
+        lifecycle = bot.message_log.begin(record)
+        try:
+            await _handle_message(bot, message, record, lifecycle, now)
+        finally:
+            await lifecycle.commit()
 
     @bot.event
     async def on_member_join(member: discord.Member) -> None:
@@ -621,7 +650,7 @@ def register_event_handlers(bot: discord.Client) -> None:
         now = datetime.now(timezone.utc)
 
         if not bot.runtime.get("bot_enabled", True):
-            await bot.firestore.save_bot_action(
+            await bot.storage.save_bot_action(
                 action_id=f"welcome-skipped-{uuid4().hex[:8]}",
                 payload={
                     "type": "welcome",
@@ -642,7 +671,7 @@ def register_event_handlers(bot: discord.Client) -> None:
 
         welcome_channel_id = bot.settings.welcome_channel_id
         if welcome_channel_id is None:
-            await bot.firestore.save_bot_action(
+            await bot.storage.save_bot_action(
                 action_id=f"welcome-skipped-{uuid4().hex[:8]}",
                 payload={
                     "type": "welcome",
@@ -663,7 +692,7 @@ def register_event_handlers(bot: discord.Client) -> None:
 
         channel = await _resolve_text_channel(bot, welcome_channel_id)
         if channel is None:
-            await bot.firestore.save_bot_action(
+            await bot.storage.save_bot_action(
                 action_id=f"welcome-failed-{uuid4().hex[:8]}",
                 payload={
                     "type": "welcome",
@@ -689,7 +718,7 @@ def register_event_handlers(bot: discord.Client) -> None:
             )
             send_text = f"{member.mention}\n{welcome_text}"
             sent = await channel.send(send_text)
-            await bot.firestore.save_bot_action(
+            await bot.storage.save_bot_action(
                 action_id=f"welcome-{uuid4().hex[:8]}",
                 payload={
                     "type": "welcome",
@@ -709,7 +738,7 @@ def register_event_handlers(bot: discord.Client) -> None:
             bot.runtime["last_action_at"] = now
         except Exception:
             logger.exception("Failed to post welcome message.")
-            await bot.firestore.save_bot_action(
+            await bot.storage.save_bot_action(
                 action_id=f"welcome-failed-{uuid4().hex[:8]}",
                 payload={
                     "type": "welcome",
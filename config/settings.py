@@ -42,6 +42,16 @@ def _parse_int_list(name: str) -> list[int]:
     return values
 
 
+def _parse_str_list(name: str, default: list[str]) -> list[str]:
+    raw_value = os.getenv(name)
+    if raw_value is None:
+        return list(default)
+    values = [token.strip().lower() for token in raw_value.split(",") if token.strip()]
+    if values == ["none"]:
+        return []
+    return values
+
+
 @dataclass(slots=True)
 class Settings:
     discord_token: str
@@ -49,6 +59,39 @@ class Settings:
     google_cloud_project: str | None
     gemini_api_key: str | None
     anthropic_api_key: str | None
+    llm_max_connections: int
+    llm_max_retries: int
+    claude_requests_per_minute: int
+    claude_tokens_per_minute: int
+    gemini_requests_per_minute: int
+    gemini_tokens_per_minute: int
+    llm_breaker_window_seconds: int
+    llm_breaker_min_calls: int
+    llm_breaker_error_rate_percent: int
+    llm_breaker_p95_latency_ms: int
+    llm_breaker_open_seconds: int
+    message_deadline_seconds: int
+    primary_stage_timeout_seconds: int
+    secondary_stage_timeout_seconds: int
+    primary_hedge_enabled: bool
+    secondary_streaming: bool
+    secondary_speculative: bool
+    secondary_candidates: int
+    quality_uncertain_low_percent: int
+    quality_uncertain_high_percent: int
+    quality_calibration_scale_percent: int
+    quality_calibration_offset_percent: int
+    llm_usage_flush_seconds: int
+    secondary_context_max_tokens: int
+    secondary_context_max_message_chars: int
+    channel_summary_every_messages: int
+    channel_summary_every_minutes: int
+    channel_summary_recent_turns: int
+    primary_cache_max_entries: int
+    primary_cache_ttl_seconds: int
+    primary_batch_max_size: int
+    primary_batch_max_wait_ms: int
+    primary_prefilter_rules: list[str]
     bot_daily_topic_limit: int
     bot_daily_intervention_limit: int
     bot_quiet_hours_start: int
@@ -68,6 +111,17 @@ class Settings:
     inactive_check_weekday: str
     inactive_check_hour: int
     inactive_dm_dry_run: bool
+    storage_backend: str
+    sqlite_path: str
+    message_record_mode: str
+    firestore_write_behind: bool
+    firestore_batch_max_size: int
+    firestore_batch_max_age_ms: int
+    firestore_backend: str
+    firestore_max_in_flight: int
+    firestore_wal_path: str | None
+    profile_persist_window_seconds: int
+    profile_cache_max_members: int
 
 
 def get_settings() -> Settings:
@@ -90,6 +144,62 @@ def get_settings() -> Settings:
         google_cloud_project=os.getenv("GOOGLE_CLOUD_PROJECT"),
         gemini_api_key=os.getenv("GEMINI_API_KEY"),
         anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
+        llm_max_connections=_parse_int("LLM_MAX_CONNECTIONS", 20) or 20,
+        llm_max_retries=_parse_int("LLM_MAX_RETRIES", 3) or 0,
+        claude_requests_per_minute=_parse_int("CLAUDE_REQUESTS_PER_MINUTE", 50) or 0,
+        claude_tokens_per_minute=_parse_int("CLAUDE_TOKENS_PER_MINUTE", 40000) or 0,
+        gemini_requests_per_minute=_parse_int("GEMINI_REQUESTS_PER_MINUTE", 1000) or 0,
+        gemini_tokens_per_minute=_parse_int("GEMINI_TOKENS_PER_MINUTE", 1000000) or 0,
+        llm_breaker_window_seconds=_parse_int("LLM_BREAKER_WINDOW_SECONDS", 60) or 60,
+        llm_breaker_min_calls=_parse_int("LLM_BREAKER_MIN_CALLS", 5) or 5,
+        llm_breaker_error_rate_percent=(
+            _parse_int("LLM_BREAKER_ERROR_RATE_PERCENT", 50) or 50
+        ),
+        llm_breaker_p95_latency_ms=_parse_int("LLM_BREAKER_P95_LATENCY_MS", 4000) or 4000,
+        llm_breaker_open_seconds=_parse_int("LLM_BREAKER_OPEN_SECONDS", 30) or 30,
+        message_deadline_seconds=_parse_int("MESSAGE_DEADLINE_SECONDS", 20) or 20,
+        primary_stage_timeout_seconds=(
+            _parse_int("PRIMARY_STAGE_TIMEOUT_SECONDS", 5) or 5
+        ),
+        secondary_stage_timeout_seconds=(
+            _parse_int("SECONDARY_STAGE_TIMEOUT_SECONDS", 12) or 12
+        ),
+        primary_hedge_enabled=_parse_bool("PRIMARY_HEDGE_ENABLED", True),
+        secondary_streaming=_parse_bool("SECONDARY_STREAMING", True),
+        secondary_speculative=_parse_bool("SECONDARY_SPECULATIVE", False),
+        secondary_candidates=_parse_int("SECONDARY_CANDIDATES", 1) or 1,
+        quality_uncertain_low_percent=_parse_int("QUALITY_UNCERTAIN_LOW_PERCENT", 55) or 0,
+        quality_uncertain_high_percent=_parse_int("QUALITY_UNCERTAIN_HIGH_PERCENT", 80) or 0,
+        quality_calibration_scale_percent=(
+            _parse_int("QUALITY_CALIBRATION_SCALE_PERCENT", 100) or 100
+        ),
+        quality_calibration_offset_percent=(
+            _parse_int("QUALITY_CALIBRATION_OFFSET_PERCENT", 0) or 0
+        ),
+        llm_usage_flush_seconds=_parse_int("LLM_USAGE_FLUSH_SECONDS", 300) or 300,
+        secondary_context_max_tokens=(
+            _parse_int("SECONDARY_CONTEXT_MAX_TOKENS", 1500) or 1500
+        ),
+        secondary_context_max_message_chars=(
+            _parse_int("SECONDARY_CONTEXT_MAX_MESSAGE_CHARS", 400) or 400
+        ),
+        channel_summary_every_messages=(
+            _parse_int("CHANNEL_SUMMARY_EVERY_MESSAGES", 15) or 15
+        ),
+        channel_summary_every_minutes=(
+            _parse_int("CHANNEL_SUMMARY_EVERY_MINUTES", 10) or 10
+        ),
+        channel_summary_recent_turns=(
+            _parse_int("CHANNEL_SUMMARY_RECENT_TURNS", 6) or 6
+        ),
+        primary_cache_max_entries=_parse_int("PRIMARY_CACHE_MAX_ENTRIES", 1024) or 1024,
+        primary_cache_ttl_seconds=_parse_int("PRIMARY_CACHE_TTL_SECONDS", 600) or 600,
+        primary_batch_max_size=_parse_int("PRIMARY_BATCH_MAX_SIZE", 8) or 8,
+        primary_batch_max_wait_ms=_parse_int("PRIMARY_BATCH_MAX_WAIT_MS", 200) or 200,
+        primary_prefilter_rules=_parse_str_list(
+            "PRIMARY_PREFILTER_RULES",
+            ["mention", "quiet_hours", "active_conversation", "already_reacted"],
+        ),
         bot_daily_topic_limit=_parse_int("BOT_DAILY_TOPIC_LIMIT", 3) or 3,
         bot_daily_intervention_limit=(
             _parse_int("BOT_DAILY_INTERVENTION_LIMIT", 20) or 20
@@ -113,4 +223,25 @@ def get_settings() -> Settings:
         inactive_check_weekday=os.getenv("INACTIVE_CHECK_WEEKDAY", "MON"),
         inactive_check_hour=_parse_int("INACTIVE_CHECK_HOUR", 10) or 10,
         inactive_dm_dry_run=_parse_bool("INACTIVE_DM_DRY_RUN", True),
+        storage_backend=os.getenv("STORAGE_BACKEND", "firestore").strip().lower() or "firestore",
+        sqlite_path=(
+            os.getenv("SQLITE_PATH", "").strip() or "data/community_bot.sqlite3"
+        ),
+        message_record_mode=(
+            os.getenv("MESSAGE_RECORD_MODE", "split").strip().lower() or "split"
+        ),
+        firestore_write_behind=_parse_bool("FIRESTORE_WRITE_BEHIND", True),
+        firestore_batch_max_size=_parse_int("FIRESTORE_BATCH_MAX_SIZE", 20) or 20,
+        firestore_batch_max_age_ms=(
+            _parse_int("FIRESTORE_BATCH_MAX_AGE_MS", 1000) or 1000
+        ),
+        firestore_backend=os.getenv("FIRESTORE_BACKEND", "sync").strip().lower() or "sync",
+        firestore_max_in_flight=_parse_int("FIRESTORE_MAX_IN_FLIGHT", 8) or 8,
+        firestore_wal_path=os.getenv("FIRESTORE_WAL_PATH", "").strip() or None,
+        profile_persist_window_seconds=(
+            _parse_int("PROFILE_PERSIST_WINDOW_SECONDS", 60) or 60
+        ),
+        profile_cache_max_members=(
+            _parse_int("PROFILE_CACHE_MAX_MEMBERS", 1000) or 1000
+        ),
     )
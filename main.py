@@ -2,14 +2,22 @@ import logging
 
 from bot.client import CommunityBot
 from config.settings import get_settings
+from services.channel_summary import ChannelSummarizer
+from services.circuit_breaker import CircuitBreaker
 from services.claude import ClaudeClient
-from services.firestore import FirestoreService
+from services.context_builder import ContextBuilder
+from services.decision_cache import DecisionCache
 from services.gemini import GeminiClient
+from services.llm_usage import LlmUsageTracker
 from services.member_profile import MemberProfileService
+from services.message_log import MessageLogWriter
 from services.outreach import OutreachService
 from services.primary_judge import PrimaryJudgeService
+from services.profile_coalescer import ProfileCoalescer
+from services.quality_scorer import QualityScorer
 from services.scheduler import SchedulerService
 from services.secondary_judge import SecondaryJudgeService
+from services.storage import create_storage
 from services.topic_generator import TopicGeneratorService
 from services.welcome import WelcomeService
 
@@ -21,12 +29,83 @@ def main() -> None:
     )
 
     settings = get_settings()
-    firestore_service = FirestoreService(project_id=settings.google_cloud_project)
-    gemini_client = GeminiClient(api_key=settings.gemini_api_key)
-    primary_judge_service = PrimaryJudgeService(gemini=gemini_client)
-    claude_client = ClaudeClient(api_key=settings.anthropic_api_key)
-    secondary_judge_service = SecondaryJudgeService(claude=claude_client)
+
+    def build_breaker(name: str) -> CircuitBreaker:
+        return CircuitBreaker(
+            name=name,
+            window_seconds=settings.llm_breaker_window_seconds,
+            min_calls=settings.llm_breaker_min_calls,
+            error_rate_threshold=settings.llm_breaker_error_rate_percent / 100.0,
+            p95_latency_threshold_seconds=settings.llm_breaker_p95_latency_ms / 1000.0,
+            open_seconds=settings.llm_breaker_open_seconds,
+        )
+
+    storage = create_storage(settings)
+    llm_usage = LlmUsageTracker(
+        storage=storage,
+        flush_interval_seconds=settings.llm_usage_flush_seconds,
+    )
+    gemini_client = GeminiClient(
+        api_key=settings.gemini_api_key,
+        max_connections=settings.llm_max_connections,
+        requests_per_minute=settings.gemini_requests_per_minute,
+        tokens_per_minute=settings.gemini_tokens_per_minute,
+        max_retries=settings.llm_max_retries,
+        breaker=build_breaker("Gemini"),
+        usage=llm_usage,
+    )
+    primary_judge_service = PrimaryJudgeService(
+        gemini=gemini_client,
+        cache=DecisionCache(
+            max_entries=settings.primary_cache_max_entries,
+            ttl_seconds=settings.primary_cache_ttl_seconds,
+        ),
+        batch_max_size=settings.primary_batch_max_size,
+        batch_max_wait_seconds=settings.primary_batch_max_wait_ms / 1000.0,
+        prefilter_rules=settings.primary_prefilter_rules,
+        stage_timeout_seconds=settings.primary_stage_timeout_seconds,
+        hedge_enabled=settings.primary_hedge_enabled,
+    )
+    claude_client = ClaudeClient(
+        api_key=settings.anthropic_api_key,
+        max_connections=settings.llm_max_connections,
+        requests_per_minute=settings.claude_requests_per_minute,
+        tokens_per_minute=settings.claude_tokens_per_minute,
+        max_retries=settings.llm_max_retries,
+        breaker=build_breaker("Claude"),
+        usage=llm_usage,
+    )
+    secondary_judge_service = SecondaryJudgeService(
+        claude=claude_client,
+        stage_timeout_seconds=settings.secondary_stage_timeout_seconds,
+        streaming=settings.secondary_streaming,
+        speculative=settings.secondary_speculative,
+        candidates=settings.secondary_candidates,
+        quality_scorer=QualityScorer(
+            uncertain_low=settings.quality_uncertain_low_percent / 100.0,
+            uncertain_high=settings.quality_uncertain_high_percent / 100.0,
+            scale=settings.quality_calibration_scale_percent / 100.0,
+            offset=settings.quality_calibration_offset_percent / 100.0,
+        ),
+        context_builder=ContextBuilder(
+            max_tokens=settings.secondary_context_max_tokens,
+            max_message_chars=settings.secondary_context_max_message_chars,
+        ),
+    )
+    channel_summaries = ChannelSummarizer(
+        claude=claude_client,
+        storage=storage,
+        every_messages=settings.channel_summary_every_messages,
+        every_seconds=settings.channel_summary_every_minutes * 60,
+        recent_turns=settings.channel_summary_recent_turns,
+    )
     member_profile_service = MemberProfileService()
+    message_log = MessageLogWriter(storage=storage, mode=settings.message_record_mode)
+    profile_coalescer = ProfileCoalescer(
+        storage=storage,
+        window_seconds=settings.profile_persist_window_seconds,
+        max_members=settings.profile_cache_max_members,
+    )
     welcome_service = WelcomeService(
         claude=claude_client,
         timezone_name=settings.bot_timezone,
@@ -37,10 +116,14 @@ def main() -> None:
 
     bot = CommunityBot(
         settings=settings,
-        firestore=firestore_service,
+        storage=storage,
         primary_judge=primary_judge_service,
         secondary_judge=secondary_judge_service,
         member_profile=member_profile_service,
+        profile_coalescer=profile_coalescer,
+        message_log=message_log,
+        llm_usage=llm_usage,
+        channel_summaries=channel_summaries,
         welcome=welcome_service,
         topic_generator=topic_generator_service,
         outreach=outreach_service,
@@ -10,6 +10,8 @@ class PrimaryDecision:
     model: str
     judged_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     raw_response: str | None = None
+    # Which stage decided: rule / cache / llm / fallback.
+    stage: str = "llm"
 
     def to_dict(self) -> dict[str, object]:
         return {
@@ -19,6 +21,7 @@ class PrimaryDecision:
             "model": self.model,
             "judged_at": self.judged_at,
             "raw_response": self.raw_response,
+            "stage": self.stage,
         }
 
 
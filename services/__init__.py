@@ -1,23 +1,43 @@
+from services.channel_summary import ChannelSummarizer
+from services.circuit_breaker import CircuitBreaker
 from services.claude import ClaudeClient
+from services.decision_cache import DecisionCache
 from services.gemini import GeminiClient
 from services.firestore import FirestoreService
+from services.llm_usage import LlmUsageTracker
+from services.local_storage import MemoryStorage, SqliteStorage
 from services.member_profile import MemberProfileService
+from services.message_log import MessageLogWriter
 from services.outreach import OutreachService
 from services.primary_judge import PrimaryJudgeService
+from services.profile_coalescer import ProfileCoalescer
 from services.scheduler import SchedulerService
 from services.secondary_judge import SecondaryJudgeService
+from services.storage import StorageBackend, create_storage
 from services.topic_generator import TopicGeneratorService
+from services.topic_ledger import TopicLedger
 from services.welcome import WelcomeService
 
 __all__ = [
     "FirestoreService",
+    "MemoryStorage",
+    "SqliteStorage",
+    "StorageBackend",
+    "create_storage",
     "GeminiClient",
     "PrimaryJudgeService",
+    "DecisionCache",
     "ClaudeClient",
+    "CircuitBreaker",
+    "LlmUsageTracker",
     "SecondaryJudgeService",
+    "ChannelSummarizer",
     "MemberProfileService",
+    "MessageLogWriter",
+    "ProfileCoalescer",
     "WelcomeService",
     "TopicGeneratorService",
+    "TopicLedger",
     "OutreachService",
     "SchedulerService",
 ]
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from services.claude import ClaudeClient
+from services.storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _ChannelState:
+    summary: str = ""
+    pending: list[dict[str, object]] = field(default_factory=list)
+    summarized_at: float = field(default_factory=time.monotonic)
+    messages_summarized: int = 0
+    task: asyncio.Task[None] | None = None
+
+
+class ChannelSummarizer:
+    def __init__(
+        self,
+        claude: ClaudeClient,
+        storage: StorageBackend,
+        every_messages: int = 15,
+        every_seconds: float = 600.0,
+        recent_turns: int = 6,
+        max_summary_chars: int = 600,
+        prompt_path: str = "prompts/channel_summary.txt",
+    ) -> None:
+        self.claude = claude
+        self.storage = storage
+        self.every_messages = max(1, every_messages)
+        self.every_seconds = max(0.0, every_seconds)
+        self.recent_turns = max(1, recent_turns)
+        self.max_summary_chars = max(50, max_summary_chars)
+        self.prompt = Path(prompt_path).read_text(encoding="utf-8")
+        self.runs = 0
+        self._channels: dict[str, _ChannelState] = {}
+
+    async def observe(self, channel_id: str, entry: dict[str, object]) -> None:
+        state = await self._state(channel_id)
+        state.pending.append(entry)
+        # Bound memory if summaries keep failing or lag behind.
+        if len(state.pending) > self.every_messages * 3:
+            del state.pending[: -self.every_messages * 3]
+        if state.task is not None and not state.task.done():
+            return
+        due_by_count = len(state.pending) >= self.every_messages
+        due_by_time = time.monotonic() - state.summarized_at >= self.every_seconds
+        if due_by_count or due_by_time:
+            state.task = asyncio.create_task(self._summarize(channel_id, state))
+
+    def summary_for(self, channel_id: str) -> str:
+        state = self._channels.get(channel_id)
+        return state.summary if state is not None else ""
+
+    def recent(self, history: list[dict[str, object]]) -> list[dict[str, object]]:
+        return history[-self.recent_turns :]
+
+    def digest(self, channel_id: str, history: list[dict[str, object]], max_chars: int = 500) -> str:
+        recent_text = " / ".join(str(item.get("content", "")) for item in self.recent(history))
+        summary = self.summary_for(channel_id)
+        if not summary:
+            return recent_text[:max_chars]
+        return f"{summary}\n直近: {recent_text}"[:max_chars]
+
+    async def close(self) -> None:
+        tasks = [
+            state.task
+            for state in self._channels.values()
+            if state.task is not None and not state.task.done()
+        ]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def summary(self) -> str:
+        summarized = sum(1 for state in self._channels.values() if state.summary)
+        return f"{summarized}/{len(self._channels)} channel(s) summarized, {self.runs} run(s)"
+
+    async def _state(self, channel_id: str) -> _ChannelState:
+        state = self._channels.get(channel_id)
+        if state is not None:
+            return state
+        state = _ChannelState()
+        self._channels[channel_id] = state
+        try:
+            stored = await self.storage.load_channel_summary(channel_id)
+        except Exception:
+            logger.exception("Failed to load channel summary: %s", channel_id)
+            stored = None
+        if stored:
+            state.summary = str(stored.get("summary", ""))
+            state.messages_summarized = int(stored.get("messages_summarized", 0) or 0)
+        return state
+
+    async def _summarize(self, channel_id: str, state: _ChannelState) -> None:
+        batch = list(state.pending)
+        if not batch:
+            return
+        summary = ""
+        if self.claude.enabled:
+            try:
+                summary = await self.claude.generate_text(
+                    system_prompt=self.prompt,
+                    payload={
+                        "previous_summary": state.summary,
+                        "new_messages": [
+                            {"author": item.get("author"), "content": item.get("content")}
+                            for item in batch
+                        ],
+                    },
+                    max_tokens=400,
+                    call_site="channel_summary",
+                )
+            except Exception:
+                logger.exception("Channel summary generation failed. Using fallback.")
+        if not summary.strip():
+            texts = [str(item.get("content", "")) for item in batch]
+            summary = " / ".join([state.summary, *texts] if state.summary else texts)[-self.max_summary_chars :]
+
+        # Messages that arrived while summarising stay pending for the next run.
+        summarized = {id(item) for item in batch}
+        state.pending = [item for item in state.pending if id(item) not in summarized]
+        state.summary = summary.strip()[: self.max_summary_chars]
+        state.summarized_at = time.monotonic()
+        state.messages_summarized += len(batch)
+        self.runs += 1
+        try:
+            await self.storage.save_channel_summary(
+                channel_id,
+                {
+                    "channel_id": channel_id,
+                    "summary": state.summary,
+                    "messages_summarized": state.messages_summarized,
+                    "updated_at": datetime.now(timezone.utc),
+                },
+            )
+        except Exception:
+            logger.exception("Failed to persist channel summary: %s", channel_id)
@@ -0,0 +1,143 @@
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+from services.deadline import stage_timed_out
+
+logger = logging.getLogger(__name__)
+
+ResultT = TypeVar("ResultT")
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = 60.0,
+        min_calls: int = 5,
+        error_rate_threshold: float = 0.5,
+        p95_latency_threshold_seconds: float = 4.0,
+        open_seconds: float = 30.0,
+    ) -> None:
+        self.name = name
+        self.window_seconds = max(1.0, window_seconds)
+        self.min_calls = max(1, min_calls)
+        self.error_rate_threshold = error_rate_threshold
+        self.p95_latency_threshold_seconds = p95_latency_threshold_seconds
+        self.open_seconds = max(0.0, open_seconds)
+        self.trips = 0
+        self.rejected = 0
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        # (finished_at, latency_seconds, ok)
+        self._calls: deque[tuple[float, float, bool]] = deque()
+
+    @property
+    def state(self) -> str:
+        if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = STATE_HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    @property
+    def sample_count(self) -> int:
+        return len(self._calls)
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == STATE_OPEN
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    async def call(self, fn: Callable[[], Awaitable[ResultT]]) -> ResultT:
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit is {self._state}.")
+        started = time.monotonic()
+        try:
+            result = await fn()
+        except Exception:
+            self.record(time.monotonic() - started, ok=False)
+            raise
+        except BaseException:
+            if stage_timed_out():
+                # A call cut off by its stage deadline is a hung provider.
+                self.record(time.monotonic() - started, ok=False)
+            else:
+                # Hedge losers and other cancellations say nothing about the
+                # provider, but must not leave the half-open slot taken.
+                self._probe_in_flight = False
+            raise
+        self.record(time.monotonic() - started, ok=True)
+        return result
+
+    def record(self, latency_seconds: float, ok: bool) -> None:
+        now = time.monotonic()
+        if self._state == STATE_HALF_OPEN:
+            self._probe_in_flight = False
+            if ok and latency_seconds <= self.p95_latency_threshold_seconds:
+                logger.info("%s circuit closed after a successful probe.", self.name)
+                self._state = STATE_CLOSED
+                self._calls.clear()
+            else:
+                self._open(now, "probe failed")
+            return
+
+        self._calls.append((now, latency_seconds, ok))
+        self._prune(now)
+        if self._state != STATE_CLOSED or len(self._calls) < self.min_calls:
+            return
+        if self.error_rate() >= self.error_rate_threshold:
+            self._open(now, f"error rate {self.error_rate():.0%}")
+        elif self.p95_latency() >= self.p95_latency_threshold_seconds:
+            self._open(now, f"p95 latency {self.p95_latency():.1f}s")
+
+    def error_rate(self) -> float:
+        if not self._calls:
+            return 0.0
+        return sum(1 for _, _, ok in self._calls if not ok) / len(self._calls)
+
+    def p95_latency(self) -> float:
+        return self.latency_percentile(0.95)
+
+    def latency_percentile(self, percentile: float) -> float:
+        if not self._calls:
+            return 0.0
+        latencies = sorted(latency for _, latency, _ in self._calls)
+        index = min(len(latencies) - 1, int(percentile * len(latencies)))
+        return latencies[index]
+
+    def summary(self) -> str:
+        return (
+            f"{self.state} (errors {self.error_rate():.0%}, "
+            f"p95 {self.p95_latency():.1f}s, trips {self.trips}, rejected {self.rejected})"
+        )
+
+    def _open(self, now: float, reason: str) -> None:
+        logger.warning("%s circuit opened: %s.", self.name, reason)
+        self._state = STATE_OPEN
+        self._opened_at = now
+        self.trips += 1
+        self._calls.clear()
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._calls and self._calls[0][0] < cutoff:
+            self._calls.popleft()
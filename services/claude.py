@@ -1,26 +1,65 @@
-import asyncio
 import json
 import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
 
 try:
-    from anthropic import Anthropic
+    import anthropic
+    import httpx
+    from anthropic import AsyncAnthropic
 except Exception:  # pragma: no cover
-    Anthropic = None
+    anthropic = None
+    httpx = None
+    AsyncAnthropic = None
+
+from services.circuit_breaker import CircuitBreaker
+from services.json_stream import JsonFieldScanner
+from services.llm_usage import LlmUsageTracker
+from services.prompt_cache import PromptCacheStats
+from services.rate_limiter import RateLimiter, estimate_tokens
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class StreamedJson:
+    text: str
+    fields: dict[str, object] = field(default_factory=dict)
+    stopped_early: bool = False
+    complete: bool = False
+    usage: object | None = None
+
+
 class ClaudeClient:
     def __init__(
         self,
         api_key: str | None,
         model_name: str = "claude-3-5-sonnet-latest",
+        max_connections: int = 20,
+        timeout_seconds: float = 60.0,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_retries: int = 3,
+        breaker: CircuitBreaker | None = None,
+        usage: LlmUsageTracker | None = None,
     ) -> None:
         self.model_name = model_name
         self.enabled = False
         self._client = None
+        self._http_client = None
+        self.cache_stats = PromptCacheStats()
+        self.early_exits = 0
+        self.limiter = RateLimiter(
+            name="Claude",
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+            max_in_flight=max_connections,
+            max_retries=max_retries,
+        )
+        self.breaker = breaker or CircuitBreaker(name="Claude")
+        self.usage = usage
 
-        if Anthropic is None:
+        if AsyncAnthropic is None or httpx is None:
             logger.warning("anthropic SDK is unavailable. Claude disabled.")
             return
         if not api_key:
@@ -28,13 +67,47 @@ class ClaudeClient:
             return
 
         try:
-            self._client = Anthropic(api_key=api_key)
+            # One bounded keep-alive pool shared by every Claude caller.
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max(1, max_connections),
+                    max_keepalive_connections=max(1, max_connections),
+                ),
+                timeout=timeout_seconds,
+            )
+            # Retries are handled by the rate limiter so backoff is not stacked.
+            self._client = AsyncAnthropic(
+                api_key=api_key,
+                http_client=self._http_client,
+                max_retries=0,
+            )
             self.enabled = True
             logger.info("Claude enabled with model: %s", model_name)
         except Exception:
             logger.exception("Failed to initialize Claude client. Claude disabled.")
 
-    async def generate_json(self, system_prompt: str, payload: dict[str, object]) -> str:
+    async def warm_up(self) -> None:
+        if not self.enabled or self._client is None or self._http_client is None:
+            return
+        try:
+            # Any response will do; this only opens the pooled TLS connection.
+            await self._http_client.head(str(self._client.base_url))
+            logger.info("Claude connection pool warmed.")
+        except Exception:
+            logger.warning("Failed to warm Claude connection pool.", exc_info=True)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+
+    async def generate_json(
+        self,
+        system_prompt: str,
+        payload: dict[str, object],
+        system_suffix: str | None = None,
+        call_site: str = "unspecified",
+        max_tokens: int = 700,
+    ) -> str:
         if not self.enabled or self._client is None:
             raise RuntimeError("Claude is disabled.")
 
@@ -42,27 +115,89 @@ class ClaudeClient:
             "次の情報を元に、指定フォーマットのJSONだけを返してください。\n\n"
             f"{json.dumps(payload, ensure_ascii=False)}"
         )
-        response = await asyncio.to_thread(
-            self._client.messages.create,
-            model=self.model_name,
-            max_tokens=700,
+        response = await self._create_message(
+            system_prompt,
+            system_suffix,
+            call_site,
+            max_tokens=max_tokens,
             temperature=0.2,
-            system=system_prompt,
             messages=[{"role": "user", "content": user_text}],
         )
+        return self._response_text(response)
 
-        parts: list[str] = []
-        for block in response.content:
-            text = getattr(block, "text", None)
-            if isinstance(text, str):
-                parts.append(text)
-        return "\n".join(parts).strip()
+    async def stream_json(
+        self,
+        system_prompt: str,
+        payload: dict[str, object],
+        stop_when: Callable[[dict[str, object]], bool],
+        system_suffix: str | None = None,
+        call_site: str = "unspecified",
+        max_tokens: int = 700,
+    ) -> StreamedJson:
+        if not self.enabled or self._client is None:
+            raise RuntimeError("Claude is disabled.")
+
+        user_text = (
+            "次の情報を元に、指定フォーマットのJSONだけを返してください。\n\n"
+            f"{json.dumps(payload, ensure_ascii=False)}"
+        )
+        kwargs: dict[str, object] = {
+            "max_tokens": max_tokens,
+            "temperature": 0.2,
+            "messages": [{"role": "user", "content": user_text}],
+        }
+        return await self._request(
+            system_prompt,
+            system_suffix,
+            call_site,
+            lambda messages_api, system_blocks: self._stream_once(
+                messages_api,
+                system_blocks,
+                kwargs,
+                stop_when,
+            ),
+            kwargs,
+        )
+
+    async def _stream_once(
+        self,
+        messages_api: object,
+        system_blocks: list[dict[str, object]],
+        kwargs: dict[str, object],
+        stop_when: Callable[[dict[str, object]], bool],
+    ) -> StreamedJson:
+        scanner = JsonFieldScanner()
+        stopped_early = False
+        async with messages_api.stream(
+            model=self.model_name,
+            system=system_blocks,
+            **kwargs,
+        ) as stream:
+            async for text in stream.text_stream:
+                scanner.feed(text)
+                if not scanner.complete and stop_when(scanner.fields):
+                    # Leaving the context closes the response, which stops
+                    # generation and output-token billing.
+                    stopped_early = True
+                    break
+            snapshot = getattr(stream, "current_message_snapshot", None)
+        if stopped_early:
+            self.early_exits += 1
+        return StreamedJson(
+            text=scanner.text,
+            fields=scanner.fields,
+            stopped_early=stopped_early,
+            complete=scanner.complete,
+            usage=getattr(snapshot, "usage", None),
+        )
 
     async def generate_text(
         self,
         system_prompt: str,
         payload: dict[str, object],
         max_tokens: int = 300,
+        system_suffix: str | None = None,
+        call_site: str = "unspecified",
     ) -> str:
         if not self.enabled or self._client is None:
             raise RuntimeError("Claude is disabled.")
@@ -71,17 +206,132 @@ class ClaudeClient:
             "次の情報を元に回答を作成してください。\n\n"
             f"{json.dumps(payload, ensure_ascii=False)}"
         )
-        response = await asyncio.to_thread(
-            self._client.messages.create,
-            model=self.model_name,
+        response = await self._create_message(
+            system_prompt,
+            system_suffix,
+            call_site,
             max_tokens=max_tokens,
             temperature=0.5,
-            system=system_prompt,
             messages=[{"role": "user", "content": user_text}],
         )
+        return self._response_text(response)
+
+    async def _create_message(
+        self,
+        system_prompt: str,
+        system_suffix: str | None,
+        call_site: str,
+        **kwargs: object,
+    ) -> object:
+        return await self._request(
+            system_prompt,
+            system_suffix,
+            call_site,
+            lambda messages_api, system_blocks: messages_api.create(
+                model=self.model_name,
+                system=system_blocks,
+                **kwargs,
+            ),
+            kwargs,
+        )
+
+    async def _request(
+        self,
+        system_prompt: str,
+        system_suffix: str | None,
+        call_site: str,
+        send: Callable[[object, list[dict[str, object]]], Awaitable[object]],
+        kwargs: dict[str, object],
+    ) -> object:
+        # The static prompt is marked cacheable; the per-call suffix follows it
+        # uncached so it never invalidates the cached prefix.
+        system_blocks: list[dict[str, object]] = [
+            {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}},
+        ]
+        if system_suffix:
+            system_blocks.append({"type": "text", "text": system_suffix})
+
+        beta = getattr(self._client, "beta", None)
+        prompt_caching = getattr(beta, "prompt_caching", None)
+        messages_api = prompt_caching.messages if prompt_caching is not None else self._client.messages
+        prompt_text = system_prompt + (system_suffix or "") + json.dumps(
+            kwargs.get("messages", []),
+            ensure_ascii=False,
+        )
+
+        async def limited() -> object:
+            return await self.limiter.call(
+                lambda: self.breaker.call(lambda: send(messages_api, system_blocks)),
+                estimated_tokens=estimate_tokens(prompt_text) + int(kwargs.get("max_tokens", 0) or 0),
+                classify=_retry_delay,
+                actual_tokens=_used_tokens,
+            )
+
+        if self.usage is not None:
+            response = await self.usage.measure("claude", call_site, limited, _usage_counts)
+        else:
+            response = await limited()
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.cache_stats.record(
+                cached_tokens=int(getattr(usage, "cache_read_input_tokens", 0) or 0),
+                written_tokens=int(getattr(usage, "cache_creation_input_tokens", 0) or 0),
+                uncached_tokens=int(getattr(usage, "input_tokens", 0) or 0),
+            )
+        return response
+
+    def _response_text(self, response: object) -> str:
         parts: list[str] = []
         for block in response.content:
             text = getattr(block, "text", None)
             if isinstance(text, str):
                 parts.append(text)
         return "\n".join(parts).strip()
+
+
+def _retry_delay(exc: Exception) -> float | None:
+    if anthropic is None:
+        return None
+    if isinstance(exc, anthropic.APIConnectionError):
+        return 0.0
+    if isinstance(exc, anthropic.APIStatusError):
+        status = exc.status_code
+        if status in {408, 409, 429} or status >= 500:
+            return _retry_after_seconds(exc.response.headers)
+    return None
+
+
+def _retry_after_seconds(headers: object) -> float:
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            return max(0.0, float(retry_after_ms) / 1000.0)
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            return max(0.0, float(retry_after))
+    except (AttributeError, TypeError, ValueError):
+        pass
+    return 0.0
+
+
+def _usage_counts(response: object) -> tuple[int, int, int]:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0, 0, 0
+    return (
+        int(getattr(usage, "input_tokens", 0) or 0)
+        + int(getattr(usage, "cache_creation_input_tokens", 0) or 0),
+        int(getattr(usage, "output_tokens", 0) or 0),
+        int(getattr(usage, "cache_read_input_tokens", 0) or 0),
+    )
+
+
+def _used_tokens(response: object) -> int | None:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    return (
+        int(getattr(usage, "input_tokens", 0) or 0)
+        + int(getattr(usage, "cache_creation_input_tokens", 0) or 0)
+        + int(getattr(usage, "output_tokens", 0) or 0)
+    )
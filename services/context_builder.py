@@ -0,0 +1,139 @@
+import copy
+import json
+
+from services.decision_cache import normalize_text
+from services.rate_limiter import estimate_tokens
+
+ELLIPSIS = "…"
+
+# Fields the secondary prompt never reads; they only cost tokens.
+_DROPPED_ACTION_FIELDS = ("target_message_id", "channel_id")
+_DROPPED_PROFILE_STATS = ("last_active_at",)
+
+
+def count_tokens(payload: object) -> int:
+    return estimate_tokens(json.dumps(payload, ensure_ascii=False, default=str))
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    # Keep the head and the tail; the ask is often at the end of a long post.
+    head = max_chars * 2 // 3
+    tail = max(0, max_chars - head - 1)
+    return text[:head] + ELLIPSIS + (text[-tail:] if tail else "")
+
+
+def _top_counts(counts: object, limit: int) -> dict[str, object]:
+    if not isinstance(counts, dict):
+        return {}
+    ranked = sorted(counts.items(), key=lambda item: int(item[1] or 0), reverse=True)
+    return dict(ranked[:limit])
+
+
+class ContextBuilder:
+    def __init__(
+        self,
+        max_tokens: int = 1500,
+        max_message_chars: int = 400,
+        max_history: int = 12,
+        max_recent_actions: int = 5,
+        max_stat_entries: int = 3,
+    ) -> None:
+        self.max_tokens = max(1, max_tokens)
+        self.max_message_chars = max(20, max_message_chars)
+        self.max_history = max(1, max_history)
+        self.max_recent_actions = max(0, max_recent_actions)
+        self.max_stat_entries = max(1, max_stat_entries)
+        self.builds = 0
+        self.trimmed = 0
+
+    def build(self, payload: dict[str, object]) -> dict[str, object]:
+        context = copy.deepcopy(payload)
+        message = str(context.get("message_content", ""))
+        context["message_content"] = truncate_text(message, self.max_message_chars * 2)
+        context["channel_context"] = self._history(context.get("channel_context"), message)
+        context["bot_recent_actions"] = self._actions(context.get("bot_recent_actions"))
+        profile = context.get("author_profile")
+        if isinstance(profile, dict):
+            context["author_profile"] = self._profile(profile)
+
+        self.builds += 1
+        if count_tokens(context) > self.max_tokens:
+            self.trimmed += 1
+            self._fit(context)
+        return context
+
+    def _history(self, history: object, message: str) -> list[dict[str, object]]:
+        if not isinstance(history, list):
+            return []
+        entries = [item for item in history if isinstance(item, dict)]
+        # The live message is appended to history before judging; it is
+        # already sent as message_content.
+        if entries and str(entries[-1].get("content", "")) == message:
+            entries = entries[:-1]
+
+        collapsed: list[dict[str, object]] = []
+        previous_key: tuple[object, str] | None = None
+        for item in entries:
+            content = str(item.get("content", ""))
+            key = (item.get("author"), normalize_text(content))
+            if key == previous_key:
+                collapsed[-1]["repeated"] = int(collapsed[-1].get("repeated", 1)) + 1
+                continue
+            previous_key = key
+            collapsed.append(
+                {
+                    "author": item.get("author"),
+                    "content": truncate_text(content, self.max_message_chars),
+                    "timestamp": item.get("timestamp"),
+                }
+            )
+        return collapsed[-self.max_history :]
+
+    def _actions(self, actions: object) -> list[dict[str, object]]:
+        if not isinstance(actions, list) or self.max_recent_actions == 0:
+            return []
+        trimmed: list[dict[str, object]] = []
+        for action in actions[-self.max_recent_actions :]:
+            if not isinstance(action, dict):
+                continue
+            trimmed.append(
+                {key: value for key, value in action.items() if key not in _DROPPED_ACTION_FIELDS}
+            )
+        return trimmed
+
+    def _profile(self, profile: dict[str, object]) -> dict[str, object]:
+        stats = profile.get("stats")
+        if isinstance(stats, dict):
+            stats = {key: value for key, value in stats.items() if key not in _DROPPED_PROFILE_STATS}
+            stats["active_channels"] = _top_counts(stats.get("active_channels"), self.max_stat_entries)
+            stats["active_hours"] = _top_counts(stats.get("active_hours"), self.max_stat_entries)
+            profile["stats"] = stats
+        return profile
+
+    def _fit(self, context: dict[str, object]) -> None:
+        history = context["channel_context"]
+        actions = context["bot_recent_actions"]
+        # Oldest turns go first; the two latest turns carry most of the context.
+        while count_tokens(context) > self.max_tokens and len(history) > 2:
+            history.pop(0)
+        while count_tokens(context) > self.max_tokens and actions:
+            actions.pop(0)
+        profile = context.get("author_profile")
+        if count_tokens(context) > self.max_tokens and isinstance(profile, dict):
+            profile.pop("context", None)
+            profile.pop("interests", None)
+        if count_tokens(context) > self.max_tokens:
+            for item in history:
+                item["content"] = truncate_text(str(item.get("content", "")), self.max_message_chars // 4)
+        while count_tokens(context) > self.max_tokens and history:
+            history.pop(0)
+        if count_tokens(context) > self.max_tokens:
+            context["message_content"] = truncate_text(
+                str(context.get("message_content", "")),
+                self.max_message_chars,
+            )
+
+    def summary(self) -> str:
+        return f"{self.trimmed}/{self.builds} trimmed to {self.max_tokens} tokens"
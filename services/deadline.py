@@ -0,0 +1,122 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+ResultT = TypeVar("ResultT")
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+@dataclass(slots=True)
+class _StageState:
+    timed_out: bool = False
+
+
+# Shared by every task a stage spawns (hedged duplicates included), so code
+# deep inside the call can tell a deadline cancellation from a hedge loser.
+_current_stage: ContextVar[_StageState | None] = ContextVar("deadline_stage", default=None)
+
+
+def stage_timed_out() -> bool:
+    state = _current_stage.get()
+    return state is not None and state.timed_out
+
+
+@dataclass(slots=True)
+class Deadline:
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(expires_at=time.monotonic() + max(0.0, seconds))
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def budget(self, stage_timeout: float | None = None) -> float:
+        remaining = self.remaining()
+        if stage_timeout is None:
+            return remaining
+        return min(remaining, stage_timeout)
+
+
+async def within(
+    deadline: Deadline | None,
+    fn: Callable[[], Awaitable[ResultT]],
+    stage_timeout: float | None = None,
+) -> ResultT:
+    timeout = deadline.budget(stage_timeout) if deadline is not None else stage_timeout
+    if timeout is not None and timeout <= 0:
+        raise DeadlineExceeded("No time budget left for this stage.")
+    if timeout is None:
+        return await fn()
+    state = _StageState()
+    token = _current_stage.set(state)
+    try:
+        task = asyncio.ensure_future(fn())
+    finally:
+        _current_stage.reset(token)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+    except BaseException:
+        await _cancel_and_wait(task)
+        raise
+    if not done:
+        # Flag the timeout before cancelling so the circuit breaker records
+        # the hung call as a failure.
+        state.timed_out = True
+        await _cancel_and_wait(task)
+        raise DeadlineExceeded(f"Stage did not finish within {timeout:.1f}s.")
+    return task.result()
+
+
+async def _cancel_and_wait(task: asyncio.Future[object]) -> None:
+    # Like wait_for, do not return before the stage has actually stopped.
+    task.cancel()
+    await asyncio.wait({task})
+    if not task.cancelled():
+        task.exception()
+
+
+async def hedged(
+    fn: Callable[[], Awaitable[ResultT]],
+    hedge_after: float | None,
+    stats: dict[str, int] | None = None,
+) -> ResultT:
+    if hedge_after is None:
+        return await fn()
+
+    primary = asyncio.ensure_future(fn())
+    tasks = [primary]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            # The first attempt is slower than usual; race a duplicate.
+            tasks.append(asyncio.ensure_future(fn()))
+            if stats is not None:
+                stats["fired"] = stats.get("fired", 0) + 1
+
+        pending = set(tasks)
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if stats is not None and task is not primary:
+                        stats["won"] = stats.get("won", 0) + 1
+                    return task.result()
+                error = task.exception()
+        assert error is not None
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,89 @@
+import dataclasses
+import hashlib
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from models.decision import PrimaryDecision
+
+_URL_PATTERN = re.compile(r"https?://\S+")
+_DIGIT_PATTERN = re.compile(r"\d+")
+_REPEAT_PATTERN = re.compile(r"([^\w\s]|[w笑ー])\1+")
+_SPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    normalized = _URL_PATTERN.sub("<url>", normalized)
+    normalized = _DIGIT_PATTERN.sub("0", normalized)
+    # "ありがとう!!!" and "ありがとう!" should share a key.
+    normalized = _REPEAT_PATTERN.sub(r"\1", normalized)
+    return _SPACE_PATTERN.sub(" ", normalized).strip()
+
+
+def _activity_bucket(value: object) -> str:
+    try:
+        count = int(value or 0)
+    except (TypeError, ValueError):
+        count = 0
+    if count <= 0:
+        return "0"
+    if count <= 2:
+        return "1-2"
+    if count <= 5:
+        return "3-5"
+    return "6+"
+
+
+def primary_fingerprint(payload: dict[str, object]) -> str:
+    text = normalize_text(str(payload.get("message_content", "")))
+    parts = [
+        str(payload.get("channel_type", "chat")),
+        _activity_bucket(payload.get("recent_channel_activity")),
+        "new" if payload.get("author_is_new") else "known",
+        "mention" if payload.get("is_bot_mentioned") else "-",
+        "quiet" if payload.get("in_quiet_hours") else "-",
+        "reply" if payload.get("has_reply") else "-",
+        "reaction" if payload.get("has_reaction") else "-",
+        hashlib.sha1(text.encode("utf-8")).hexdigest(),
+    ]
+    return "|".join(parts)
+
+
+class DecisionCache:
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 600.0) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = max(0.0, ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, PrimaryDecision]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> PrimaryDecision | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, decision = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dataclasses.replace(decision, judged_at=datetime.now(timezone.utc))
+
+    def put(self, key: str, decision: PrimaryDecision) -> None:
+        self._entries[key] = (time.monotonic(), decision)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return f"{self.hits} hit / {self.misses} miss ({rate:.0%}), {len(self._entries)} entries"
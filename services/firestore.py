@@ -1,24 +1,79 @@
 import asyncio
+import copy
 import logging
+import random
+from contextlib import suppress
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
 
 from models.decision import PrimaryDecision
 from models.message import MessageRecord
+from services.topic_ledger import TopicLedger, topic_slot_id
+from services.write_ahead_log import PendingWrite, WriteAheadLog
 
 try:
     from google.cloud import firestore
 except Exception:  # pragma: no cover
     firestore = None
 
+try:
+    from google.api_core import exceptions as google_exceptions
+except Exception:  # pragma: no cover
+    google_exceptions = None
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+BACKEND_SYNC = "sync"
+BACKEND_ASYNC = "async"
+
+# Only the fields the inactive outreach run reads.
+INACTIVE_MEMBER_FIELDS = [
+    "display_name",
+    "interests.topics",
+    "context.last_active_at",
+    "outreach",
+]
+
+# Firestore rejects commits with more than 500 writes.
+MAX_BATCH_WRITES = 500
+
+MAX_DRAIN_BACKOFF_SECONDS = 60.0
+
 
 class FirestoreService:
-    def __init__(self, project_id: str | None) -> None:
+    name = "firestore"
+
+    def __init__(
+        self,
+        project_id: str | None,
+        write_behind: bool = True,
+        batch_max_size: int = 20,
+        batch_max_age_seconds: float = 1.0,
+        backend: str = BACKEND_SYNC,
+        max_in_flight: int = 8,
+        wal_path: str | None = None,
+        wal_max_attempts: int = 20,
+    ) -> None:
         self.project_id = project_id
         self.enabled = False
+        self.backend = backend if backend in {BACKEND_SYNC, BACKEND_ASYNC} else BACKEND_SYNC
+        self.max_in_flight = max(1, max_in_flight)
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        self.write_behind = write_behind
+        self.batch_max_size = max(1, min(MAX_BATCH_WRITES, batch_max_size))
+        self.batch_max_age_seconds = max(0.05, batch_max_age_seconds)
         self._client = None
+        self.topic_ledger = TopicLedger()
+        self._pending: list[PendingWrite] = []
+        self._pending_head_attempts = 0
+        self._flush_wakeup: asyncio.Event | None = None
+        self._flush_stop: asyncio.Event | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+        self.wal_path = wal_path or None
+        self.wal_max_attempts = max(1, wal_max_attempts)
+        self._wal: WriteAheadLog | None = None
 
         if firestore is None:
             logger.warning("google-cloud-firestore is unavailable. Firestore disabled.")
@@ -28,17 +83,121 @@ class FirestoreService:
             logger.warning("GOOGLE_CLOUD_PROJECT is not set. Firestore disabled.")
             return
 
+        if backend not in {BACKEND_SYNC, BACKEND_ASYNC}:
+            logger.warning("Unknown FIRESTORE_BACKEND=%s. Using sync backend.", backend)
+
         try:
-            self._client = firestore.Client(project=project_id)
+            if self.backend == BACKEND_ASYNC:
+                self._client = firestore.AsyncClient(project=project_id)
+            else:
+                self._client = firestore.Client(project=project_id)
             self.enabled = True
-            logger.info("Firestore enabled for project: %s", project_id)
+            logger.info(
+                "Firestore enabled for project: %s (backend=%s, max_in_flight=%s)",
+                project_id,
+                self.backend,
+                self.max_in_flight,
+            )
         except Exception:
             logger.exception("Failed to initialize Firestore. Firestore disabled.")
+            return
+
+        if self.wal_path:
+            try:
+                self._wal = WriteAheadLog(self.wal_path)
+                logger.info("Firestore write-ahead log enabled: %s", self.wal_path)
+            except Exception:
+                logger.exception("Failed to open write-ahead log. Writing without it.")
+
+    @property
+    def pending_writes(self) -> int:
+        if self._wal is not None:
+            return self._wal.depth
+        return len(self._pending)
+
+    @property
+    def durable_queue(self) -> bool:
+        return self._wal is not None
+
+    async def start(self) -> None:
+        if not self.enabled or self._flush_task is not None:
+            return
+        if not self.write_behind and self._wal is None:
+            return
+        self._flush_wakeup = asyncio.Event()
+        self._flush_stop = asyncio.Event()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info(
+            "Firestore write-behind started (max_size=%s, max_age=%.2fs).",
+            self.batch_max_size,
+            self.batch_max_age_seconds,
+        )
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            # Let an in-flight commit finish; cancelling it would lose the
+            # chunk, or replay (and double-count) one already committed.
+            assert self._flush_stop is not None
+            self._flush_stop.set()
+            self._wake_flusher()
+            await self._flush_task
+            self._flush_task = None
+        if self._wal is not None:
+            await self._wal.wait_for_appends()
+        if not await self.flush() and self._wal is None:
+            logger.error("Closing with %s unwritten Firestore write(s).", len(self._pending))
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+
+    async def flush(self) -> bool:
+        if self._wal is not None:
+            return await self._drain_wal()
+        while self._pending:
+            # After a failure, retry the head write alone so a single bad
+            # document cannot block the whole buffer.
+            size = 1 if self._pending_head_attempts else MAX_BATCH_WRITES
+            chunk = self._pending[:size]
+            del self._pending[: len(chunk)]
+            try:
+                await self._commit(chunk)
+            except asyncio.CancelledError:
+                self._pending[:0] = chunk
+                raise
+            except Exception as exc:
+                attempts = self._pending_head_attempts + 1
+                if len(chunk) == 1 and attempts >= self.wal_max_attempts and not _is_retryable_error(exc):
+                    logger.error(
+                        "Dropping write to %s/%s after %s attempts: %s",
+                        chunk[0].collection,
+                        chunk[0].document_id,
+                        attempts,
+                        exc,
+                    )
+                    self._pending_head_attempts = 0
+                    continue
+                # Keep the writes, in order, for the next flush.
+                self._pending[:0] = chunk
+                self._pending_head_attempts = attempts
+                logger.warning(
+                    "Failed to commit %s buffered Firestore write(s) (pending=%s): %s",
+                    len(chunk),
+                    len(self._pending),
+                    exc,
+                )
+                return False
+            self._pending_head_attempts = 0
+        return True
 
     async def save_message(self, record: MessageRecord) -> None:
         if not self.enabled or self._client is None:
             return
-        await asyncio.to_thread(self._save_message_sync, record)
+        await self._enqueue_write("messages", record.message_id, record.to_dict(), merge=False)
+
+    async def save_message_lifecycle(self, message_id: str, payload: dict[str, object]) -> None:
+        if not self.enabled or self._client is None:
+            return
+        await self._enqueue_write("messages", message_id, payload, merge=False)
 
     async def save_primary_decision(
         self,
@@ -48,32 +207,105 @@ class FirestoreService:
     ) -> None:
         if not self.enabled or self._client is None:
             return
-        await asyncio.to_thread(
-            self._save_primary_decision_sync,
+        await self._enqueue_write(
+            "decision_logs",
             message_id,
-            input_payload,
-            decision,
+            {
+                "message_id": message_id,
+                "input": input_payload,
+                "decision": decision.to_dict(),
+            },
+            merge=True,
         )
 
     async def save_bot_action(self, action_id: str, payload: dict[str, object]) -> None:
         if not self.enabled or self._client is None:
             return
-        await asyncio.to_thread(self._save_bot_action_sync, action_id, payload)
+        await self._enqueue_write("bot_actions", action_id, payload, merge=True)
+
+    async def save_member_profile(
+        self,
+        member_id: str,
+        payload: dict[str, object],
+        counters: dict[str, object] | None = None,
+    ) -> None:
+        if not self.enabled or self._client is None:
+            return
+        data = with_transforms(payload, counters, firestore.Increment)
+        await self._enqueue_write("members", member_id, data, merge=True)
 
-    async def save_member_profile(self, member_id: str, payload: dict[str, object]) -> None:
+    async def load_topic_ledger(self, limit: int = 50) -> None:
         if not self.enabled or self._client is None:
+            self.topic_ledger.loaded = True
+            return
+        try:
+            topics = await self._run(
+                self._list_recent_topics_sync,
+                self._list_recent_topics_async,
+                limit,
+            )
+        except Exception:
+            logger.exception("Failed to load topic ledger. Falling back to queries.")
             return
-        await asyncio.to_thread(self._save_member_profile_sync, member_id, payload)
+        self.topic_ledger.load(topics)
+        logger.info("Topic ledger loaded with %s topic(s).", len(topics))
 
     async def save_topic_post(self, topic_id: str, payload: dict[str, object]) -> None:
+        self.topic_ledger.record(topic_id, payload)
         if not self.enabled or self._client is None:
             return
-        await asyncio.to_thread(self._save_topic_post_sync, topic_id, payload)
+        writes = [PendingWrite("bot_topics", topic_id, payload, merge=True)]
+        channel_id = str(payload.get("channel_id", ""))
+        hour_key = payload.get("hour_key")
+        if isinstance(hour_key, str) and hour_key:
+            # Deterministic IDs let other instances check a slot with a direct get.
+            writes.append(
+                PendingWrite(
+                    "bot_topic_slots",
+                    topic_slot_id(channel_id, hour_key),
+                    {"topic_id": topic_id, "channel_id": channel_id, "hour_key": hour_key},
+                    merge=True,
+                )
+            )
+        date_key = payload.get("date_key")
+        if isinstance(date_key, str) and date_key:
+            writes.append(
+                PendingWrite(
+                    "bot_topic_days",
+                    date_key,
+                    {"date_key": date_key, "count": firestore.Increment(1)},
+                    merge=True,
+                )
+            )
+        await self._write_now(writes)
 
     async def save_outreach_log(self, log_id: str, payload: dict[str, object]) -> None:
         if not self.enabled or self._client is None:
             return
-        await asyncio.to_thread(self._save_outreach_log_sync, log_id, payload)
+        await self._write_now([PendingWrite("outreach_logs", log_id, payload, merge=True)])
+
+    async def load_channel_summary(self, channel_id: str) -> dict[str, object] | None:
+        if not self.enabled or self._client is None:
+            return None
+        return await self._get_document("channel_summaries", channel_id)
+
+    async def save_channel_summary(self, channel_id: str, payload: dict[str, object]) -> None:
+        if not self.enabled or self._client is None:
+            return
+        await self._enqueue_write("channel_summaries", channel_id, payload, merge=True)
+
+    async def save_llm_usage(
+        self,
+        hour_key: str,
+        payload: dict[str, object],
+        counters: dict[str, object] | None = None,
+        maxima: dict[str, object] | None = None,
+    ) -> None:
+        if not self.enabled or self._client is None:
+            return
+        data = with_transforms(payload, counters, firestore.Increment)
+        data = with_transforms(data, maxima, firestore.Maximum)
+        await self._enqueue_write("llm_usage", hour_key, data, merge=True)
 
     async def update_message_bot_action(
         self,
@@ -83,60 +315,122 @@ class FirestoreService:
     ) -> None:
         if not self.enabled or self._client is None:
             return
-        await asyncio.to_thread(
-            self._update_message_bot_action_sync,
+        await self._enqueue_write(
+            "messages",
             message_id,
-            action_type,
-            action_at,
+            {
+                "bot_action": action_type,
+                "bot_action_at": action_at,
+            },
+            merge=True,
         )
 
     async def load_config(self) -> dict[str, object]:
         if not self.enabled or self._client is None:
             return {}
-        return await asyncio.to_thread(self._load_config_sync)
+        return await self._get_document("config", "settings") or {}
 
     async def save_config_partial(self, payload: dict[str, object]) -> None:
         if not self.enabled or self._client is None:
             return
-        await asyncio.to_thread(self._save_config_partial_sync, payload)
+        clean_payload = dict(payload)
+        clean_payload["updated_at"] = datetime.now(timezone.utc)
+        await self._write_now([PendingWrite("config", "settings", clean_payload, merge=True)])
 
     async def list_recent_topics(self, limit: int = 10) -> list[dict[str, object]]:
-        if not self.enabled or self._client is None:
-            return []
-        return await asyncio.to_thread(self._list_recent_topics_sync, limit)
+        if self.topic_ledger.loaded or not self.enabled or self._client is None:
+            return self.topic_ledger.recent(limit)
+        return await self._run(
+            self._list_recent_topics_sync,
+            self._list_recent_topics_async,
+            limit,
+        )
 
     async def count_topics_for_date(self, date_key: str) -> int:
+        local_count = self.topic_ledger.count_for_date(date_key)
         if not self.enabled or self._client is None:
-            return 0
-        return await asyncio.to_thread(self._count_topics_for_date_sync, date_key)
+            return local_count
+        day = await self._get_document("bot_topic_days", date_key)
+        remote_count = int((day or {}).get("count", 0) or 0)
+        return max(local_count, remote_count)
 
     async def has_topic_for_channel_date(self, channel_id: str, date_key: str) -> bool:
+        if self.topic_ledger.has_channel_date(channel_id, date_key):
+            return True
         if not self.enabled or self._client is None:
             return False
-        return await asyncio.to_thread(
+        return await self._run(
             self._has_topic_for_channel_date_sync,
+            self._has_topic_for_channel_date_async,
             channel_id,
             date_key,
         )
 
     async def has_topic_for_channel_hour(self, channel_id: str, hour_key: str) -> bool:
+        if self.topic_ledger.has_channel_hour(channel_id, hour_key):
+            return True
         if not self.enabled or self._client is None:
             return False
-        return await asyncio.to_thread(
-            self._has_topic_for_channel_hour_sync,
-            channel_id,
-            hour_key,
-        )
+        slot = await self._get_document("bot_topic_slots", topic_slot_id(channel_id, hour_key))
+        if slot is None:
+            return False
+        self.topic_ledger.mark_channel_hour(channel_id, hour_key)
+        return True
 
-    async def list_inactive_members(self, threshold_days: int) -> list[dict[str, object]]:
+    async def iter_inactive_members(
+        self,
+        threshold_days: int,
+        page_size: int = 200,
+    ) -> AsyncIterator[dict[str, object]]:
         if not self.enabled or self._client is None:
-            return []
-        return await asyncio.to_thread(self._list_inactive_members_sync, threshold_days)
+            return
+        cutoff = datetime.now(timezone.utc) - timedelta(days=threshold_days)
+        collection_ref = self._collection("members").select(INACTIVE_MEMBER_FIELDS)
+        indexed_query = collection_ref.where("context.last_active_at", "<=", cutoff).order_by(
+            "context.last_active_at"
+        )
+
+        yielded_any = False
+        try:
+            async for doc in self._iter_pages(indexed_query, page_size):
+                data = doc.to_dict() or {}
+                if not isinstance(data, dict):
+                    continue
+                data["discord_user_id"] = doc.id
+                yielded_any = True
+                yield data
+            return
+        except Exception:
+            if yielded_any:
+                logger.exception("Inactive query failed mid-scan; stopping this run.")
+                return
+            logger.exception("Inactive query failed; fallback to paged full scan.")
+
+        async for doc in self._iter_pages(collection_ref.order_by("__name__"), page_size):
+            data = _inactive_member_to_dict(doc, cutoff)
+            if data is not None:
+                yield data
 
     async def update_member_outreach(self, member_id: str, payload: dict[str, object]) -> None:
         if not self.enabled or self._client is None:
             return
-        await asyncio.to_thread(self._update_member_outreach_sync, member_id, payload)
+        increment = int(payload.get("outreach_count_increment", 0) or 0)
+        await self._write_now(
+            [
+                PendingWrite(
+                    "members",
+                    member_id,
+                    {
+                        "outreach": {
+                            "last_outreach_at": payload.get("last_outreach_at"),
+                            "outreach_count": firestore.Increment(increment),
+                        },
+                        "updated_at": datetime.now(timezone.utc),
+                    },
+                    merge=True,
+                )
+            ]
+        )
 
     async def update_member_intervention_preference(
         self,
@@ -145,93 +439,218 @@ class FirestoreService:
     ) -> None:
         if not self.enabled or self._client is None:
             return
-        await asyncio.to_thread(
-            self._update_member_intervention_preference_sync,
+        await self._enqueue_write(
+            "members",
             member_id,
-            preferences,
-        )
-
-    def _collection(self, name: str):
-        assert self._client is not None
-        return self._client.collection("community_bot").document("data").collection(name)
-
-    def _save_message_sync(self, record: MessageRecord) -> None:
-        self._collection("messages").document(record.message_id).set(record.to_dict())
-
-    def _save_primary_decision_sync(
-        self,
-        message_id: str,
-        input_payload: dict[str, object],
-        decision: PrimaryDecision,
-    ) -> None:
-        self._collection("decision_logs").document(message_id).set(
             {
-                "message_id": message_id,
-                "input": input_payload,
-                "decision": decision.to_dict(),
+                "intervention_preferences": preferences,
+                "updated_at": datetime.now(timezone.utc),
             },
             merge=True,
         )
 
-    def _save_bot_action_sync(self, action_id: str, payload: dict[str, object]) -> None:
-        self._collection("bot_actions").document(action_id).set(payload, merge=True)
+    async def _enqueue_write(
+        self,
+        collection: str,
+        document_id: str,
+        data: dict[str, object],
+        merge: bool,
+    ) -> None:
+        # Callers keep mutating runtime dicts after handing them over, so the
+        # buffered payload must be a snapshot.
+        write = PendingWrite(
+            collection=collection,
+            document_id=document_id,
+            data=copy.deepcopy(data),
+            merge=merge,
+        )
+        if self._wal is not None:
+            await self._wal.append_async([write])
+            if self._wal.depth >= self.batch_max_size:
+                self._wake_flusher()
+            return
+        if self._flush_task is None or self._flush_wakeup is None:
+            await self._commit([write])
+            return
+        self._pending.append(write)
+        if len(self._pending) >= self.batch_max_size:
+            self._wake_flusher()
+
+    async def _write_now(self, writes: list[PendingWrite]) -> None:
+        if self._wal is not None:
+            await self._wal.append_async(writes)
+            self._wake_flusher()
+            return
+        await self._commit(writes)
+
+    def _wake_flusher(self) -> None:
+        if self._flush_wakeup is not None:
+            self._flush_wakeup.set()
+
+    async def _flush_loop(self) -> None:
+        assert self._flush_wakeup is not None and self._flush_stop is not None
+        failures = 0
+        while not self._flush_stop.is_set():
+            if failures:
+                # Back off while Firestore is failing; new writes keep landing in the log.
+                backoff = min(
+                    MAX_DRAIN_BACKOFF_SECONDS,
+                    self.batch_max_age_seconds * (2**failures),
+                )
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self._flush_stop.wait(),
+                        timeout=backoff * random.uniform(0.5, 1.0),
+                    )
+            else:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self._flush_wakeup.wait(),
+                        timeout=self.batch_max_age_seconds,
+                    )
+            if self._flush_stop.is_set():
+                # close() runs the final flush itself.
+                return
+            self._flush_wakeup.clear()
+            drained = await self.flush()
+            failures = 0 if drained else min(failures + 1, 16)
+
+    async def _drain_wal(self) -> bool:
+        assert self._wal is not None
+        while True:
+            entries = await asyncio.to_thread(self._wal.peek, MAX_BATCH_WRITES)
+            if not entries:
+                return True
+            if entries[0].attempts > 0:
+                # Retry previously failed writes one at a time so a single bad
+                # document cannot block the whole log.
+                entries = entries[:1]
+            seqs = [entry.seq for entry in entries]
+            try:
+                await self._commit([entry.write for entry in entries])
+            except Exception as exc:
+                await asyncio.to_thread(self._wal.mark_failed, seqs)
+                entry = entries[0]
+                if (
+                    len(entries) == 1
+                    and entry.attempts + 1 >= self.wal_max_attempts
+                    and not _is_retryable_error(exc)
+                ):
+                    logger.error(
+                        "Dropping write to %s/%s after %s attempts: %s",
+                        entry.write.collection,
+                        entry.write.document_id,
+                        entry.attempts + 1,
+                        exc,
+                    )
+                    await asyncio.to_thread(self._wal.ack, seqs)
+                    continue
+                logger.warning(
+                    "Failed to replay %s write(s) from the write-ahead log (depth=%s): %s",
+                    len(entries),
+                    self._wal.depth,
+                    exc,
+                )
+                return False
+            await asyncio.to_thread(self._wal.ack, seqs)
+
+    async def _run(
+        self,
+        sync_fn: Callable[..., T],
+        async_fn: Callable[..., Awaitable[T]],
+        *args: Any,
+    ) -> T:
+        async with self._in_flight:
+            if self.backend == BACKEND_ASYNC:
+                return await async_fn(*args)
+            return await asyncio.to_thread(sync_fn, *args)
+
+    async def _commit(self, writes: list[PendingWrite]) -> None:
+        await self._run(self._commit_batch_sync, self._commit_batch_async, writes)
+
+    async def _iter_pages(self, query: Any, page_size: int) -> AsyncIterator[Any]:
+        last_doc = None
+        while True:
+            page_query = query.limit(page_size)
+            if last_doc is not None:
+                page_query = page_query.start_after(last_doc)
+            docs = await self._run(self._fetch_page_sync, self._fetch_page_async, page_query)
+            for doc in docs:
+                yield doc
+            if len(docs) < page_size:
+                return
+            last_doc = docs[-1]
+
+    async def _get_document(self, collection: str, document_id: str) -> dict[str, object] | None:
+        return await self._run(
+            self._get_document_sync,
+            self._get_document_async,
+            collection,
+            document_id,
+        )
 
-    def _save_member_profile_sync(self, member_id: str, payload: dict[str, object]) -> None:
-        self._collection("members").document(member_id).set(payload, merge=True)
+    def _collection(self, name: str):
+        assert self._client is not None
+        return self._client.collection("community_bot").document("data").collection(name)
 
-    def _save_topic_post_sync(self, topic_id: str, payload: dict[str, object]) -> None:
-        self._collection("bot_topics").document(topic_id).set(payload, merge=True)
+    def _commit_batch_sync(self, writes: list[PendingWrite]) -> None:
+        if len(writes) == 1:
+            write = writes[0]
+            self._collection(write.collection).document(write.document_id).set(
+                write.data,
+                merge=write.merge,
+            )
+            return
+        batch = self._client.batch()
+        for write in writes:
+            doc_ref = self._collection(write.collection).document(write.document_id)
+            batch.set(doc_ref, write.data, merge=write.merge)
+        batch.commit()
+
+    async def _commit_batch_async(self, writes: list[PendingWrite]) -> None:
+        if len(writes) == 1:
+            write = writes[0]
+            await self._collection(write.collection).document(write.document_id).set(
+                write.data,
+                merge=write.merge,
+            )
+            return
+        batch = self._client.batch()
+        for write in writes:
+            doc_ref = self._collection(write.collection).document(write.document_id)
+            batch.set(doc_ref, write.data, merge=write.merge)
+        await batch.commit()
 
-    def _save_outreach_log_sync(self, log_id: str, payload: dict[str, object]) -> None:
-        self._collection("outreach_logs").document(log_id).set(payload, merge=True)
+    def _get_document_sync(self, collection: str, document_id: str) -> dict[str, object] | None:
+        doc = self._collection(collection).document(document_id).get()
+        return _snapshot_to_dict(doc)
 
-    def _update_message_bot_action_sync(
+    async def _get_document_async(
         self,
-        message_id: str,
-        action_type: str,
-        action_at: object,
-    ) -> None:
-        self._collection("messages").document(message_id).set(
-            {
-                "bot_action": action_type,
-                "bot_action_at": action_at,
-            },
-            merge=True,
-        )
+        collection: str,
+        document_id: str,
+    ) -> dict[str, object] | None:
+        doc = await self._collection(collection).document(document_id).get()
+        return _snapshot_to_dict(doc)
 
-    def _load_config_sync(self) -> dict[str, object]:
-        doc = self._collection("config").document("settings").get()
-        if not doc.exists:
-            return {}
-        data = doc.to_dict() or {}
-        if not isinstance(data, dict):
-            return {}
-        return data
+    def _list_recent_topics_sync(self, limit: int) -> list[dict[str, object]]:
+        docs = self._recent_topics_query(limit).stream()
+        return [data for data in (_topic_to_dict(doc) for doc in docs) if data is not None]
 
-    def _save_config_partial_sync(self, payload: dict[str, object]) -> None:
-        clean_payload = dict(payload)
-        clean_payload["updated_at"] = datetime.now(timezone.utc)
-        self._collection("config").document("settings").set(clean_payload, merge=True)
+    async def _list_recent_topics_async(self, limit: int) -> list[dict[str, object]]:
+        results: list[dict[str, object]] = []
+        async for doc in self._recent_topics_query(limit).stream():
+            data = _topic_to_dict(doc)
+            if data is not None:
+                results.append(data)
+        return results
 
-    def _list_recent_topics_sync(self, limit: int) -> list[dict[str, object]]:
-        docs = (
+    def _recent_topics_query(self, limit: int):
+        return (
             self._collection("bot_topics")
             .order_by("timestamp", direction=firestore.Query.DESCENDING)
             .limit(limit)
-            .stream()
         )
-        results: list[dict[str, object]] = []
-        for doc in docs:
-            data = doc.to_dict() or {}
-            if not isinstance(data, dict):
-                continue
-            data["topic_id"] = doc.id
-            results.append(data)
-        return results
-
-    def _count_topics_for_date_sync(self, date_key: str) -> int:
-        docs = self._collection("bot_topics").where("date_key", "==", date_key).stream()
-        return sum(1 for _ in docs)
 
     def _has_topic_for_channel_date_sync(self, channel_id: str, date_key: str) -> bool:
         docs = self._collection("bot_topics").where("date_key", "==", date_key).stream()
@@ -241,81 +660,83 @@ class FirestoreService:
                 return True
         return False
 
-    def _has_topic_for_channel_hour_sync(self, channel_id: str, hour_key: str) -> bool:
-        docs = self._collection("bot_topics").where("hour_key", "==", hour_key).stream()
-        for doc in docs:
+    async def _has_topic_for_channel_date_async(self, channel_id: str, date_key: str) -> bool:
+        async for doc in self._collection("bot_topics").where("date_key", "==", date_key).stream():
             data = doc.to_dict() or {}
             if str(data.get("channel_id", "")) == str(channel_id):
                 return True
         return False
 
-    def _list_inactive_members_sync(self, threshold_days: int) -> list[dict[str, object]]:
-        cutoff = datetime.now(timezone.utc) - timedelta(days=threshold_days)
-        results: list[dict[str, object]] = []
-        collection_ref = self._collection("members")
-
-        try:
-            docs = collection_ref.where("context.last_active_at", "<=", cutoff).stream()
-            for doc in docs:
-                data = doc.to_dict() or {}
-                if not isinstance(data, dict):
-                    continue
-                data["discord_user_id"] = doc.id
-                results.append(data)
-            return results
-        except Exception:
-            logger.exception("Inactive query failed; fallback to full scan.")
-
-        docs = collection_ref.stream()
-        for doc in docs:
-            data = doc.to_dict() or {}
-            if not isinstance(data, dict):
-                continue
-            context = data.get("context", {})
-            if not isinstance(context, dict):
-                continue
-            last_active_at = context.get("last_active_at")
-            if isinstance(last_active_at, datetime):
-                if last_active_at.tzinfo is None:
-                    last_active_at = last_active_at.replace(tzinfo=timezone.utc)
-                if last_active_at <= cutoff:
-                    data["discord_user_id"] = doc.id
-                    results.append(data)
-        return results
-
-    def _update_member_outreach_sync(self, member_id: str, payload: dict[str, object]) -> None:
-        doc_ref = self._collection("members").document(member_id)
-        snapshot = doc_ref.get()
-        base = snapshot.to_dict() if snapshot.exists else {}
-        if not isinstance(base, dict):
-            base = {}
-        outreach = base.get("outreach", {})
-        if not isinstance(outreach, dict):
-            outreach = {}
-
-        increment = int(payload.get("outreach_count_increment", 0) or 0)
-        current_count = int(outreach.get("outreach_count", 0) or 0)
-        new_count = current_count + increment
-
-        update_payload = {
-            "outreach": {
-                "last_outreach_at": payload.get("last_outreach_at"),
-                "outreach_count": new_count,
-            },
-            "updated_at": datetime.now(timezone.utc),
-        }
-        doc_ref.set(update_payload, merge=True)
-
-    def _update_member_intervention_preference_sync(
-        self,
-        member_id: str,
-        preferences: dict[str, object],
-    ) -> None:
-        doc_ref = self._collection("members").document(member_id)
-        doc_ref.set(
-            {
-                "intervention_preferences": preferences,
-                "updated_at": datetime.now(timezone.utc),
-            },
-            merge=True,
-        )
+    def _fetch_page_sync(self, query: Any) -> list[Any]:
+        return list(query.stream())
+
+    async def _fetch_page_async(self, query: Any) -> list[Any]:
+        return [doc async for doc in query.stream()]
+
+
+def with_transforms(
+    payload: dict[str, object],
+    values: dict[str, object] | None,
+    transform: Callable[[Any], object],
+) -> dict[str, object]:
+    # Folds nested numeric leaves into a merge payload as server-side
+    # transforms (Increment, Maximum), so writers from several processes
+    # combine instead of overwriting each other.
+    merged = dict(payload)
+    for key, value in (values or {}).items():
+        if isinstance(value, dict):
+            child = merged.get(key)
+            merged[key] = with_transforms(child if isinstance(child, dict) else {}, value, transform)
+        else:
+            merged[key] = transform(value)
+    return merged
+
+
+def _is_retryable_error(exc: Exception) -> bool:
+    if google_exceptions is None or not isinstance(exc, google_exceptions.GoogleAPICallError):
+        return True
+    return isinstance(
+        exc,
+        (
+            google_exceptions.ServerError,
+            google_exceptions.TooManyRequests,
+            google_exceptions.DeadlineExceeded,
+            google_exceptions.Aborted,
+            google_exceptions.Unauthenticated,
+        ),
+    )
+
+
+def _snapshot_to_dict(doc: Any) -> dict[str, object] | None:
+    if not doc.exists:
+        return None
+    data = doc.to_dict() or {}
+    if not isinstance(data, dict):
+        return None
+    return data
+
+
+def _topic_to_dict(doc: Any) -> dict[str, object] | None:
+    data = doc.to_dict() or {}
+    if not isinstance(data, dict):
+        return None
+    data["topic_id"] = doc.id
+    return data
+
+
+def _inactive_member_to_dict(doc: Any, cutoff: datetime) -> dict[str, object] | None:
+    data = doc.to_dict() or {}
+    if not isinstance(data, dict):
+        return None
+    context = data.get("context", {})
+    if not isinstance(context, dict):
+        return None
+    last_active_at = context.get("last_active_at")
+    if not isinstance(last_active_at, datetime):
+        return None
+    if last_active_at.tzinfo is None:
+        last_active_at = last_active_at.replace(tzinfo=timezone.utc)
+    if last_active_at > cutoff:
+        return None
+    data["discord_user_id"] = doc.id
+    return data
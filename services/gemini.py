@@ -1,20 +1,52 @@
-import asyncio
 import json
 import logging
 
 try:
     import google.generativeai as genai
+    from google.api_core import exceptions as google_exceptions
 except Exception:  # pragma: no cover
     genai = None
+    google_exceptions = None
+
+from services.circuit_breaker import CircuitBreaker
+from services.llm_usage import LlmUsageTracker
+from services.prompt_cache import PromptCacheStats
+from services.rate_limiter import RateLimiter, estimate_tokens
+
+# Output budget assumed when reserving tokens for a JSON verdict.
+EXPECTED_OUTPUT_TOKENS = 256
 
 logger = logging.getLogger(__name__)
 
 
 class GeminiClient:
-    def __init__(self, api_key: str | None, model_name: str = "gemini-2.0-flash") -> None:
+    def __init__(
+        self,
+        api_key: str | None,
+        model_name: str = "gemini-2.0-flash",
+        max_connections: int = 20,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_retries: int = 3,
+        breaker: CircuitBreaker | None = None,
+        usage: LlmUsageTracker | None = None,
+    ) -> None:
         self.model_name = model_name
         self.enabled = False
         self._model = None
+        self._models: dict[str, object] = {}
+        self.cache_stats = PromptCacheStats()
+        # The async transport multiplexes calls over one gRPC channel; the
+        # limiter bounds how many run on it at once.
+        self.limiter = RateLimiter(
+            name="Gemini",
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+            max_in_flight=max_connections,
+            max_retries=max_retries,
+        )
+        self.breaker = breaker or CircuitBreaker(name="Gemini")
+        self.usage = usage
 
         if genai is None:
             logger.warning("google-generativeai is unavailable. Gemini disabled.")
@@ -31,17 +63,63 @@ class GeminiClient:
         except Exception:
             logger.exception("Failed to initialize Gemini client. Gemini disabled.")
 
-    async def generate_json(self, system_prompt: str, payload: dict[str, object]) -> str:
+    def _model_for(self, system_prompt: str) -> object:
+        model = self._models.get(system_prompt)
+        if model is None:
+            model = genai.GenerativeModel(
+                model_name=self.model_name,
+                system_instruction=system_prompt,
+            )
+            self._models[system_prompt] = model
+        return model
+
+    async def warm_up(self) -> None:
+        if not self.enabled or self._model is None:
+            return
+        try:
+            # count_tokens is free and opens the async channel.
+            await self._model.count_tokens_async("ping")
+            logger.info("Gemini connection warmed.")
+        except Exception:
+            logger.warning("Failed to warm Gemini connection.", exc_info=True)
+
+    async def generate_json(
+        self,
+        system_prompt: str,
+        payload: dict[str, object],
+        call_site: str = "unspecified",
+    ) -> str:
         if not self.enabled or self._model is None:
             raise RuntimeError("Gemini is disabled.")
 
+        # The static prompt goes in system_instruction so every call shares the
+        # same cacheable prefix; only the payload varies.
         prompt = (
-            f"{system_prompt}\n\n"
             "## 入力データ\n"
             f"{json.dumps(payload, ensure_ascii=False)}\n\n"
             "JSONのみを返してください。"
         )
-        response = await asyncio.to_thread(self._model.generate_content, prompt)
+        model = self._model_for(system_prompt)
+
+        async def limited() -> object:
+            return await self.limiter.call(
+                lambda: self.breaker.call(lambda: model.generate_content_async(prompt)),
+                estimated_tokens=estimate_tokens(system_prompt, prompt) + EXPECTED_OUTPUT_TOKENS,
+                classify=_retry_delay,
+                actual_tokens=_used_tokens,
+            )
+
+        if self.usage is not None:
+            response = await self.usage.measure("gemini", call_site, limited, _usage_counts)
+        else:
+            response = await limited()
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            cached_tokens = int(getattr(usage, "cached_content_token_count", 0) or 0)
+            self.cache_stats.record(
+                cached_tokens=cached_tokens,
+                uncached_tokens=int(getattr(usage, "prompt_token_count", 0) or 0) - cached_tokens,
+            )
         text = getattr(response, "text", None)
         if isinstance(text, str) and text.strip():
             return text.strip()
@@ -61,3 +139,46 @@ class GeminiClient:
                 if isinstance(part_text, str):
                     parts.append(part_text)
         return "\n".join(parts).strip()
+
+
+def _retry_delay(exc: Exception) -> float | None:
+    if google_exceptions is None:
+        return None
+    retryable = (
+        google_exceptions.TooManyRequests,
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.InternalServerError,
+        google_exceptions.DeadlineExceeded,
+    )
+    if not isinstance(exc, retryable):
+        return None
+    # RetryInfo, when present, carries the delay the server asked for.
+    for detail in getattr(exc, "details", None) or []:
+        retry_delay = getattr(detail, "retry_delay", None)
+        if retry_delay is None:
+            continue
+        seconds = getattr(retry_delay, "seconds", 0) or 0
+        nanos = getattr(retry_delay, "nanos", 0) or 0
+        return max(0.0, float(seconds) + float(nanos) / 1e9)
+    return 0.0
+
+
+def _used_tokens(response: object) -> int | None:
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return None
+    total = int(getattr(usage, "total_token_count", 0) or 0)
+    return total or None
+
+
+def _usage_counts(response: object) -> tuple[int, int, int]:
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return 0, 0, 0
+    cached_tokens = int(getattr(usage, "cached_content_token_count", 0) or 0)
+    return (
+        int(getattr(usage, "prompt_token_count", 0) or 0) - cached_tokens,
+        int(getattr(usage, "candidates_token_count", 0) or 0),
+        cached_tokens,
+    )
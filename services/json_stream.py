@@ -0,0 +1,78 @@
+import json
+
+
+# Collects the top-level fields of a JSON object while its text is still
+# streaming in, so callers can act before the closing brace arrives.
+class JsonFieldScanner:
+    def __init__(self) -> None:
+        self.fields: dict[str, object] = {}
+        self.complete = False
+        self._buffer: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._token_start: int | None = None
+        self._key: str | None = None
+        self._value_start: int | None = None
+        self._length = 0
+
+    @property
+    def text(self) -> str:
+        return "".join(self._buffer)
+
+    def feed(self, chunk: str) -> None:
+        if self.complete or not chunk:
+            return
+        self._buffer.append(chunk)
+        text = self.text
+        for index in range(self._length, len(text)):
+            self._step(text, index)
+            if self.complete:
+                break
+        self._length = len(text)
+
+    def _step(self, text: str, index: int) -> None:
+        char = text[index]
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if self._depth == 1 and self._key is None and self._token_start is not None:
+                    self._key = json.loads(text[self._token_start : index + 1])
+                    self._token_start = None
+            return
+
+        if char == '"':
+            self._in_string = True
+            if self._depth == 1 and self._key is None:
+                self._token_start = index
+            return
+        if self._depth == 0:
+            # Ignore code fences or chatter before the object starts.
+            if char == "{":
+                self._depth = 1
+            return
+        if char in "{[":
+            self._depth += 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                self._close_value(text, index)
+                self.complete = True
+        elif char == ":" and self._depth == 1 and self._key is not None:
+            self._value_start = index + 1
+        elif char == "," and self._depth == 1:
+            self._close_value(text, index)
+
+    def _close_value(self, text: str, end: int) -> None:
+        if self._key is not None and self._value_start is not None:
+            raw_value = text[self._value_start : end].strip()
+            try:
+                self.fields[self._key] = json.loads(raw_value)
+            except ValueError:
+                pass
+        self._key = None
+        self._value_start = None
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, TypeVar
+
+from services.circuit_breaker import CircuitOpenError
+from services.storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+OUTCOME_OK = "ok"
+OUTCOME_ERROR = "error"
+OUTCOME_REJECTED = "rejected"
+OUTCOME_CANCELLED = "cancelled"
+
+ResultT = TypeVar("ResultT")
+
+# (input_tokens, output_tokens, cached_tokens) read from a provider response.
+TokenCounter = Callable[[object], tuple[int, int, int]]
+
+
+@dataclass(slots=True)
+class UsageTotals:
+    calls: int = 0
+    errors: int = 0
+    rejected: int = 0
+    cancelled: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    latency_seconds: float = 0.0
+    max_latency_seconds: float = 0.0
+
+    def add(
+        self,
+        outcome: str,
+        latency_seconds: float,
+        input_tokens: int,
+        output_tokens: int,
+        cached_tokens: int,
+    ) -> None:
+        self.calls += 1
+        if outcome == OUTCOME_ERROR:
+            self.errors += 1
+        elif outcome == OUTCOME_REJECTED:
+            self.rejected += 1
+        elif outcome == OUTCOME_CANCELLED:
+            self.cancelled += 1
+        self.input_tokens += max(0, input_tokens)
+        self.output_tokens += max(0, output_tokens)
+        self.cached_tokens += max(0, cached_tokens)
+        self.latency_seconds += max(0.0, latency_seconds)
+        self.max_latency_seconds = max(self.max_latency_seconds, latency_seconds)
+
+    def merge(self, other: "UsageTotals") -> None:
+        self.calls += other.calls
+        self.errors += other.errors
+        self.rejected += other.rejected
+        self.cancelled += other.cancelled
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cached_tokens += other.cached_tokens
+        self.latency_seconds += other.latency_seconds
+        self.max_latency_seconds = max(self.max_latency_seconds, other.max_latency_seconds)
+
+    def counters(self) -> dict[str, object]:
+        # Everything but the maximum is additive across flushes and replicas.
+        payload = self.to_dict()
+        del payload["max_latency_seconds"]
+        return payload
+
+    @property
+    def avg_latency_seconds(self) -> float:
+        return self.latency_seconds / self.calls if self.calls else 0.0
+
+    def to_dict(self) -> dict[str, object]:
+        payload: dict[str, object] = asdict(self)
+        payload["latency_seconds"] = round(self.latency_seconds, 3)
+        payload["max_latency_seconds"] = round(self.max_latency_seconds, 3)
+        return payload
+
+
+class LlmUsageTracker:
+    def __init__(
+        self,
+        storage: StorageBackend | None = None,
+        flush_interval_seconds: float = 300.0,
+    ) -> None:
+        self.storage = storage
+        self.flush_interval_seconds = max(1.0, flush_interval_seconds)
+        self._totals: dict[str, UsageTotals] = {}
+        self._hourly: dict[str, dict[str, UsageTotals]] = {}
+        self._flush_task: asyncio.Task[None] | None = None
+
+    def record(
+        self,
+        provider: str,
+        call_site: str,
+        outcome: str,
+        latency_seconds: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cached_tokens: int = 0,
+    ) -> None:
+        key = f"{provider}:{call_site}"
+        hour_key = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H")
+        hour = self._hourly.setdefault(hour_key, {})
+        for totals in (
+            self._totals.setdefault(key, UsageTotals()),
+            hour.setdefault(key, UsageTotals()),
+        ):
+            totals.add(outcome, latency_seconds, input_tokens, output_tokens, cached_tokens)
+
+    async def measure(
+        self,
+        provider: str,
+        call_site: str,
+        fn: Callable[[], Awaitable[ResultT]],
+        count_tokens: TokenCounter,
+    ) -> ResultT:
+        started = time.monotonic()
+        try:
+            result = await fn()
+        except CircuitOpenError:
+            self.record(provider, call_site, OUTCOME_REJECTED, time.monotonic() - started)
+            raise
+        except asyncio.CancelledError:
+            # Hedged duplicates and early deadline exits land here.
+            self.record(provider, call_site, OUTCOME_CANCELLED, time.monotonic() - started)
+            raise
+        except Exception:
+            self.record(provider, call_site, OUTCOME_ERROR, time.monotonic() - started)
+            raise
+        try:
+            input_tokens, output_tokens, cached_tokens = count_tokens(result)
+        except Exception:
+            input_tokens = output_tokens = cached_tokens = 0
+        self.record(
+            provider,
+            call_site,
+            OUTCOME_OK,
+            time.monotonic() - started,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cached_tokens=cached_tokens,
+        )
+        return result
+
+    def totals(self) -> dict[str, UsageTotals]:
+        return dict(sorted(self._totals.items()))
+
+    async def start(self) -> None:
+        if self._flush_task is not None or self.storage is None:
+            return
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        await self.flush(include_current=True)
+
+    async def flush(self, include_current: bool = False) -> None:
+        # _hourly only holds what has not been written yet; each flush sends
+        # those deltas as increments so restarts and other replicas add to
+        # the stored rollup instead of overwriting it.
+        if self.storage is None:
+            return
+        current_hour = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H")
+        for hour_key in sorted(self._hourly):
+            if hour_key == current_hour and not include_current:
+                continue
+            sites = self._hourly.pop(hour_key)
+            try:
+                await self.storage.save_llm_usage(
+                    hour_key,
+                    {"hour_key": hour_key, "updated_at": datetime.now(timezone.utc)},
+                    counters={"sites": {key: totals.counters() for key, totals in sites.items()}},
+                    maxima={
+                        "sites": {
+                            key: {"max_latency_seconds": round(totals.max_latency_seconds, 3)}
+                            for key, totals in sites.items()
+                        }
+                    },
+                )
+            except Exception:
+                logger.exception("Failed to persist LLM usage rollup: %s", hour_key)
+                pending = self._hourly.setdefault(hour_key, {})
+                for key, totals in sites.items():
+                    pending.setdefault(key, UsageTotals()).merge(totals)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
@@ -0,0 +1,492 @@
+import asyncio
+import copy
+import json
+import logging
+import sqlite3
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, Callable, TypeVar
+
+from models.decision import PrimaryDecision
+from models.message import MessageRecord
+from services.firestore import INACTIVE_MEMBER_FIELDS, with_transforms
+from services.write_ahead_log import decode_value, encode_value
+
+logger = logging.getLogger(__name__)
+
+ResultT = TypeVar("ResultT")
+
+
+@dataclass(slots=True)
+class Increment:
+    value: int | float
+
+
+@dataclass(slots=True)
+class Maximum:
+    value: int | float
+
+
+def apply_write(
+    existing: dict[str, object] | None,
+    data: dict[str, object],
+    merge: bool,
+) -> dict[str, object]:
+    base = copy.deepcopy(existing) if merge and isinstance(existing, dict) else {}
+    _merge_into(base, data)
+    return base
+
+
+def _merge_into(target: dict[str, object], data: dict[str, object]) -> None:
+    # Mirrors Firestore set(merge=True): nested maps merge, other values replace.
+    for key, value in data.items():
+        if isinstance(value, (Increment, Maximum)):
+            current = target.get(key)
+            if not isinstance(current, (int, float)) or isinstance(current, bool):
+                target[key] = value.value
+            elif isinstance(value, Increment):
+                target[key] = current + value.value
+            else:
+                target[key] = max(current, value.value)
+        elif isinstance(value, dict):
+            child = target.get(key)
+            if not isinstance(child, dict):
+                child = {}
+                target[key] = child
+            _merge_into(child, value)
+        else:
+            target[key] = copy.deepcopy(value)
+
+
+def _timestamp_of(value: object) -> float | None:
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _last_active_of(data: dict[str, object]) -> float | None:
+    context = data.get("context")
+    if not isinstance(context, dict):
+        return None
+    return _timestamp_of(context.get("last_active_at"))
+
+
+def _project(data: dict[str, object], fields: list[str]) -> dict[str, object]:
+    projected: dict[str, object] = {}
+    for field_path in fields:
+        parts = field_path.split(".")
+        source: object = data
+        for part in parts:
+            if not isinstance(source, dict) or part not in source:
+                break
+            source = source[part]
+        else:
+            target = projected
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})  # type: ignore[assignment]
+            target[parts[-1]] = copy.deepcopy(source)
+    return projected
+
+
+class LocalStorage(ABC):
+    name = "local"
+    backend = "local"
+
+    def __init__(self) -> None:
+        self.enabled = True
+
+    @property
+    def pending_writes(self) -> int:
+        return 0
+
+    @property
+    def durable_queue(self) -> bool:
+        return False
+
+    async def start(self) -> None:
+        return
+
+    async def close(self) -> None:
+        return
+
+    async def flush(self) -> bool:
+        return True
+
+    async def save_message(self, record: MessageRecord) -> None:
+        await self._call(self._put, "messages", record.message_id, record.to_dict(), merge=False)
+
+    async def save_message_lifecycle(self, message_id: str, payload: dict[str, object]) -> None:
+        await self._call(self._put, "messages", message_id, payload, merge=False)
+
+    async def save_primary_decision(
+        self,
+        message_id: str,
+        input_payload: dict[str, object],
+        decision: PrimaryDecision,
+    ) -> None:
+        await self._call(
+            self._put,
+            "decision_logs",
+            message_id,
+            {
+                "message_id": message_id,
+                "input": input_payload,
+                "decision": decision.to_dict(),
+            },
+            merge=True,
+        )
+
+    async def save_bot_action(self, action_id: str, payload: dict[str, object]) -> None:
+        await self._call(self._put, "bot_actions", action_id, payload, merge=True)
+
+    async def save_member_profile(
+        self,
+        member_id: str,
+        payload: dict[str, object],
+        counters: dict[str, object] | None = None,
+    ) -> None:
+        data = with_transforms(payload, counters, Increment)
+        await self._call(self._put, "members", member_id, data, merge=True)
+
+    async def load_topic_ledger(self, limit: int = 50) -> None:
+        return
+
+    async def save_topic_post(self, topic_id: str, payload: dict[str, object]) -> None:
+        await self._call(self._put, "bot_topics", topic_id, payload, merge=True)
+
+    async def save_outreach_log(self, log_id: str, payload: dict[str, object]) -> None:
+        await self._call(self._put, "outreach_logs", log_id, payload, merge=True)
+
+    async def load_channel_summary(self, channel_id: str) -> dict[str, object] | None:
+        return await self._call(self._get, "channel_summaries", channel_id)
+
+    async def save_channel_summary(self, channel_id: str, payload: dict[str, object]) -> None:
+        await self._call(self._put, "channel_summaries", channel_id, payload, merge=True)
+
+    async def save_llm_usage(
+        self,
+        hour_key: str,
+        payload: dict[str, object],
+        counters: dict[str, object] | None = None,
+        maxima: dict[str, object] | None = None,
+    ) -> None:
+        data = with_transforms(with_transforms(payload, counters, Increment), maxima, Maximum)
+        await self._call(self._put, "llm_usage", hour_key, data, merge=True)
+
+    async def update_message_bot_action(
+        self,
+        message_id: str,
+        action_type: str,
+        action_at: object,
+    ) -> None:
+        await self._call(
+            self._put,
+            "messages",
+            message_id,
+            {
+                "bot_action": action_type,
+                "bot_action_at": action_at,
+            },
+            merge=True,
+        )
+
+    async def load_config(self) -> dict[str, object]:
+        return await self._call(self._get, "config", "settings") or {}
+
+    async def save_config_partial(self, payload: dict[str, object]) -> None:
+        clean_payload = dict(payload)
+        clean_payload["updated_at"] = datetime.now(timezone.utc)
+        await self._call(self._put, "config", "settings", clean_payload, merge=True)
+
+    async def list_recent_topics(self, limit: int = 10) -> list[dict[str, object]]:
+        return await self._call(self._recent_topics, limit)
+
+    async def count_topics_for_date(self, date_key: str) -> int:
+        return len(await self._call(self._find, "bot_topics", "date_key", date_key))
+
+    async def has_topic_for_channel_date(self, channel_id: str, date_key: str) -> bool:
+        topics = await self._call(self._find, "bot_topics", "date_key", date_key)
+        return any(str(data.get("channel_id", "")) == str(channel_id) for data in topics)
+
+    async def has_topic_for_channel_hour(self, channel_id: str, hour_key: str) -> bool:
+        topics = await self._call(self._find, "bot_topics", "hour_key", hour_key)
+        return any(str(data.get("channel_id", "")) == str(channel_id) for data in topics)
+
+    async def iter_inactive_members(
+        self,
+        threshold_days: int,
+        page_size: int = 200,
+    ) -> AsyncIterator[dict[str, object]]:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=threshold_days)
+        page_size = max(1, page_size)
+        # Keyset pagination on (last_active_at, member_id): each page is a
+        # short, independent read, so writes made while the caller is
+        # awaiting do not disturb the scan.
+        after: tuple[float, str] | None = None
+        while True:
+            page = await self._call(self._inactive_page, cutoff.timestamp(), page_size, after)
+            for member_id, data in page:
+                projected = _project(data, INACTIVE_MEMBER_FIELDS)
+                projected["discord_user_id"] = member_id
+                yield projected
+            if len(page) < page_size:
+                return
+            member_id, data = page[-1]
+            after = (_last_active_of(data) or 0.0, member_id)
+
+    async def update_member_outreach(self, member_id: str, payload: dict[str, object]) -> None:
+        increment = int(payload.get("outreach_count_increment", 0) or 0)
+        await self._call(
+            self._put,
+            "members",
+            member_id,
+            {
+                "outreach": {
+                    "last_outreach_at": payload.get("last_outreach_at"),
+                    "outreach_count": Increment(increment),
+                },
+                "updated_at": datetime.now(timezone.utc),
+            },
+            merge=True,
+        )
+
+    async def update_member_intervention_preference(
+        self,
+        member_id: str,
+        preferences: dict[str, object],
+    ) -> None:
+        await self._call(
+            self._put,
+            "members",
+            member_id,
+            {
+                "intervention_preferences": preferences,
+                "updated_at": datetime.now(timezone.utc),
+            },
+            merge=True,
+        )
+
+    async def _call(self, fn: Callable[..., ResultT], *args: object, **kwargs: object) -> ResultT:
+        # Backends whose hooks block override this to run them off the loop.
+        return fn(*args, **kwargs)
+
+    @abstractmethod
+    def _put(
+        self,
+        collection: str,
+        document_id: str,
+        data: dict[str, object],
+        merge: bool,
+    ) -> None: ...
+
+    @abstractmethod
+    def _get(self, collection: str, document_id: str) -> dict[str, object] | None: ...
+
+    @abstractmethod
+    def _find(self, collection: str, field: str, value: str) -> list[dict[str, object]]: ...
+
+    @abstractmethod
+    def _recent_topics(self, limit: int) -> list[dict[str, object]]: ...
+
+    @abstractmethod
+    def _inactive_page(
+        self,
+        cutoff_ts: float,
+        page_size: int,
+        after: tuple[float, str] | None,
+    ) -> list[tuple[str, dict[str, object]]]: ...
+
+
+class MemoryStorage(LocalStorage):
+    name = "memory"
+    backend = "memory"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._collections: dict[str, dict[str, dict[str, object]]] = {}
+
+    def _put(
+        self,
+        collection: str,
+        document_id: str,
+        data: dict[str, object],
+        merge: bool,
+    ) -> None:
+        docs = self._collections.setdefault(collection, {})
+        docs[document_id] = apply_write(docs.get(document_id), data, merge)
+
+    def _get(self, collection: str, document_id: str) -> dict[str, object] | None:
+        data = self._collections.get(collection, {}).get(document_id)
+        return copy.deepcopy(data) if data is not None else None
+
+    def _find(self, collection: str, field: str, value: str) -> list[dict[str, object]]:
+        return [
+            copy.deepcopy(data)
+            for data in self._collections.get(collection, {}).values()
+            if data.get(field) == value
+        ]
+
+    def _recent_topics(self, limit: int) -> list[dict[str, object]]:
+        topics = self._collections.get("bot_topics", {})
+        ranked = sorted(
+            topics.items(),
+            key=lambda item: _timestamp_of(item[1].get("timestamp")) or 0.0,
+            reverse=True,
+        )
+        results: list[dict[str, object]] = []
+        for topic_id, data in ranked[: max(0, limit)]:
+            entry = copy.deepcopy(data)
+            entry["topic_id"] = topic_id
+            results.append(entry)
+        return results
+
+    def _inactive_page(
+        self,
+        cutoff_ts: float,
+        page_size: int,
+        after: tuple[float, str] | None,
+    ) -> list[tuple[str, dict[str, object]]]:
+        members = self._collections.get("members", {})
+        keys: list[tuple[float, str]] = []
+        for member_id, data in members.items():
+            last_active = _last_active_of(data)
+            if last_active is None or last_active > cutoff_ts:
+                continue
+            if after is not None and (last_active, member_id) <= after:
+                continue
+            keys.append((last_active, member_id))
+        keys.sort()
+        return [(member_id, copy.deepcopy(members[member_id])) for _, member_id in keys[:page_size]]
+
+
+class SqliteStorage(LocalStorage):
+    name = "sqlite"
+    backend = "sqlite"
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Queries run on worker threads, one at a time and in call order.
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._lock = asyncio.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                collection TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                data TEXT NOT NULL,
+                sort_ts REAL,
+                date_key TEXT,
+                hour_key TEXT,
+                PRIMARY KEY (collection, doc_id)
+            );
+            CREATE INDEX IF NOT EXISTS documents_date_key
+                ON documents (collection, date_key);
+            CREATE INDEX IF NOT EXISTS documents_hour_key
+                ON documents (collection, hour_key);
+            CREATE INDEX IF NOT EXISTS documents_sort_ts
+                ON documents (collection, sort_ts);
+            """
+        )
+
+    async def close(self) -> None:
+        await self._call(self._conn.close)
+
+    async def _call(self, fn: Callable[..., ResultT], *args: object, **kwargs: object) -> ResultT:
+        async with self._lock:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    def _put(
+        self,
+        collection: str,
+        document_id: str,
+        data: dict[str, object],
+        merge: bool,
+    ) -> None:
+        existing = self._get(collection, document_id) if merge else None
+        merged = apply_write(existing, data, merge)
+        if collection == "members":
+            sort_ts = _last_active_of(merged)
+        else:
+            sort_ts = _timestamp_of(merged.get("timestamp"))
+        date_key = merged.get("date_key")
+        hour_key = merged.get("hour_key")
+        self._conn.execute(
+            "INSERT OR REPLACE INTO documents "
+            "(collection, doc_id, data, sort_ts, date_key, hour_key) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                collection,
+                document_id,
+                json.dumps(encode_value(merged), ensure_ascii=False),
+                sort_ts,
+                date_key if isinstance(date_key, str) else None,
+                hour_key if isinstance(hour_key, str) else None,
+            ),
+        )
+
+    def _get(self, collection: str, document_id: str) -> dict[str, object] | None:
+        row = self._conn.execute(
+            "SELECT data FROM documents WHERE collection = ? AND doc_id = ?",
+            (collection, document_id),
+        ).fetchone()
+        if row is None:
+            return None
+        return self._decode(row[0])
+
+    def _find(self, collection: str, field: str, value: str) -> list[dict[str, object]]:
+        if field not in {"date_key", "hour_key"}:
+            raise ValueError(f"Field is not indexed in SQLite storage: {field}")
+        rows = self._conn.execute(
+            f"SELECT data FROM documents WHERE collection = ? AND {field} = ?",
+            (collection, value),
+        ).fetchall()
+        return [self._decode(row[0]) for row in rows]
+
+    def _recent_topics(self, limit: int) -> list[dict[str, object]]:
+        rows = self._conn.execute(
+            "SELECT doc_id, data FROM documents WHERE collection = 'bot_topics' "
+            "ORDER BY sort_ts DESC LIMIT ?",
+            (max(0, limit),),
+        ).fetchall()
+        results: list[dict[str, object]] = []
+        for doc_id, data in rows:
+            entry = self._decode(data)
+            entry["topic_id"] = doc_id
+            results.append(entry)
+        return results
+
+    def _inactive_page(
+        self,
+        cutoff_ts: float,
+        page_size: int,
+        after: tuple[float, str] | None,
+    ) -> list[tuple[str, dict[str, object]]]:
+        if after is None:
+            rows = self._conn.execute(
+                "SELECT doc_id, data FROM documents "
+                "WHERE collection = 'members' AND sort_ts <= ? "
+                "ORDER BY sort_ts, doc_id LIMIT ?",
+                (cutoff_ts, page_size),
+            ).fetchall()
+        else:
+            rows = self._conn.execute(
+                "SELECT doc_id, data FROM documents "
+                "WHERE collection = 'members' AND sort_ts <= ? "
+                "AND (sort_ts, doc_id) > (?, ?) "
+                "ORDER BY sort_ts, doc_id LIMIT ?",
+                (cutoff_ts, after[0], after[1], page_size),
+            ).fetchall()
+        return [(doc_id, self._decode(data)) for doc_id, data in rows]
+
+    def _decode(self, raw: str) -> dict[str, object]:
+        data = decode_value(json.loads(raw))
+        return data if isinstance(data, dict) else {}
@@ -56,10 +56,9 @@ class MemberProfileService:
             "avatar_url": str(getattr(message.author.display_avatar, "url", "")),
             "joined_at": joined_at,
             "roles": role_names,
+            # total_posts / active_channel_counts / active_hours are persisted as
+            # server-side counters through ProfileCoalescer.submit(counters=...).
             "stats": {
-                "total_posts": total_posts,
-                "active_channels": list((stats.get("active_channels", {}) or {}).keys()),
-                "active_hours": stats.get("active_hours", {}),
                 "avg_post_length": round(avg_post_length, 2),
                 "post_frequency": round(post_frequency, 3),
                 "reaction_given_count": 0,
@@ -81,10 +80,7 @@ class MemberProfileService:
                 "helped_by": [],
                 "helped_others": [],
             },
-            "outreach": {
-                "last_outreach_at": None,
-                "outreach_count": 0,
-            },
+            # outreach.* is owned by the inactive-outreach scheduler.
             "updated_at": now,
         }
 
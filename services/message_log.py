@@ -0,0 +1,83 @@
+import logging
+from datetime import datetime
+
+from models.decision import PrimaryDecision
+from models.message import MessageRecord
+from services.storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_RECORD_SPLIT = "split"
+MESSAGE_RECORD_SINGLE = "single"
+
+# Full decision payloads live on the message document in single mode; the
+# bot_actions index keeps the rest so action queries and exports still work.
+ACTION_INDEX_DROPPED_FIELDS = ("primary_decision", "secondary_decision")
+
+
+class MessageLifecycle:
+    def __init__(self, storage: StorageBackend, record: MessageRecord, single: bool) -> None:
+        self.storage = storage
+        self.record = record
+        self.single = single
+        self._primary: dict[str, object] | None = None
+        self._action: dict[str, object] | None = None
+        self._committed = False
+
+    async def ingest(self) -> None:
+        if not self.single:
+            await self.storage.save_message(self.record)
+
+    async def primary(self, input_payload: dict[str, object], decision: PrimaryDecision) -> None:
+        if not self.single:
+            await self.storage.save_primary_decision(self.record.message_id, input_payload, decision)
+            return
+        self._primary = {
+            "input": input_payload,
+            "decision": decision.to_dict(),
+        }
+
+    async def action(self, action_id: str, payload: dict[str, object]) -> None:
+        if not self.single:
+            await self.storage.save_bot_action(action_id=action_id, payload=payload)
+            return
+        self._action = {"action_id": action_id, **payload}
+        index = {key: value for key, value in payload.items() if key not in ACTION_INDEX_DROPPED_FIELDS}
+        await self.storage.save_bot_action(action_id=action_id, payload=index)
+
+    async def mark_bot_action(self, action_type: str, action_at: datetime) -> None:
+        if not self.single:
+            await self.storage.update_message_bot_action(
+                message_id=self.record.message_id,
+                action_type=action_type,
+                action_at=action_at,
+            )
+            return
+        self.record.bot_action = action_type
+        self.record.bot_action_at = action_at
+
+    async def commit(self) -> None:
+        if not self.single or self._committed:
+            return
+        self._committed = True
+        # Top-level message fields (channel_id, author_id, timestamp, bot_action)
+        # stay where they are so existing indexes and queries keep working.
+        payload = self.record.to_dict()
+        payload["primary_decision"] = self._primary
+        payload["action"] = self._action
+        try:
+            await self.storage.save_message_lifecycle(self.record.message_id, payload)
+        except Exception:
+            logger.exception("Failed to save message lifecycle: %s", self.record.message_id)
+
+
+class MessageLogWriter:
+    def __init__(self, storage: StorageBackend, mode: str = MESSAGE_RECORD_SPLIT) -> None:
+        self.storage = storage
+        if mode not in {MESSAGE_RECORD_SPLIT, MESSAGE_RECORD_SINGLE}:
+            logger.warning("Unknown MESSAGE_RECORD_MODE=%s. Using split.", mode)
+            mode = MESSAGE_RECORD_SPLIT
+        self.mode = mode
+
+    def begin(self, record: MessageRecord) -> MessageLifecycle:
+        return MessageLifecycle(self.storage, record, single=self.mode == MESSAGE_RECORD_SINGLE)
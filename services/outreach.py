@@ -27,6 +27,7 @@ class OutreachService:
                         "recent_community_topics_summary": recent_topics_summary,
                     },
                     max_tokens=260,
+                    call_site="outreach",
                 )
                 if text.strip():
                     return text.strip()
@@ -4,33 +4,187 @@ import re
 from pathlib import Path
 
 from models.decision import PrimaryDecision
+from services.circuit_breaker import CircuitOpenError
+from services.deadline import Deadline, DeadlineExceeded, hedged, within
+from services.decision_cache import DecisionCache, primary_fingerprint
 from services.gemini import GeminiClient
+from services.micro_batcher import MicroBatcher
 
 logger = logging.getLogger(__name__)
 
+PREFILTER_RULES = ("mention", "quiet_hours", "active_conversation", "already_reacted")
+
+BATCH_PROMPT_SUFFIX = """
+
+## バッチ入力
+入力データは {"items": [{"id": "...", ...}]} 形式で、複数の投稿を含みます。
+各itemを独立に判断し、次のJSONのみを返してください:
+{
+  "decisions": [
+    {"id": "itemのid", "needs_intervention": true/false, "reason": "判断理由を1文で", "priority": 1-5}
+  ]
+}
+"""
+
 
 class PrimaryJudgeService:
-    def __init__(self, gemini: GeminiClient, prompt_path: str = "prompts/primary_judge.txt") -> None:
+    def __init__(
+        self,
+        gemini: GeminiClient,
+        prompt_path: str = "prompts/primary_judge.txt",
+        cache: DecisionCache | None = None,
+        batch_max_size: int = 1,
+        batch_max_wait_seconds: float = 0.2,
+        prefilter_rules: list[str] | None = None,
+        stage_timeout_seconds: float | None = None,
+        hedge_enabled: bool = False,
+    ) -> None:
         self.gemini = gemini
         self.prompt = Path(prompt_path).read_text(encoding="utf-8")
+        self.cache = cache or DecisionCache()
+        if prefilter_rules is None:
+            prefilter_rules = list(PREFILTER_RULES)
+        unknown = set(prefilter_rules) - set(PREFILTER_RULES)
+        if unknown:
+            logger.warning("Ignoring unknown primary pre-filter rules: %s", ", ".join(sorted(unknown)))
+        self.prefilter_rules = {rule for rule in prefilter_rules if rule in PREFILTER_RULES}
+        self.stage_counts: dict[str, int] = {"rule": 0, "cache": 0, "llm": 0, "fallback": 0}
+        self.stage_timeout_seconds = stage_timeout_seconds
+        self.hedge_enabled = hedge_enabled
+        self.hedge_stats: dict[str, int] = {"fired": 0, "won": 0}
+        self.batcher: MicroBatcher[dict[str, object], PrimaryDecision] | None = None
+        if batch_max_size > 1:
+            self.batcher = MicroBatcher(
+                self._judge_batch,
+                max_batch_size=batch_max_size,
+                max_wait_seconds=batch_max_wait_seconds,
+            )
+
+    async def judge(
+        self,
+        payload: dict[str, object],
+        deadline: Deadline | None = None,
+    ) -> PrimaryDecision:
+        return self._count_stage(await self._judge_staged(payload, deadline))
+
+    async def _judge_staged(
+        self,
+        payload: dict[str, object],
+        deadline: Deadline | None,
+    ) -> PrimaryDecision:
+        ruled = self._rule_decision(payload, self.prefilter_rules, model="prefilter-rule")
+        if ruled is not None:
+            ruled.stage = "rule"
+            return ruled
 
-    async def judge(self, payload: dict[str, object]) -> PrimaryDecision:
         if self.gemini.enabled:
+            cache_key = primary_fingerprint(payload)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                cached.stage = "cache"
+                return cached
+            batcher = self.batcher
             try:
-                raw = await self.gemini.generate_json(self.prompt, payload)
-                parsed = self._parse_json(raw)
-                return PrimaryDecision(
-                    needs_intervention=bool(parsed.get("needs_intervention", False)),
-                    reason=str(parsed.get("reason", "一次判断で介入不要")),
-                    priority=self._clamp_priority(parsed.get("priority")),
-                    model=self.gemini.model_name,
-                    raw_response=raw,
-                )
+                if batcher is not None:
+                    decision = await within(
+                        deadline,
+                        lambda: batcher.submit(payload),
+                        self.stage_timeout_seconds,
+                    )
+                else:
+                    decision = await within(
+                        deadline,
+                        lambda: self._judge_hedged(payload),
+                        self.stage_timeout_seconds,
+                    )
+            except CircuitOpenError:
+                logger.debug("Gemini circuit open. Using rule fallback.")
+            except DeadlineExceeded:
+                logger.info("Primary judge ran out of time budget. Using rule fallback.")
             except Exception:
                 logger.exception("Primary judge parse/generate failed. Falling back.")
+            else:
+                if decision.stage == "llm":
+                    self.cache.put(cache_key, decision)
+                return decision
 
         return self._fallback_decision(payload)
 
+    def _count_stage(self, decision: PrimaryDecision) -> PrimaryDecision:
+        self.stage_counts[decision.stage] = self.stage_counts.get(decision.stage, 0) + 1
+        return decision
+
+    async def _judge_once(self, payload: dict[str, object]) -> PrimaryDecision:
+        raw = await self.gemini.generate_json(self.prompt, payload, call_site="primary_judge")
+        return self._decision_from(self._parse_json(raw), raw)
+
+    async def _judge_hedged(self, payload: dict[str, object]) -> PrimaryDecision:
+        return await hedged(
+            lambda: self._judge_once(payload),
+            self._hedge_delay(),
+            self.hedge_stats,
+        )
+
+    def _hedge_delay(self) -> float | None:
+        # Hedge after the observed p90 so only the slowest tenth pays for a
+        # duplicate request.
+        breaker = getattr(self.gemini, "breaker", None)
+        if not self.hedge_enabled or breaker is None:
+            return None
+        if breaker.sample_count < breaker.min_calls:
+            return None
+        return max(0.05, breaker.latency_percentile(0.9))
+
+    async def _judge_batch(self, payloads: list[dict[str, object]]) -> list[PrimaryDecision]:
+        if len(payloads) == 1:
+            try:
+                return [await self._judge_hedged(payloads[0])]
+            except CircuitOpenError:
+                return [self._fallback_decision(payloads[0])]
+            except Exception:
+                logger.exception("Primary judge parse/generate failed. Falling back.")
+                return [self._fallback_decision(payloads[0])]
+
+        items = [{"id": str(index), **payload} for index, payload in enumerate(payloads)]
+        try:
+            raw = await self.gemini.generate_json(
+                self.prompt + BATCH_PROMPT_SUFFIX,
+                {"items": items},
+                call_site="primary_batch",
+            )
+            parsed = self._parse_json(raw)
+        except CircuitOpenError:
+            return [self._fallback_decision(payload) for payload in payloads]
+        except Exception:
+            logger.exception("Primary judge batch of %s failed. Falling back per item.", len(payloads))
+            return [self._fallback_decision(payload) for payload in payloads]
+
+        by_id: dict[str, dict[str, object]] = {}
+        entries = parsed.get("decisions")
+        if isinstance(entries, list):
+            for entry in entries:
+                if isinstance(entry, dict):
+                    by_id[str(entry.get("id", ""))] = entry
+
+        decisions: list[PrimaryDecision] = []
+        for index, payload in enumerate(payloads):
+            entry = by_id.get(str(index))
+            if entry is None:
+                logger.warning("Primary judge batch omitted item %s. Falling back.", index)
+                decisions.append(self._fallback_decision(payload))
+                continue
+            decisions.append(self._decision_from(entry, json.dumps(entry, ensure_ascii=False)))
+        return decisions
+
+    def _decision_from(self, parsed: dict[str, object], raw: str) -> PrimaryDecision:
+        return PrimaryDecision(
+            needs_intervention=bool(parsed.get("needs_intervention", False)),
+            reason=str(parsed.get("reason", "一次判断で介入不要")),
+            priority=self._clamp_priority(parsed.get("priority")),
+            model=self.gemini.model_name,
+            raw_response=raw,
+        )
+
     def _parse_json(self, raw: str) -> dict[str, object]:
         cleaned = raw.strip()
         if cleaned.startswith("```"):
@@ -52,44 +206,59 @@ class PrimaryJudgeService:
             return 1
         return max(1, min(5, priority))
 
-    def _fallback_decision(self, payload: dict[str, object]) -> PrimaryDecision:
-        is_bot_mentioned = bool(payload.get("is_bot_mentioned", False))
-        in_quiet_hours = bool(payload.get("in_quiet_hours", False))
-        has_reply = bool(payload.get("has_reply", False))
-        has_reaction = bool(payload.get("has_reaction", False))
-        author_is_new = bool(payload.get("author_is_new", False))
-        recent_channel_activity = int(payload.get("recent_channel_activity", 0) or 0)
-        hours_since_post = float(payload.get("hours_since_post", 0.0) or 0.0)
-        text = str(payload.get("message_content", ""))
-
-        if is_bot_mentioned:
+    def _rule_decision(
+        self,
+        payload: dict[str, object],
+        rules: set[str] | tuple[str, ...],
+        model: str,
+    ) -> PrimaryDecision | None:
+        # Confident verdicts only; anything ambiguous returns None.
+        if "mention" in rules and bool(payload.get("is_bot_mentioned", False)):
             return PrimaryDecision(
                 needs_intervention=True,
                 reason="Botへのメンションのため即時介入",
                 priority=5,
-                model="fallback-rule",
+                model=model,
             )
-        if in_quiet_hours:
+        if "quiet_hours" in rules and bool(payload.get("in_quiet_hours", False)):
             return PrimaryDecision(
                 needs_intervention=False,
                 reason="深夜帯のため見守り",
                 priority=1,
-                model="fallback-rule",
+                model=model,
             )
-        if recent_channel_activity >= 3:
+        recent_channel_activity = int(payload.get("recent_channel_activity", 0) or 0)
+        if "active_conversation" in rules and recent_channel_activity >= 3:
             return PrimaryDecision(
                 needs_intervention=False,
                 reason="会話が進行中のため見守り",
                 priority=1,
-                model="fallback-rule",
+                model=model,
             )
-        if has_reply or has_reaction:
+        has_reply = bool(payload.get("has_reply", False))
+        has_reaction = bool(payload.get("has_reaction", False))
+        if "already_reacted" in rules and (has_reply or has_reaction):
             return PrimaryDecision(
                 needs_intervention=False,
                 reason="既に反応があるため介入不要",
                 priority=1,
-                model="fallback-rule",
+                model=model,
             )
+        return None
+
+    def _fallback_decision(self, payload: dict[str, object]) -> PrimaryDecision:
+        decision = self._fallback_rules(payload)
+        decision.stage = "fallback"
+        return decision
+
+    def _fallback_rules(self, payload: dict[str, object]) -> PrimaryDecision:
+        ruled = self._rule_decision(payload, PREFILTER_RULES, model="fallback-rule")
+        if ruled is not None:
+            return ruled
+
+        author_is_new = bool(payload.get("author_is_new", False))
+        hours_since_post = float(payload.get("hours_since_post", 0.0) or 0.0)
+        text = str(payload.get("message_content", ""))
 
         looks_like_question = ("?" in text) or ("？" in text) or text.strip().endswith("か")
         if author_is_new:
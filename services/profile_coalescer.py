@@ -0,0 +1,173 @@
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from dataclasses import dataclass, field
+
+from services.storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+# Fields that change on every build and do not justify a write by themselves.
+VOLATILE_PROFILE_FIELDS = {"updated_at"}
+
+
+@dataclass(slots=True)
+class _ProfileEntry:
+    payload: dict[str, object]
+    dirty: bool
+    last_persisted_at: float | None
+    persisted: dict[str, object] | None = None
+    counters: dict[str, object] = field(default_factory=dict)
+
+
+class ProfileCoalescer:
+    def __init__(
+        self,
+        storage: StorageBackend,
+        window_seconds: float = 60.0,
+        max_members: int = 1000,
+    ) -> None:
+        self.storage = storage
+        self.window_seconds = max(0.0, window_seconds)
+        self.max_members = max(1, max_members)
+        self._entries: OrderedDict[str, _ProfileEntry] = OrderedDict()
+        self._flush_task: asyncio.Task[None] | None = None
+
+    @property
+    def dirty_count(self) -> int:
+        return sum(1 for entry in self._entries.values() if entry.dirty)
+
+    async def start(self) -> None:
+        if self._flush_task is not None:
+            return
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        await self.flush_all()
+
+    async def submit(
+        self,
+        member_id: str,
+        payload: dict[str, object],
+        counters: dict[str, object] | None = None,
+    ) -> None:
+        # counters are nested numeric deltas (e.g. stats.total_posts += 1);
+        # they accumulate here and go out as increments with the next write.
+        now = time.monotonic()
+        entry = self._entries.get(member_id)
+        if entry is None:
+            entry = _ProfileEntry(payload=payload, dirty=True, last_persisted_at=None)
+            self._entries[member_id] = entry
+        else:
+            entry.payload = payload
+            entry.dirty = True
+            self._entries.move_to_end(member_id)
+        if counters:
+            add_counters(entry.counters, counters)
+
+        if self._is_due(entry, now):
+            await self._persist(member_id, entry, now)
+        await self._evict_overflow()
+
+    async def flush_due(self) -> None:
+        now = time.monotonic()
+        for member_id, entry in list(self._entries.items()):
+            if entry.dirty and self._is_due(entry, now):
+                await self._persist(member_id, entry, now)
+
+    async def flush_all(self) -> None:
+        now = time.monotonic()
+        for member_id, entry in list(self._entries.items()):
+            if entry.dirty:
+                await self._persist(member_id, entry, now)
+
+    def _is_due(self, entry: _ProfileEntry, now: float) -> bool:
+        if entry.last_persisted_at is None:
+            return True
+        return (now - entry.last_persisted_at) >= self.window_seconds
+
+    async def _persist(self, member_id: str, entry: _ProfileEntry, now: float) -> bool:
+        entry.dirty = False
+        # submit() may replace the payload while the write is in flight; only
+        # what was actually sent may count as persisted.
+        snapshot = copy.deepcopy(entry.payload)
+        delta = profile_delta(entry.persisted, snapshot)
+        counters, entry.counters = entry.counters, {}
+        if not delta and not counters:
+            return True
+        entry.last_persisted_at = now
+        try:
+            await self.storage.save_member_profile(member_id, delta, counters or None)
+        except Exception:
+            entry.dirty = True
+            add_counters(entry.counters, counters)
+            logger.exception("Failed to persist member profile: %s", member_id)
+            return False
+        entry.persisted = snapshot
+        return True
+
+    async def _evict_overflow(self) -> None:
+        while len(self._entries) > self.max_members:
+            member_id, entry = next(iter(self._entries.items()))
+            if entry.dirty and not await self._persist(member_id, entry, time.monotonic()):
+                # Keep the unsaved profile and its counters; the flush loop
+                # retries it and eviction resumes once storage recovers.
+                return
+            if self._entries.get(member_id) is entry and not entry.dirty:
+                del self._entries[member_id]
+
+    async def _flush_loop(self) -> None:
+        interval = max(1.0, min(self.window_seconds, 10.0))
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush_due()
+
+
+def add_counters(target: dict[str, object], counters: dict[str, object]) -> None:
+    for key, value in counters.items():
+        if isinstance(value, dict):
+            child = target.get(key)
+            if not isinstance(child, dict):
+                child = {}
+                target[key] = child
+            add_counters(child, value)
+        else:
+            target[key] = target.get(key, 0) + value
+
+
+def profile_delta(
+    previous: dict[str, object] | None,
+    current: dict[str, object],
+) -> dict[str, object]:
+    if previous is None:
+        return dict(current)
+    delta = _changed_fields(previous, current)
+    if not any(key not in VOLATILE_PROFILE_FIELDS for key in delta):
+        return {}
+    for key in VOLATILE_PROFILE_FIELDS:
+        if key in current:
+            delta[key] = current[key]
+    return delta
+
+
+def _changed_fields(previous: dict[str, object], current: dict[str, object]) -> dict[str, object]:
+    # Returns a nested partial document holding only changed leaves, so a
+    # merge write touches exactly those field paths.
+    changed: dict[str, object] = {}
+    for key, value in current.items():
+        old_value = previous.get(key)
+        if isinstance(value, dict) and isinstance(old_value, dict):
+            nested = _changed_fields(old_value, value)
+            if nested:
+                changed[key] = nested
+        elif key not in previous or old_value != value:
+            changed[key] = value
+    return changed
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class PromptCacheStats:
+    hits: int = 0
+    misses: int = 0
+    cached_tokens: int = 0
+    written_tokens: int = 0
+    uncached_tokens: int = 0
+
+    def record(self, cached_tokens: int, written_tokens: int = 0, uncached_tokens: int = 0) -> None:
+        if cached_tokens > 0:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.cached_tokens += max(0, cached_tokens)
+        self.written_tokens += max(0, written_tokens)
+        self.uncached_tokens += max(0, uncached_tokens)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.hits} hit / {self.misses} miss ({self.hit_rate:.0%}), "
+            f"cached tokens {self.cached_tokens}"
+        )
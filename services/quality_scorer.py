@@ -0,0 +1,194 @@
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from services.decision_cache import normalize_text
+
+NG_PATTERNS = [
+    "べきです",
+    "絶対",
+    "必ず〜してください",
+    "普通は",
+    "常識",
+]
+
+# Sentence endings that read as orders or talking down to the member.
+CONDESCENDING_ENDINGS = (
+    "しなさい",
+    "しろ",
+    "すべき",
+    "すべきです",
+    "わかりますか",
+    "知らないんですか",
+)
+CONDESCENDING_PHRASES = (
+    "当たり前",
+    "当然です",
+    "簡単ですよ",
+    "ググって",
+    "自分で調べて",
+)
+
+_SENTENCE_END = re.compile(r"[。！!？?\n]")
+
+# Penalties subtracted from a perfect 1.0. The calibration report maps the raw
+# score onto the LLM evaluator's scale.
+PENALTIES = {
+    "too_short": 0.35,
+    "too_long": 0.2,
+    "extra_questions": 0.2,
+    "no_quote": 0.15,
+    "ng_pattern": 0.6,
+    "condescending": 0.4,
+    "repetition": 0.35,
+}
+
+
+@dataclass(slots=True)
+class LocalQuality:
+    score: float
+    raw_score: float
+    failed: list[str] = field(default_factory=list)
+
+
+def _bigrams(text: str) -> set[str]:
+    compact = normalize_text(text).replace(" ", "")
+    return {compact[index : index + 2] for index in range(len(compact) - 1)}
+
+
+def similarity(left: str, right: str) -> float:
+    left_grams = _bigrams(left)
+    right_grams = _bigrams(right)
+    if not left_grams or not right_grams:
+        return 0.0
+    return len(left_grams & right_grams) / len(left_grams | right_grams)
+
+
+def contains_ng_pattern(text: str) -> bool:
+    compact = text.replace(" ", "")
+    return any(pattern.replace(" ", "") in compact for pattern in NG_PATTERNS)
+
+
+class QualityScorer:
+    def __init__(
+        self,
+        uncertain_low: float = 0.55,
+        uncertain_high: float = 0.8,
+        scale: float = 1.0,
+        offset: float = 0.0,
+        min_chars: int = 15,
+        max_chars: int = 160,
+        repetition_threshold: float = 0.6,
+    ) -> None:
+        self.uncertain_low = uncertain_low
+        self.uncertain_high = uncertain_high
+        self.scale = scale
+        self.offset = offset
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.repetition_threshold = repetition_threshold
+
+    def score(self, content: str, recent_posts: Iterable[str] = ()) -> LocalQuality:
+        text = content.strip()
+        failed: list[str] = []
+        if len(text) < self.min_chars:
+            failed.append("too_short")
+        elif len(text) > self.max_chars:
+            failed.append("too_long")
+        if text.count("?") + text.count("？") > 1:
+            failed.append("extra_questions")
+        if "「" not in text:
+            failed.append("no_quote")
+        if contains_ng_pattern(text):
+            failed.append("ng_pattern")
+        if self._condescending(text):
+            failed.append("condescending")
+        if any(similarity(text, post) >= self.repetition_threshold for post in recent_posts):
+            failed.append("repetition")
+
+        raw_score = max(0.0, 1.0 - sum(PENALTIES[name] for name in failed))
+        calibrated = min(1.0, max(0.0, self.offset + self.scale * raw_score))
+        return LocalQuality(score=round(calibrated, 3), raw_score=round(raw_score, 3), failed=failed)
+
+    def is_uncertain(self, score: float) -> bool:
+        return self.uncertain_low <= score < self.uncertain_high
+
+    def _condescending(self, text: str) -> bool:
+        sentences = [part.strip() for part in _SENTENCE_END.split(text) if part.strip()]
+        return any(
+            sentence.endswith(CONDESCENDING_ENDINGS)
+            or any(phrase in sentence for phrase in CONDESCENDING_PHRASES)
+            for sentence in sentences
+        )
+
+
+def calibration_report(scorer: QualityScorer, records: Iterable[dict[str, object]]) -> dict[str, object]:
+    # Compares local scores with the quality_score logged on bot actions and
+    # fits a linear scale/offset onto it.
+    pairs: list[tuple[float, float]] = []
+    for record in records:
+        content = record.get("content")
+        logged = record.get("quality_score")
+        if not isinstance(content, str) or not content.strip():
+            continue
+        if record.get("type") in {"silent", "react_only"} or not isinstance(logged, (int, float)):
+            continue
+        pairs.append((scorer.score(content).raw_score, float(logged)))
+
+    report: dict[str, object] = {"samples": len(pairs)}
+    if not pairs:
+        return report
+
+    count = len(pairs)
+    mean_raw = sum(raw for raw, _ in pairs) / count
+    mean_logged = sum(logged for _, logged in pairs) / count
+    variance = sum((raw - mean_raw) ** 2 for raw, _ in pairs)
+    covariance = sum((raw - mean_raw) * (logged - mean_logged) for raw, logged in pairs)
+    scale = covariance / variance if variance else 1.0
+    offset = mean_logged - scale * mean_raw
+
+    errors: list[float] = []
+    agreements = 0
+    uncertain = 0
+    for raw, logged in pairs:
+        calibrated = min(1.0, max(0.0, offset + scale * raw))
+        errors.append(abs(calibrated - logged))
+        if scorer.is_uncertain(calibrated):
+            uncertain += 1
+        elif (calibrated >= 0.7) == (logged >= 0.7):
+            agreements += 1
+    decided = count - uncertain
+    report.update(
+        {
+            "scale": round(scale, 3),
+            "offset": round(offset, 3),
+            "mean_abs_error": round(sum(errors) / count, 3),
+            "uncertain_rate": round(uncertain / count, 3),
+            "decided_agreement": round(agreements / decided, 3) if decided else None,
+        }
+    )
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Calibrate the local quality scorer against logged bot actions (JSON lines).",
+    )
+    parser.add_argument("path", help="JSONL export of bot_actions with content and quality_score")
+    parser.add_argument("--low", type=float, default=0.55, help="lower edge of the uncertain band")
+    parser.add_argument("--high", type=float, default=0.8, help="upper edge of the uncertain band")
+    args = parser.parse_args(argv)
+
+    with open(args.path, encoding="utf-8") as handle:
+        records = [json.loads(line) for line in handle if line.strip()]
+    report = calibration_report(QualityScorer(uncertain_low=args.low, uncertain_high=args.high), records)
+    json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
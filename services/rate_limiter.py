@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+ResultT = TypeVar("ResultT")
+
+# Returns None when the error must not be retried, otherwise the delay the
+# provider asked for (0.0 when it did not say).
+RetryClassifier = Callable[[Exception], float | None]
+
+
+class TokenBucket:
+    def __init__(self, per_minute: int) -> None:
+        self.per_minute = max(0, per_minute)
+        self.capacity = float(self.per_minute)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.per_minute <= 0
+
+    async def acquire(self, amount: float) -> float:
+        if self.unlimited:
+            return 0.0
+        amount = min(max(0.0, amount), self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) * 60.0 / self.per_minute
+                waited += delay
+                await asyncio.sleep(delay)
+
+    def adjust(self, amount: float) -> None:
+        # Positive amounts give back over-estimated tokens; negative ones
+        # charge for usage the estimate missed.
+        if self.unlimited:
+            return
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.per_minute / 60.0)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_in_flight: int = 8,
+        max_retries: int = 3,
+        base_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 30.0,
+    ) -> None:
+        self.name = name
+        self.max_retries = max(0, max_retries)
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._in_flight = asyncio.Semaphore(max(1, max_in_flight))
+        self.in_flight = 0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[ResultT]],
+        estimated_tokens: int,
+        classify: RetryClassifier,
+        actual_tokens: Callable[[ResultT], int | None] | None = None,
+    ) -> ResultT:
+        attempt = 0
+        while True:
+            self.throttled_seconds += await self._requests.acquire(1)
+            self.throttled_seconds += await self._tokens.acquire(estimated_tokens)
+            try:
+                async with self._in_flight:
+                    self.in_flight += 1
+                    try:
+                        result = await fn()
+                    finally:
+                        self.in_flight -= 1
+            except Exception as exc:
+                retry_after = classify(exc)
+                if retry_after is None or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.retries += 1
+                delay = self._backoff(attempt, retry_after)
+                logger.warning(
+                    "%s call failed (%s). Retrying in %.1fs (attempt %s/%s).",
+                    self.name,
+                    type(exc).__name__,
+                    delay,
+                    attempt,
+                    self.max_retries,
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            if actual_tokens is not None:
+                used = actual_tokens(result)
+                if used is not None:
+                    self._tokens.adjust(estimated_tokens - used)
+            return result
+
+    def _backoff(self, attempt: int, retry_after: float) -> float:
+        if retry_after > 0:
+            # Never retry earlier than the provider asked; jitter spreads the herd.
+            return retry_after + random.uniform(0, min(1.0, retry_after * 0.1))
+        ceiling = min(self.max_backoff_seconds, self.base_backoff_seconds * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def summary(self) -> str:
+        return (
+            f"in flight {self.in_flight}, retries {self.retries}, "
+            f"throttled {self.throttled_seconds:.1f}s"
+        )
+
+
+def estimate_tokens(*texts: str) -> int:
+    # Rough: our traffic is mostly Japanese, which is close to one token per
+    # one or two characters.
+    return sum(len(text) for text in texts) // 2 + 1
@@ -97,8 +97,8 @@ class SchedulerService:
 
         date_key = now_local.date().isoformat()
         hour_key = self._hour_key(now_local)
-        daily_count = await self.bot.firestore.count_topics_for_date(date_key)
-        recent_topics_data = await self.bot.firestore.list_recent_topics(limit=10)
+        daily_count = await self.bot.storage.count_topics_for_date(date_key)
+        recent_topics_data = await self.bot.storage.list_recent_topics(limit=10)
         recent_topics = [str(item.get("content", "")) for item in recent_topics_data]
         for channel_id in channel_ids:
             if daily_count >= self.bot.settings.bot_daily_topic_limit:
@@ -111,7 +111,7 @@ class SchedulerService:
             ).get(channel_key)
             if last_hour_key == hour_key:
                 continue
-            if await self.bot.firestore.has_topic_for_channel_hour(channel_key, hour_key):
+            if await self.bot.storage.has_topic_for_channel_hour(channel_key, hour_key):
                 self.bot.runtime["atmosphere_last_run_key_by_channel"][channel_key] = hour_key
                 continue
 
@@ -132,13 +132,12 @@ class SchedulerService:
                 now_utc,
                 within_minutes=60,
             )
-            history_texts = [str(item.get("content", "")) for item in channel_history[-10:]]
-            channel_summary = " / ".join(history_texts)[:500]
+            channel_summary = self.bot.channel_summaries.digest(channel_key, channel_history)
 
             # If members are actively chatting in the last hour, observe only.
             if recent_activity >= 8:
                 self.bot.runtime["atmosphere_last_run_key_by_channel"][channel_key] = hour_key
-                await self.bot.firestore.save_bot_action(
+                await self.bot.storage.save_bot_action(
                     action_id=f"atmosphere-observe-{uuid4().hex[:8]}",
                     payload={
                         "type": "atmosphere_check",
@@ -165,7 +164,7 @@ class SchedulerService:
                 )
                 sent = await channel.send(content)
                 topic_id = str(sent.id)
-                await self.bot.firestore.save_topic_post(
+                await self.bot.storage.save_topic_post(
                     topic_id=topic_id,
                     payload={
                         "channel_id": channel_key,
@@ -181,7 +180,7 @@ class SchedulerService:
                         },
                     },
                 )
-                await self.bot.firestore.save_bot_action(
+                await self.bot.storage.save_bot_action(
                     action_id=f"{topic_id}-{uuid4().hex[:8]}",
                     payload={
                         "type": "topic_post",
@@ -205,7 +204,7 @@ class SchedulerService:
                 logger.info("Scheduled topic posted to channel %s", channel_key)
             except Exception:
                 logger.exception("Scheduled topic post failed.")
-                await self.bot.firestore.save_bot_action(
+                await self.bot.storage.save_bot_action(
                     action_id=f"topic-failed-{uuid4().hex[:8]}",
                     payload={
                         "type": "topic_post",
@@ -248,14 +247,7 @@ class SchedulerService:
         if self.bot.runtime.get("inactive_last_run_key") == run_key:
             return
 
-        members = await self.bot.firestore.list_inactive_members(
-            threshold_days=self.bot.settings.inactive_threshold_days
-        )
-        if not members:
-            self.bot.runtime["inactive_last_run_key"] = run_key
-            return
-
-        recent_topics_data = await self.bot.firestore.list_recent_topics(limit=5)
+        recent_topics_data = await self.bot.storage.list_recent_topics(limit=5)
         recent_summary = " / ".join(
             str(item.get("content", "")) for item in recent_topics_data if item.get("content")
         )[:500]
@@ -264,7 +256,10 @@ class SchedulerService:
             logger.warning("Guild not found for inactive outreach.")
             return
 
-        for member_doc in members:
+        members = self.bot.storage.iter_inactive_members(
+            threshold_days=self.bot.settings.inactive_threshold_days
+        )
+        async for member_doc in members:
             member_id = str(member_doc.get("discord_user_id", "")).strip()
             if not member_id:
                 continue
@@ -300,7 +295,7 @@ class SchedulerService:
                     await member.send(dm_text)
                     status = "sent"
                     action_type = "outreach_dm"
-                    await self.bot.firestore.update_member_outreach(
+                    await self.bot.storage.update_member_outreach(
                         member_id=member_id,
                         payload={
                             "last_outreach_at": now_utc,
@@ -317,7 +312,7 @@ class SchedulerService:
                     send_error = "send_failed"
 
             log_id = f"{run_key}-{member_id}"
-            await self.bot.firestore.save_outreach_log(
+            await self.bot.storage.save_outreach_log(
                 log_id=log_id,
                 payload={
                     "member_id": member_id,
@@ -329,7 +324,7 @@ class SchedulerService:
                     "error": send_error,
                 },
             )
-            await self.bot.firestore.save_bot_action(
+            await self.bot.storage.save_bot_action(
                 action_id=f"{log_id}-{uuid4().hex[:8]}",
                 payload={
                     "type": action_type,
@@ -1,13 +1,23 @@
+import asyncio
 import json
 import logging
 import re
+from collections import deque
 from pathlib import Path
 
 from models.decision import SecondaryDecision
+from services.circuit_breaker import CircuitOpenError
 from services.claude import ClaudeClient
+from services.context_builder import ContextBuilder
+from services.deadline import Deadline, DeadlineExceeded, within
+from services.quality_scorer import QualityScorer, contains_ng_pattern
 
 logger = logging.getLogger(__name__)
 
+# The stream is cut before the model states its confidence; silent was still
+# its first choice.
+EARLY_EXIT_SILENCE_CONFIDENCE = 0.8
+
 CHANNEL_PROMPT_SUFFIX = {
     "question": (
         "質問チャンネルです。短く具体的に。まず相手の要点を1点引用し、"
@@ -43,26 +53,54 @@ QUALITY_SYSTEM_PROMPT = """
 - 質問は最大1つ
 """.strip()
 
-NG_PATTERNS = [
-    "べきです",
-    "絶対",
-    "必ず〜してください",
-    "普通は",
-    "常識",
-]
-
 
 class SecondaryJudgeService:
-    def __init__(self, claude: ClaudeClient, prompt_path: str = "prompts/secondary_judge.txt") -> None:
+    def __init__(
+        self,
+        claude: ClaudeClient,
+        prompt_path: str = "prompts/secondary_judge.txt",
+        stage_timeout_seconds: float | None = None,
+        streaming: bool = False,
+        context_builder: ContextBuilder | None = None,
+        speculative: bool = False,
+        quality_scorer: QualityScorer | None = None,
+        candidates: int = 1,
+    ) -> None:
         self.claude = claude
         self.prompt = Path(prompt_path).read_text(encoding="utf-8")
+        self.stage_timeout_seconds = stage_timeout_seconds
+        self.streaming = streaming
+        self.context_builder = context_builder or ContextBuilder()
+        self.speculative = speculative
+        self.speculation_stats: dict[str, int] = {"started": 0, "used": 0, "cancelled": 0}
+        self.quality_scorer = quality_scorer or QualityScorer()
+        self.eval_stats: dict[str, int] = {"local": 0, "llm": 0}
+        self.recent_posts: deque[str] = deque(maxlen=20)
+        self.candidates = min(3, max(1, candidates))
+        self.alternatives_used = 0
 
-    async def judge(self, payload: dict[str, object]) -> SecondaryDecision:
+    async def judge(
+        self,
+        payload: dict[str, object],
+        deadline: Deadline | None = None,
+    ) -> SecondaryDecision:
+        reasoning = "Claude未設定またはエラーのため見守り"
         if self.claude.enabled:
+            # Every stage of the quality gate resends this, so bound it once.
+            payload = self.context_builder.build(payload)
             try:
-                first = await self._generate_once(payload, retry=False)
-                final = await self._quality_gate(payload, first)
+                first, *alternatives = self._rank_candidates(
+                    await self._generate_candidates(payload, retry=False, deadline=deadline)
+                )
+                final = await self._quality_gate(payload, first, deadline, alternatives)
+                if final.content:
+                    self.recent_posts.append(final.content)
                 return final
+            except CircuitOpenError:
+                logger.info("Claude circuit open. Staying silent.")
+            except DeadlineExceeded:
+                logger.info("Secondary judge ran out of time budget. Staying silent.")
+                reasoning = "時間切れのため見守り"
             except Exception:
                 logger.exception("Secondary judge parse/generate failed. Falling back.")
 
@@ -75,22 +113,101 @@ class SecondaryJudgeService:
             confidence=0.0,
             silence_confidence=1.0,
             quality_score=0.0,
-            reasoning="Claude未設定またはエラーのため見守り",
+            reasoning=reasoning,
             model="fallback-rule",
         )
 
-    async def _generate_once(self, payload: dict[str, object], retry: bool) -> SecondaryDecision:
+    async def _generate_once(
+        self,
+        payload: dict[str, object],
+        retry: bool,
+        deadline: Deadline | None = None,
+    ) -> SecondaryDecision:
+        candidates = await self._generate_candidates(payload, retry, deadline)
+        return candidates[0]
+
+    async def _generate_candidates(
+        self,
+        payload: dict[str, object],
+        retry: bool,
+        deadline: Deadline | None = None,
+    ) -> list[SecondaryDecision]:
         channel_type = str(payload.get("channel_type", "chat"))
         suffix = CHANNEL_PROMPT_SUFFIX.get(channel_type, CHANNEL_PROMPT_SUFFIX["chat"])
-        system_prompt = self.prompt + "\n\n## 追加ルール\n" + suffix
+        system_suffix = "## 追加ルール\n" + suffix
         if retry:
-            system_prompt += (
+            system_suffix += (
                 "\nさらに、押しつけ感のある表現を避け、"
                 "文脈を1点引用し、質問は最大1つ、120文字程度に収めること。"
             )
+        max_tokens = 700
+        if self.candidates > 1:
+            system_suffix += (
+                f"\n介入する場合は \"alternatives\" 配列に別案を最大{self.candidates - 1}件、"
+                "良い順に追加すること。各要素は intervention_type, tone, content, "
+                "reaction_emoji のみを持つこと。"
+            )
+            max_tokens += 250 * (self.candidates - 1)
 
-        raw = await self.claude.generate_json(system_prompt, payload)
-        parsed = self._parse_json(raw)
+        call_site = "secondary_retry" if retry else "secondary_generate"
+        if self.streaming:
+            streamed = await within(
+                deadline,
+                lambda: self.claude.stream_json(
+                    self.prompt,
+                    payload,
+                    stop_when=_decision_settled,
+                    system_suffix=system_suffix,
+                    max_tokens=max_tokens,
+                    call_site=call_site,
+                ),
+                self.stage_timeout_seconds,
+            )
+            raw = streamed.text
+            settled = streamed.stopped_early or streamed.complete
+            if settled and "intervention_type" in streamed.fields:
+                parsed = dict(streamed.fields)
+            else:
+                # A truncated stream must not turn into a half-written reply;
+                # parsing the raw text fails the same way the blocking call would.
+                parsed = self._parse_json(raw)
+            if streamed.stopped_early:
+                parsed.setdefault("reasoning", "判断確定のため生成を早期終了")
+                if parsed.get("intervention_type") == "silent":
+                    parsed.setdefault("silence_confidence", EARLY_EXIT_SILENCE_CONFIDENCE)
+        else:
+            raw = await within(
+                deadline,
+                lambda: self.claude.generate_json(
+                    self.prompt,
+                    payload,
+                    system_suffix=system_suffix,
+                    max_tokens=max_tokens,
+                    call_site=call_site,
+                ),
+                self.stage_timeout_seconds,
+            )
+            parsed = self._parse_json(raw)
+
+        alternatives = parsed.pop("alternatives", None)
+        decisions = [self._decision_from(payload, parsed, raw)]
+        if isinstance(alternatives, list):
+            for index, alternative in enumerate(alternatives[: self.candidates - 1], start=1):
+                if not isinstance(alternative, dict):
+                    continue
+                # Alternatives only carry the reply itself; scores and
+                # reasoning come from the top candidate.
+                merged = {**parsed, "mention_users": [], "reaction_emoji": None, **alternative}
+                merged["reasoning"] = f"{parsed.get('reasoning', '二次判断')} / 代替案{index}"
+                decisions.append(self._decision_from(payload, merged, raw))
+        return decisions
+
+    def _decision_from(
+        self,
+        payload: dict[str, object],
+        parsed: dict[str, object],
+        raw: str,
+    ) -> SecondaryDecision:
         decision = SecondaryDecision(
             intervention_type=str(parsed.get("intervention_type", "silent")),
             tone=str(parsed.get("tone", "warm")),
@@ -110,13 +227,27 @@ class SecondaryJudgeService:
         self,
         payload: dict[str, object],
         decision: SecondaryDecision,
+        deadline: Deadline | None = None,
+        alternatives: list[SecondaryDecision] | None = None,
     ) -> SecondaryDecision:
+        spare = list(alternatives or [])
+
+        async def regenerate() -> SecondaryDecision:
+            # Candidates from the same response are free; only ask Claude
+            # again when none of them is usable.
+            while spare:
+                candidate = spare.pop(0)
+                if not self._contains_ng_pattern(candidate.content):
+                    self.alternatives_used += 1
+                    return candidate
+            return await self._generate_once(payload, retry=True, deadline=deadline)
+
         if decision.intervention_type in {"silent", "react_only"}:
             decision.quality_score = max(decision.quality_score, 0.9)
             return decision
 
         if self._contains_ng_pattern(decision.content):
-            retry_decision = await self._generate_once(payload, retry=True)
+            retry_decision = await regenerate()
             if not self._contains_ng_pattern(retry_decision.content):
                 retry_decision.quality_score = max(retry_decision.quality_score, 0.75)
                 return retry_decision
@@ -126,35 +257,104 @@ class SecondaryJudgeService:
             decision.reasoning += " / NG表現検出のためsilent"
             return decision
 
-        eval_result = await self._evaluate_quality(payload, decision)
+        async def evaluate_retry() -> tuple[SecondaryDecision, dict[str, object]]:
+            retry_decision = await regenerate()
+            return retry_decision, await self._evaluate_quality(payload, retry_decision, deadline)
+
+        # Speculate only while the LLM evaluator is deciding and no clean
+        # alternative is left: the retry then costs one Claude call that runs
+        # alongside the evaluation instead of after it.
+        retry_eval_task: asyncio.Future[tuple[SecondaryDecision, dict[str, object]]] | None = None
+        if (
+            self.speculative
+            and not any(not self._contains_ng_pattern(candidate.content) for candidate in spare)
+            and self.quality_scorer.is_uncertain(
+                self.quality_scorer.score(decision.content, self.recent_posts).score
+            )
+        ):
+            retry_eval_task = asyncio.ensure_future(evaluate_retry())
+            self.speculation_stats["started"] += 1
+        try:
+            eval_result = await self._evaluate_quality(payload, decision, deadline)
+        except BaseException:
+            if retry_eval_task is not None and self._discard(retry_eval_task):
+                self.speculation_stats["cancelled"] += 1
+            raise
         qscore = self._clamp_score(eval_result.get("quality_score"))
         needs_regen = bool(eval_result.get("needs_regeneration", False))
         decision.quality_score = max(decision.quality_score, qscore)
         if needs_regen or qscore < 0.7:
-            retry_decision = await self._generate_once(payload, retry=True)
-            retry_eval = await self._evaluate_quality(payload, retry_decision)
+            if retry_eval_task is not None:
+                retry_decision, retry_eval = await retry_eval_task
+            else:
+                retry_decision, retry_eval = await evaluate_retry()
             retry_score = self._clamp_score(retry_eval.get("quality_score"))
             retry_decision.quality_score = max(retry_decision.quality_score, retry_score)
             if retry_score >= qscore:
+                if retry_eval_task is not None:
+                    self.speculation_stats["used"] += 1
                 return retry_decision
+        elif retry_eval_task is not None and self._discard(retry_eval_task):
+            self.speculation_stats["cancelled"] += 1
         return decision
 
+    def _rank_candidates(self, candidates: list[SecondaryDecision]) -> list[SecondaryDecision]:
+        top = candidates[0]
+        if len(candidates) == 1 or top.intervention_type in {"silent", "react_only"}:
+            return candidates
+        for index, candidate in enumerate(candidates):
+            if self._contains_ng_pattern(candidate.content):
+                continue
+            local = self.quality_scorer.score(candidate.content, self.recent_posts)
+            if local.score >= self.quality_scorer.uncertain_low:
+                if index:
+                    self.alternatives_used += 1
+                return [candidate, *candidates[:index], *candidates[index + 1 :]]
+        return candidates
+
+    @staticmethod
+    def _discard(task: asyncio.Future[object]) -> bool:
+        # Returns True when unfinished work had to be cancelled.
+        if not task.done():
+            task.cancel()
+            return True
+        if not task.cancelled():
+            # Mark a failure we no longer care about as retrieved.
+            task.exception()
+        return False
+
     async def _evaluate_quality(
         self,
         payload: dict[str, object],
         decision: SecondaryDecision,
+        deadline: Deadline | None = None,
     ) -> dict[str, object]:
         if not self.claude.enabled:
             return {"quality_score": decision.quality_score, "needs_regeneration": False}
-        raw = await self.claude.generate_json(
-            QUALITY_SYSTEM_PROMPT,
-            {
-                "message_content": payload.get("message_content", ""),
-                "channel_type": payload.get("channel_type", ""),
-                "generated_intervention_type": decision.intervention_type,
-                "generated_content": decision.content,
-                "generated_tone": decision.tone,
-            },
+        local = self.quality_scorer.score(decision.content, self.recent_posts)
+        if not self.quality_scorer.is_uncertain(local.score):
+            # Clear passes and clear failures do not need an LLM opinion.
+            self.eval_stats["local"] += 1
+            return {
+                "quality_score": local.score,
+                "needs_regeneration": local.score < self.quality_scorer.uncertain_low,
+                "failed_checks": local.failed,
+            }
+        self.eval_stats["llm"] += 1
+        raw = await within(
+            deadline,
+            lambda: self.claude.generate_json(
+                QUALITY_SYSTEM_PROMPT,
+                {
+                    "message_content": payload.get("message_content", ""),
+                    "channel_type": payload.get("channel_type", ""),
+                    "generated_intervention_type": decision.intervention_type,
+                    "generated_content": decision.content,
+                    "generated_tone": decision.tone,
+                },
+                call_site="quality_eval",
+            ),
+            self.stage_timeout_seconds,
         )
         return self._parse_json(raw)
 
@@ -190,8 +390,7 @@ class SecondaryJudgeService:
         return decision
 
     def _contains_ng_pattern(self, text: str) -> bool:
-        compact = text.replace(" ", "")
-        return any(pattern.replace(" ", "") in compact for pattern in NG_PATTERNS)
+        return contains_ng_pattern(text)
 
     def _parse_json(self, raw: str) -> dict[str, object]:
         cleaned = raw.strip()
@@ -229,3 +428,13 @@ class SecondaryJudgeService:
         except (TypeError, ValueError):
             return 0.0
         return max(0.0, min(1.0, score))
+
+
+def _decision_settled(fields: dict[str, object]) -> bool:
+    # silent discards everything after the type; react_only only needs the emoji.
+    intervention_type = fields.get("intervention_type")
+    if intervention_type == "silent":
+        return True
+    if intervention_type == "react_only":
+        return "reaction_emoji" in fields
+    return False
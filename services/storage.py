@@ -0,0 +1,125 @@
+import logging
+from typing import AsyncIterator, Protocol
+
+from config.settings import Settings
+from models.decision import PrimaryDecision
+from models.message import MessageRecord
+from services.firestore import FirestoreService
+from services.local_storage import MemoryStorage, SqliteStorage
+
+logger = logging.getLogger(__name__)
+
+STORAGE_FIRESTORE = "firestore"
+STORAGE_MEMORY = "memory"
+STORAGE_SQLITE = "sqlite"
+
+
+class StorageBackend(Protocol):
+    name: str
+    enabled: bool
+    backend: str
+
+    @property
+    def pending_writes(self) -> int: ...
+
+    @property
+    def durable_queue(self) -> bool: ...
+
+    async def start(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+    async def flush(self) -> bool: ...
+
+    async def save_message(self, record: MessageRecord) -> None: ...
+
+    async def save_message_lifecycle(self, message_id: str, payload: dict[str, object]) -> None: ...
+
+    async def save_primary_decision(
+        self,
+        message_id: str,
+        input_payload: dict[str, object],
+        decision: PrimaryDecision,
+    ) -> None: ...
+
+    async def save_bot_action(self, action_id: str, payload: dict[str, object]) -> None: ...
+
+    async def save_member_profile(
+        self,
+        member_id: str,
+        payload: dict[str, object],
+        counters: dict[str, object] | None = None,
+    ) -> None: ...
+
+    async def load_topic_ledger(self, limit: int = 50) -> None: ...
+
+    async def save_topic_post(self, topic_id: str, payload: dict[str, object]) -> None: ...
+
+    async def save_outreach_log(self, log_id: str, payload: dict[str, object]) -> None: ...
+
+    async def load_channel_summary(self, channel_id: str) -> dict[str, object] | None: ...
+
+    async def save_channel_summary(self, channel_id: str, payload: dict[str, object]) -> None: ...
+
+    async def save_llm_usage(
+        self,
+        hour_key: str,
+        payload: dict[str, object],
+        counters: dict[str, object] | None = None,
+        maxima: dict[str, object] | None = None,
+    ) -> None: ...
+
+    async def update_message_bot_action(
+        self,
+        message_id: str,
+        action_type: str,
+        action_at: object,
+    ) -> None: ...
+
+    async def load_config(self) -> dict[str, object]: ...
+
+    async def save_config_partial(self, payload: dict[str, object]) -> None: ...
+
+    async def list_recent_topics(self, limit: int = 10) -> list[dict[str, object]]: ...
+
+    async def count_topics_for_date(self, date_key: str) -> int: ...
+
+    async def has_topic_for_channel_date(self, channel_id: str, date_key: str) -> bool: ...
+
+    async def has_topic_for_channel_hour(self, channel_id: str, hour_key: str) -> bool: ...
+
+    def iter_inactive_members(
+        self,
+        threshold_days: int,
+        page_size: int = 200,
+    ) -> AsyncIterator[dict[str, object]]: ...
+
+    async def update_member_outreach(self, member_id: str, payload: dict[str, object]) -> None: ...
+
+    async def update_member_intervention_preference(
+        self,
+        member_id: str,
+        preferences: dict[str, object],
+    ) -> None: ...
+
+
+def create_storage(settings: Settings) -> StorageBackend:
+    backend = settings.storage_backend
+    if backend == STORAGE_MEMORY:
+        logger.info("Using in-memory storage. Data is lost on restart.")
+        return MemoryStorage()
+    if backend == STORAGE_SQLITE:
+        logger.info("Using SQLite storage: %s", settings.sqlite_path)
+        return SqliteStorage(path=settings.sqlite_path)
+    if backend != STORAGE_FIRESTORE:
+        logger.warning("Unknown STORAGE_BACKEND=%s. Using Firestore.", backend)
+
+    return FirestoreService(
+        project_id=settings.google_cloud_project,
+        write_behind=settings.firestore_write_behind,
+        batch_max_size=settings.firestore_batch_max_size,
+        batch_max_age_seconds=settings.firestore_batch_max_age_ms / 1000.0,
+        backend=settings.firestore_backend,
+        max_in_flight=settings.firestore_max_in_flight,
+        wal_path=settings.firestore_wal_path,
+    )
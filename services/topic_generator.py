@@ -35,6 +35,7 @@ class TopicGeneratorService:
                         "recent_channel_summary": recent_channel_summary,
                     },
                     max_tokens=220,
+                    call_site="topic",
                 )
                 content = content.strip()
                 if content:
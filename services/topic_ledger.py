@@ -0,0 +1,70 @@
+from collections import deque
+from datetime import datetime
+
+
+def topic_slot_id(channel_id: str, hour_key: str) -> str:
+    return f"{channel_id}-{hour_key}"
+
+
+class TopicLedger:
+    def __init__(self, recent_limit: int = 50) -> None:
+        self.loaded = False
+        self._recent: deque[dict[str, object]] = deque(maxlen=max(1, recent_limit))
+        self._topic_ids: set[str] = set()
+        self._date_counts: dict[str, int] = {}
+        self._channel_dates: set[str] = set()
+        self._channel_hours: set[str] = set()
+
+    def load(self, topics: list[dict[str, object]]) -> None:
+        ordered = sorted(topics, key=_timestamp_sort_key)
+        for topic in ordered:
+            topic_id = str(topic.get("topic_id", "")).strip()
+            if topic_id:
+                self.record(topic_id, topic)
+        self.loaded = True
+
+    def record(self, topic_id: str, payload: dict[str, object]) -> None:
+        if topic_id in self._topic_ids:
+            return
+        self._topic_ids.add(topic_id)
+        entry = dict(payload)
+        entry["topic_id"] = topic_id
+        self._recent.append(entry)
+
+        channel_id = str(payload.get("channel_id", ""))
+        date_key = payload.get("date_key")
+        if isinstance(date_key, str) and date_key:
+            self._date_counts[date_key] = self._date_counts.get(date_key, 0) + 1
+            self._channel_dates.add(f"{channel_id}-{date_key}")
+        hour_key = payload.get("hour_key")
+        if isinstance(hour_key, str) and hour_key:
+            self._channel_hours.add(topic_slot_id(channel_id, hour_key))
+
+    def mark_channel_hour(self, channel_id: str, hour_key: str) -> None:
+        self._channel_hours.add(topic_slot_id(channel_id, hour_key))
+
+    def count_for_date(self, date_key: str) -> int:
+        return self._date_counts.get(date_key, 0)
+
+    def has_channel_date(self, channel_id: str, date_key: str) -> bool:
+        return f"{channel_id}-{date_key}" in self._channel_dates
+
+    def has_channel_hour(self, channel_id: str, hour_key: str) -> bool:
+        return topic_slot_id(channel_id, hour_key) in self._channel_hours
+
+    def recent(self, limit: int = 10) -> list[dict[str, object]]:
+        if limit <= 0:
+            return []
+        results: list[dict[str, object]] = []
+        for entry in reversed(self._recent):
+            results.append(dict(entry))
+            if len(results) >= limit:
+                break
+        return results
+
+
+def _timestamp_sort_key(topic: dict[str, object]) -> float:
+    timestamp = topic.get("timestamp")
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    return 0.0
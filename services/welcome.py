@@ -30,6 +30,7 @@ class WelcomeService:
                         "current_time": local_now.isoformat(),
                     },
                     max_tokens=220,
+                    call_site="welcome",
                 )
                 if text.strip():
                     return text.strip()
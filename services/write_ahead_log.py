@@ -0,0 +1,234 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from google.cloud import firestore
+except Exception:  # pragma: no cover
+    firestore = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class PendingWrite:
+    collection: str
+    document_id: str
+    data: dict[str, object]
+    merge: bool
+
+
+@dataclass(slots=True)
+class WalEntry:
+    seq: int
+    write: PendingWrite
+    attempts: int
+
+
+class WriteAheadLog:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Appends commit on a worker thread; the lock keeps them from
+        # interleaving with peek/ack on the event loop.
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._waiting: list[tuple[list[tuple[object, ...]], asyncio.Future[None]]] = []
+        self._committer: asyncio.Task[None] | None = None
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # FULL fsyncs every commit so an acknowledged append survives a crash.
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pending_writes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                collection TEXT NOT NULL,
+                document_id TEXT NOT NULL,
+                data TEXT NOT NULL,
+                merge INTEGER NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        row = self._conn.execute("SELECT COUNT(*) FROM pending_writes").fetchone()
+        self._depth = int(row[0]) if row else 0
+        if self._depth:
+            logger.info("Write-ahead log %s has %s pending write(s) to replay.", path, self._depth)
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def append(self, writes: list[PendingWrite]) -> None:
+        self._insert(_encode_rows(writes))
+
+    async def append_async(self, writes: list[PendingWrite]) -> None:
+        # Group commit: appends that arrive while a commit is being fsynced
+        # share the next transaction, which runs off the event loop. Encoding
+        # happens here so a bad payload only fails its own caller.
+        rows = _encode_rows(writes)
+        if not rows:
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiting.append((rows, future))
+        if self._committer is None or self._committer.done():
+            self._committer = asyncio.create_task(self._commit_waiting())
+        await future
+
+    async def wait_for_appends(self) -> None:
+        if self._committer is not None:
+            await self._committer
+
+    async def _commit_waiting(self) -> None:
+        while self._waiting:
+            group, self._waiting = self._waiting, []
+            rows = [row for group_rows, _ in group for row in group_rows]
+            try:
+                await asyncio.to_thread(self._insert, rows)
+            except Exception as exc:
+                for _, future in group:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for _, future in group:
+                if not future.done():
+                    future.set_result(None)
+
+    def _insert(self, rows: list[tuple[object, ...]]) -> None:
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO pending_writes (collection, document_id, data, merge, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._depth += len(rows)
+
+    def peek(self, limit: int) -> list[WalEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, collection, document_id, data, merge, attempts "
+                "FROM pending_writes ORDER BY seq LIMIT ?",
+                (limit,),
+            ).fetchall()
+        entries: list[WalEntry] = []
+        for seq, collection, document_id, data, merge, attempts in rows:
+            entries.append(
+                WalEntry(
+                    seq=int(seq),
+                    write=PendingWrite(
+                        collection=collection,
+                        document_id=document_id,
+                        data=decode_value(json.loads(data)),
+                        merge=bool(merge),
+                    ),
+                    attempts=int(attempts),
+                )
+            )
+        return entries
+
+    def ack(self, seqs: list[int]) -> None:
+        if not seqs:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "DELETE FROM pending_writes WHERE seq = ?",
+                [(seq,) for seq in seqs],
+            )
+            self._depth = max(0, self._depth - len(seqs))
+
+    def mark_failed(self, seqs: list[int]) -> None:
+        if not seqs:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "UPDATE pending_writes SET attempts = attempts + 1 WHERE seq = ?",
+                [(seq,) for seq in seqs],
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _encode_rows(writes: list[PendingWrite]) -> list[tuple[object, ...]]:
+    now = time.time()
+    return [
+        (
+            write.collection,
+            write.document_id,
+            json.dumps(encode_value(write.data), ensure_ascii=False),
+            1 if write.merge else 0,
+            now,
+        )
+        for write in writes
+    ]
+
+
+def _sentinels() -> dict[str, object]:
+    if firestore is None:
+        return {}
+    return {"delete_field": firestore.DELETE_FIELD, "server_timestamp": firestore.SERVER_TIMESTAMP}
+
+
+def _transforms() -> dict[str, type]:
+    # Tag -> transform type; each wraps a single .value or a .values list.
+    if firestore is None:
+        return {}
+    return {
+        "__increment__": firestore.Increment,
+        "__maximum__": firestore.Maximum,
+        "__minimum__": firestore.Minimum,
+        "__array_union__": firestore.ArrayUnion,
+        "__array_remove__": firestore.ArrayRemove,
+    }
+
+
+def encode_value(value: object) -> object:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, dict):
+        return {str(key): encode_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    for name, sentinel in _sentinels().items():
+        if value is sentinel:
+            return {"__sentinel__": name}
+    for tag, transform in _transforms().items():
+        if type(value) is transform:
+            if hasattr(value, "values"):
+                return {tag: encode_value(list(value.values))}
+            return {tag: value.value}
+    # Anything else would not survive a replay; fail the write up front
+    # instead of queueing something that cannot be decoded.
+    raise TypeError(f"Cannot encode {type(value).__name__} for durable storage")
+
+
+def decode_value(value: object) -> object:
+    if isinstance(value, dict):
+        if len(value) == 1:
+            [(tag, item)] = value.items()
+            if tag == "__datetime__":
+                return datetime.fromisoformat(str(item))
+            if tag == "__sentinel__" and item in _sentinels():
+                return _sentinels()[item]
+            transform = _transforms().get(tag)
+            if transform is not None:
+                return transform(decode_value(item))
+        return {key: decode_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    return value
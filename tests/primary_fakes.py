@@ -0,0 +1,51 @@
+import json
+
+
+class FakeGemini:
+    enabled = True
+    model_name = "fake-gemini"
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.calls = 0
+        self.payloads: list[dict[str, object]] = []
+
+    async def generate_json(
+        self,
+        system_prompt: str,
+        payload: dict[str, object],
+        call_site: str = "unspecified",
+    ) -> str:
+        self.calls += 1
+        self.payloads.append(payload)
+        if self.fail:
+            raise RuntimeError("boom")
+        return self.respond(payload)
+
+    def respond(self, payload: dict[str, object]) -> str:
+        return '{"needs_intervention": false, "reason": "chat", "priority": 1}'
+
+
+class BatchGemini(FakeGemini):
+    def respond(self, payload: dict[str, object]) -> str:
+        decisions = [
+            {
+                "id": item["id"],
+                "needs_intervention": "?" in str(item["message_content"]),
+                "reason": "batch",
+                "priority": 3,
+            }
+            for item in payload["items"]
+        ]
+        return json.dumps({"decisions": decisions})
+
+
+def primary_payload(text: str, activity: int = 4) -> dict[str, object]:
+    return {
+        "message_content": text,
+        "channel_type": "chat",
+        "recent_channel_activity": activity,
+        "author_is_new": False,
+        "is_bot_mentioned": False,
+        "in_quiet_hours": False,
+    }
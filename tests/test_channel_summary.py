@@ -0,0 +1,60 @@
+import asyncio
+import unittest
+
+from services.channel_summary import ChannelSummarizer
+from services.local_storage import MemoryStorage
+
+
+class FakeClaude:
+    enabled = True
+
+    def __init__(self) -> None:
+        self.payloads: list[dict[str, object]] = []
+
+    async def generate_text(self, system_prompt: str, payload: dict[str, object], **kwargs: object) -> str:
+        self.payloads.append(payload)
+        await asyncio.sleep(0)
+        return f"要約{len(self.payloads)}"
+
+
+def _entry(index: int) -> dict[str, object]:
+    return {"author": "a", "content": f"msg{index}", "timestamp": str(index)}
+
+
+class ChannelSummarizerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_summarizes_incrementally_every_n_messages(self) -> None:
+        claude = FakeClaude()
+        storage = MemoryStorage()
+        summarizer = ChannelSummarizer(claude=claude, storage=storage, every_messages=3, every_seconds=3600)
+
+        for index in range(2):
+            await summarizer.observe("c1", _entry(index))
+        self.assertEqual(claude.payloads, [])
+
+        await summarizer.observe("c1", _entry(2))
+        await summarizer.close()
+        for index in range(3, 6):
+            await summarizer.observe("c1", _entry(index))
+        await summarizer.close()
+
+        self.assertEqual(len(claude.payloads), 2)
+        second = claude.payloads[1]
+        self.assertEqual(second["previous_summary"], "要約1")
+        self.assertEqual([item["content"] for item in second["new_messages"]], ["msg3", "msg4", "msg5"])
+        self.assertEqual(summarizer.summary_for("c1"), "要約2")
+        self.assertEqual((await storage.load_channel_summary("c1"))["messages_summarized"], 6)
+
+    async def test_restores_summary_and_builds_digest(self) -> None:
+        storage = MemoryStorage()
+        await storage.save_channel_summary("c1", {"summary": "前回の要約", "messages_summarized": 9})
+        summarizer = ChannelSummarizer(claude=FakeClaude(), storage=storage, recent_turns=2)
+
+        await summarizer.observe("c1", _entry(0))
+        history = [_entry(index) for index in range(5)]
+
+        self.assertEqual(summarizer.digest("c1", history), "前回の要約\n直近: msg3 / msg4")
+        self.assertEqual(summarizer.recent(history), history[-2:])
+
+
+if __name__ == "__main__":
+    unittest.main()
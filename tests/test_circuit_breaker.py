@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from services.deadline import DeadlineExceeded, hedged, within
+
+
+class CircuitBreakerTest(unittest.IsolatedAsyncioTestCase):
+    async def _fail(self) -> None:
+        raise RuntimeError("provider down")
+
+    async def _ok(self) -> str:
+        return "ok"
+
+    async def _hang(self) -> str:
+        await asyncio.sleep(3600)
+        return "late"
+
+    async def test_opens_on_error_rate_and_recovers_through_half_open(self) -> None:
+        breaker = CircuitBreaker(name="test", min_calls=3, error_rate_threshold=0.5, open_seconds=3600)
+        for _ in range(3):
+            with self.assertRaises(RuntimeError):
+                await breaker.call(self._fail)
+        self.assertEqual(breaker.state, "open")
+        with self.assertRaises(CircuitOpenError):
+            await breaker.call(self._ok)
+        self.assertEqual(breaker.rejected, 1)
+
+        breaker.open_seconds = 0
+        self.assertEqual(breaker.state, "half-open")
+        self.assertEqual(await breaker.call(self._ok), "ok")
+        self.assertEqual(breaker.state, "closed")
+
+    async def test_failed_probe_reopens(self) -> None:
+        breaker = CircuitBreaker(name="test", min_calls=1, open_seconds=0)
+        with self.assertRaises(RuntimeError):
+            await breaker.call(self._fail)
+        self.assertEqual(breaker.state, "half-open")
+        with self.assertRaises(RuntimeError):
+            await breaker.call(self._fail)
+        self.assertEqual(breaker.trips, 2)
+
+    def test_opens_on_p95_latency(self) -> None:
+        breaker = CircuitBreaker(name="test", min_calls=4, p95_latency_threshold_seconds=1.0)
+        for latency in (0.1, 0.2, 2.5, 3.0):
+            breaker.record(latency, ok=True)
+        self.assertTrue(breaker.is_open)
+
+    async def test_calls_cut_off_by_the_stage_deadline_open_the_breaker(self) -> None:
+        breaker = CircuitBreaker(name="test", min_calls=3, open_seconds=3600)
+        for _ in range(3):
+            with self.assertRaises(DeadlineExceeded):
+                await within(None, lambda: breaker.call(self._hang), stage_timeout=0.01)
+        self.assertEqual(breaker.state, "open")
+        with self.assertRaises(CircuitOpenError):
+            await breaker.call(self._ok)
+
+    async def test_cancelled_hedge_loser_is_not_a_failure(self) -> None:
+        breaker = CircuitBreaker(name="test", min_calls=1, open_seconds=3600)
+        calls = 0
+
+        async def first_hangs() -> str:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                return await self._hang()
+            return "ok"
+
+        result = await within(
+            None,
+            lambda: hedged(lambda: breaker.call(first_hangs), hedge_after=0.01),
+            stage_timeout=1.0,
+        )
+        self.assertEqual(result, "ok")
+        self.assertEqual(breaker.state, "closed")
+        self.assertEqual(breaker.error_rate(), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from services.context_builder import ContextBuilder, count_tokens
+
+
+def _payload(history_size: int, post: str) -> dict[str, object]:
+    history = [
+        {"author": f"user{index % 3}", "content": f"{index}: {post}", "timestamp": f"t{index}"}
+        for index in range(history_size)
+    ]
+    history.append({"author": "author", "content": "最新の質問です", "timestamp": "now"})
+    return {
+        "message_content": "最新の質問です",
+        "channel_context": history,
+        "channel_type": "question",
+        "author_profile": {
+            "discord_id": "1",
+            "stats": {
+                "total_posts": 40,
+                "active_channels": {f"ch{index}": index for index in range(30)},
+                "active_hours": {str(hour): hour for hour in range(24)},
+                "last_active_at": "2026-01-01",
+            },
+            "interests": {"topics": ["notion"] * 50},
+        },
+        "bot_recent_actions": [
+            {"intervention_type": "reply", "channel_id": "c", "target_message_id": str(index)}
+            for index in range(20)
+        ],
+    }
+
+
+class ContextBuilderTest(unittest.TestCase):
+    def test_trims_to_budget_and_keeps_latest_turns(self) -> None:
+        builder = ContextBuilder(max_tokens=600, max_message_chars=100)
+        payload = _payload(20, "長い投稿" * 200)
+
+        context = builder.build(payload)
+
+        self.assertLessEqual(count_tokens(context), 600)
+        history = context["channel_context"]
+        self.assertTrue(history)
+        self.assertTrue(history[-1]["content"].startswith("19:"))
+        self.assertNotIn("最新の質問です", [item["content"] for item in history])
+        stats = context["author_profile"]["stats"]
+        self.assertEqual(list(stats["active_channels"]), ["ch29", "ch28", "ch27"])
+        self.assertNotIn("last_active_at", stats)
+        for action in context["bot_recent_actions"]:
+            self.assertNotIn("target_message_id", action)
+        # The caller's payload is left untouched.
+        self.assertEqual(len(payload["channel_context"]), 21)
+        self.assertEqual(builder.trimmed, 1)
+
+    def test_collapses_repeated_posts(self) -> None:
+        payload = _payload(0, "")
+        payload["channel_context"] = [
+            {"author": "a", "content": "おはよう!!!", "timestamp": "1"},
+            {"author": "a", "content": "おはよう!", "timestamp": "2"},
+            {"author": "b", "content": "おはよう", "timestamp": "3"},
+            {"author": "author", "content": "最新の質問です", "timestamp": "4"},
+        ]
+
+        context = ContextBuilder().build(payload)
+
+        history = context["channel_context"]
+        self.assertEqual([item["author"] for item in history], ["a", "b"])
+        self.assertEqual(history[0]["repeated"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import asyncio
+import unittest
+
+from services.deadline import Deadline, DeadlineExceeded, hedged, within
+from services.secondary_judge import SecondaryJudgeService
+
+
+class SlowClaude:
+    enabled = True
+    model_name = "slow"
+
+    async def generate_json(self, *args: object, **kwargs: object) -> str:
+        await asyncio.sleep(1.0)
+        return "{}"
+
+
+class DeadlineTest(unittest.IsolatedAsyncioTestCase):
+    async def test_within_raises_when_budget_is_spent(self) -> None:
+        with self.assertRaises(DeadlineExceeded):
+            await within(Deadline.after(0.05), lambda: asyncio.sleep(1.0))
+        with self.assertRaises(DeadlineExceeded):
+            await within(Deadline.after(0), lambda: asyncio.sleep(0))
+
+    async def test_hedged_request_takes_first_result(self) -> None:
+        calls = 0
+
+        async def sometimes_slow() -> str:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(1.0)
+                return "slow"
+            return "fast"
+
+        stats: dict[str, int] = {}
+        result = await hedged(sometimes_slow, hedge_after=0.01, stats=stats)
+        self.assertEqual(result, "fast")
+        self.assertEqual(stats, {"fired": 1, "won": 1})
+
+    async def test_secondary_judge_goes_silent_when_out_of_time(self) -> None:
+        service = SecondaryJudgeService(claude=SlowClaude())
+        decision = await service.judge(
+            {"message_content": "help", "channel_type": "question"},
+            deadline=Deadline.after(0.05),
+        )
+        self.assertEqual(decision.intervention_type, "silent")
+        self.assertEqual(decision.model, "fallback-rule")
+
+
+if __name__ == "__main__":
+    unittest.main()
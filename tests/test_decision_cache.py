@@ -0,0 +1,48 @@
+import unittest
+
+from models.decision import PrimaryDecision
+from services.decision_cache import DecisionCache, primary_fingerprint
+from services.primary_judge import PrimaryJudgeService
+from tests.primary_fakes import FakeGemini, primary_payload
+
+
+class DecisionCacheTest(unittest.IsolatedAsyncioTestCase):
+    def test_fingerprint_normalises_low_information_text(self) -> None:
+        self.assertEqual(
+            primary_fingerprint(primary_payload("ありがとう!!!")),
+            primary_fingerprint(primary_payload("ありがとう！")),
+        )
+        self.assertEqual(
+            primary_fingerprint(primary_payload("+1", activity=3)),
+            primary_fingerprint(primary_payload("+1", activity=5)),
+        )
+        self.assertNotEqual(
+            primary_fingerprint(primary_payload("+1", activity=1)),
+            primary_fingerprint(primary_payload("+1", activity=5)),
+        )
+
+    def test_lru_eviction_and_ttl(self) -> None:
+        decision = PrimaryDecision(needs_intervention=False, reason="r", priority=1, model="m")
+        cache = DecisionCache(max_entries=1, ttl_seconds=600)
+        cache.put("a", decision)
+        cache.put("b", decision)
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("b"))
+
+        expired = DecisionCache(ttl_seconds=0)
+        expired.put("a", decision)
+        self.assertIsNone(expired.get("a"))
+
+    async def test_primary_judge_skips_llm_on_cache_hit(self) -> None:
+        gemini = FakeGemini()
+        service = PrimaryJudgeService(gemini=gemini, prefilter_rules=[])
+        await service.judge(primary_payload("ありがとう!"))
+        second = await service.judge(primary_payload("ありがとう!!"))
+        self.assertEqual(gemini.calls, 1)
+        self.assertFalse(second.needs_intervention)
+        self.assertEqual((service.cache.hits, service.cache.misses), (1, 1))
+        self.assertEqual(second.stage, "cache")
+
+
+if __name__ == "__main__":
+    unittest.main()
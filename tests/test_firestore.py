@@ -0,0 +1,312 @@
+import asyncio
+import unittest
+
+from google.cloud import firestore
+
+from services.firestore import FirestoreService
+
+
+class FakeDocument:
+    def __init__(self, store: "FakeClient", path: str) -> None:
+        self.store = store
+        self.path = path
+
+    def collection(self, name: str) -> "FakeCollection":
+        return FakeCollection(self.store, f"{self.path}/{name}")
+
+    def set(self, data: dict[str, object], merge: bool = False) -> None:
+        self.store.commits.append([(self.path, data, merge)])
+
+
+class FakeCollection:
+    def __init__(self, store: "FakeClient", path: str) -> None:
+        self.store = store
+        self.path = path
+
+    def document(self, doc_id: str) -> FakeDocument:
+        return FakeDocument(self.store, f"{self.path}/{doc_id}")
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id: str, data: dict[str, object]) -> None:
+        self.id = doc_id
+        self._data = data
+        self.exists = True
+
+    def to_dict(self) -> dict[str, object]:
+        return dict(self._data)
+
+
+class FakeMembersQuery:
+    def __init__(
+        self,
+        docs: list[FakeSnapshot],
+        page_calls: list[int],
+        limit: int | None = None,
+        after: FakeSnapshot | None = None,
+    ) -> None:
+        self.docs = docs
+        self.page_calls = page_calls
+        self._limit = limit
+        self._after = after
+
+    def select(self, _fields: list[str]) -> "FakeMembersQuery":
+        return self
+
+    def where(self, *_args: object) -> "FakeMembersQuery":
+        return self
+
+    def order_by(self, *_args: object) -> "FakeMembersQuery":
+        return self
+
+    def limit(self, count: int) -> "FakeMembersQuery":
+        return FakeMembersQuery(self.docs, self.page_calls, count, self._after)
+
+    def start_after(self, doc: FakeSnapshot) -> "FakeMembersQuery":
+        return FakeMembersQuery(self.docs, self.page_calls, self._limit, doc)
+
+    def stream(self) -> list[FakeSnapshot]:
+        start = 0 if self._after is None else self.docs.index(self._after) + 1
+        page = self.docs[start : start + (self._limit or len(self.docs))]
+        self.page_calls.append(len(page))
+        return page
+
+
+class FakeBatch:
+    def __init__(self, store: "FakeClient") -> None:
+        self.store = store
+        self.writes: list[tuple[str, dict[str, object], bool]] = []
+
+    def set(self, doc_ref: FakeDocument, data: dict[str, object], merge: bool = False) -> None:
+        self.writes.append((doc_ref.path, data, merge))
+
+    def commit(self) -> None:
+        self.store.commits.append(self.writes)
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.commits: list[list[tuple[str, dict[str, object], bool]]] = []
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self, name)
+
+    def batch(self) -> FakeBatch:
+        return FakeBatch(self)
+
+
+class FlakyBatch(FakeBatch):
+    def commit(self) -> None:
+        if self.store.failures:
+            self.store.failures -= 1
+            raise RuntimeError("unavailable")
+        super().commit()
+
+
+class FlakyClient(FakeClient):
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+
+    def batch(self) -> FlakyBatch:
+        return FlakyBatch(self)
+
+
+class FakeAsyncBatch(FakeBatch):
+    async def commit(self) -> None:  # type: ignore[override]
+        self.store.commits.append(self.writes)
+
+
+class FakeAsyncClient(FakeClient):
+    def batch(self) -> FakeAsyncBatch:
+        return FakeAsyncBatch(self)
+
+
+class SlowAsyncBatch(FakeBatch):
+    async def commit(self) -> None:  # type: ignore[override]
+        self.store.started.set()
+        await self.store.release.wait()
+        self.store.commits.append(self.writes)
+
+
+class SlowAsyncClient(FakeClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    def batch(self) -> SlowAsyncBatch:
+        return SlowAsyncBatch(self)
+
+
+def _make_service(
+    batch_max_size: int = 20,
+    backend: str = "sync",
+) -> tuple[FirestoreService, FakeClient]:
+    service = FirestoreService(project_id=None, batch_max_size=batch_max_size, backend=backend)
+    client = FakeAsyncClient() if backend == "async" else FakeClient()
+    service._client = client
+    service.enabled = True
+    return service, client
+
+
+class FirestoreWriteBehindTest(unittest.IsolatedAsyncioTestCase):
+    async def test_writes_are_buffered_until_flush(self) -> None:
+        service, client = _make_service()
+        await service.start()
+        preferences = {"empathy": 0.2}
+        await service.save_bot_action("a1", {"type": "silent"})
+        await service.update_member_intervention_preference("u1", preferences)
+        preferences["empathy"] = 0.4
+        self.assertEqual(service.pending_writes, 2)
+        self.assertEqual(client.commits, [])
+
+        await service.close()
+        self.assertEqual(service.pending_writes, 0)
+        self.assertEqual(len(client.commits), 1)
+        paths = [path for path, _, _ in client.commits[0]]
+        self.assertEqual(
+            paths,
+            [
+                "community_bot/data/bot_actions/a1",
+                "community_bot/data/members/u1",
+            ],
+        )
+        self.assertEqual(client.commits[0][1][1]["intervention_preferences"], {"empathy": 0.2})
+
+    async def test_size_threshold_triggers_flush(self) -> None:
+        service, client = _make_service(batch_max_size=2)
+        await service.start()
+        await service.save_bot_action("a1", {"type": "silent"})
+        await service.save_bot_action("a2", {"type": "silent"})
+        for _ in range(20):
+            if client.commits:
+                break
+            await asyncio.sleep(0.01)
+        await service.close()
+        self.assertEqual(len(client.commits), 1)
+        self.assertEqual(len(client.commits[0]), 2)
+
+    async def test_writes_go_direct_when_not_started(self) -> None:
+        service, client = _make_service()
+        await service.save_bot_action("a1", {"type": "silent"})
+        self.assertEqual(len(client.commits), 1)
+        self.assertEqual(service.pending_writes, 0)
+
+    async def test_failed_flush_keeps_writes_for_retry(self) -> None:
+        service, _ = _make_service()
+        client = FlakyClient(failures=1)
+        service._client = client
+        service.batch_max_age_seconds = 3600
+        await service.start()
+        await service.save_bot_action("a1", {"type": "silent"})
+        await service.save_bot_action("a2", {"type": "silent"})
+
+        self.assertFalse(await service.flush())
+        self.assertEqual(service.pending_writes, 2)
+        self.assertEqual(client.commits, [])
+
+        self.assertTrue(await service.flush())
+        await service.close()
+        paths = [path for commit in client.commits for path, _, _ in commit]
+        self.assertEqual(
+            paths,
+            ["community_bot/data/bot_actions/a1", "community_bot/data/bot_actions/a2"],
+        )
+        self.assertEqual(service.pending_writes, 0)
+
+    async def test_close_waits_for_in_flight_commit(self) -> None:
+        service, _ = _make_service(backend="async")
+        client = SlowAsyncClient()
+        service._client = client
+        service.batch_max_age_seconds = 0.05
+        await service.start()
+        await service.save_bot_action("a1", {"type": "silent"})
+        await service.save_bot_action("a2", {"type": "silent"})
+        await client.started.wait()
+
+        closing = asyncio.create_task(service.close())
+        await asyncio.sleep(0.1)
+        self.assertFalse(closing.done())
+        client.release.set()
+        await closing
+
+        self.assertEqual(len(client.commits), 1)
+        self.assertEqual(len(client.commits[0]), 2)
+        self.assertEqual(service.pending_writes, 0)
+
+    async def test_async_backend_commits_batch_on_event_loop(self) -> None:
+        service, client = _make_service(backend="async")
+        await service.start()
+        await service.save_bot_action("a1", {"type": "silent"})
+        await service.save_bot_action("a2", {"type": "silent"})
+        await service.close()
+        self.assertEqual(service.backend, "async")
+        self.assertEqual(len(client.commits), 1)
+        self.assertEqual(len(client.commits[0]), 2)
+
+
+class FirestoreIncrementTest(unittest.IsolatedAsyncioTestCase):
+    async def test_outreach_count_is_a_server_side_increment(self) -> None:
+        service, client = _make_service()
+        await service.update_member_outreach("u1", {"outreach_count_increment": 1, "last_outreach_at": None})
+
+        path, data, merge = client.commits[0][0]
+        self.assertEqual(path, "community_bot/data/members/u1")
+        self.assertTrue(merge)
+        count = data["outreach"]["outreach_count"]
+        self.assertIsInstance(count, firestore.Increment)
+        self.assertEqual(count.value, 1)
+
+    async def test_profile_counters_ride_along_as_increments(self) -> None:
+        service, client = _make_service()
+        await service.save_member_profile(
+            "u1",
+            {"stats": {"avg_post_length": 12.0}, "display_name": "alice"},
+            counters={"stats": {"total_posts": 3, "active_hours": {"9": 2}}},
+        )
+
+        self.assertEqual(len(client.commits), 1)
+        _, data, merge = client.commits[0][0]
+        self.assertTrue(merge)
+        self.assertEqual(data["display_name"], "alice")
+        stats = data["stats"]
+        self.assertEqual(stats["avg_post_length"], 12.0)
+        self.assertIsInstance(stats["total_posts"], firestore.Increment)
+        self.assertEqual(stats["total_posts"].value, 3)
+        self.assertEqual(stats["active_hours"]["9"].value, 2)
+
+    async def test_llm_usage_rollup_uses_increment_and_maximum(self) -> None:
+        service, client = _make_service()
+        await service.save_llm_usage(
+            "2026-02-13T09",
+            {"hour_key": "2026-02-13T09"},
+            counters={"sites": {"gemini:primary_judge": {"calls": 2}}},
+            maxima={"sites": {"gemini:primary_judge": {"max_latency_seconds": 1.2}}},
+        )
+
+        _, data, merge = client.commits[0][0]
+        self.assertTrue(merge)
+        site = data["sites"]["gemini:primary_judge"]
+        self.assertIsInstance(site["calls"], firestore.Increment)
+        self.assertIsInstance(site["max_latency_seconds"], firestore.Maximum)
+        self.assertEqual(data["hour_key"], "2026-02-13T09")
+
+
+class FirestoreInactiveScanTest(unittest.IsolatedAsyncioTestCase):
+    async def test_iter_inactive_members_pages_with_cursor(self) -> None:
+        service, _ = _make_service()
+        docs = [FakeSnapshot(f"u{index}", {"display_name": f"n{index}"}) for index in range(5)]
+        page_calls: list[int] = []
+        service._collection = lambda _name: FakeMembersQuery(docs, page_calls)  # type: ignore[method-assign]
+
+        members = [
+            member async for member in service.iter_inactive_members(threshold_days=14, page_size=2)
+        ]
+
+        self.assertEqual([m["discord_user_id"] for m in members], ["u0", "u1", "u2", "u3", "u4"])
+        self.assertEqual(page_calls, [2, 2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from types import SimpleNamespace
+
+from services.claude import ClaudeClient
+from services.json_stream import JsonFieldScanner
+from services.secondary_judge import SecondaryJudgeService
+
+
+class FakeStream:
+    def __init__(self, chunks: list[str]) -> None:
+        self.chunks = chunks
+        self.consumed = 0
+        self.current_message_snapshot = SimpleNamespace(usage=None)
+
+    async def __aenter__(self) -> "FakeStream":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    @property
+    async def text_stream(self):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+
+class FakeStreamingMessages:
+    def __init__(self, chunks: list[str]) -> None:
+        self.stream_obj = FakeStream(chunks)
+
+    def stream(self, **kwargs: object) -> FakeStream:
+        return self.stream_obj
+
+
+def _streaming_claude(chunks: list[str]) -> tuple[ClaudeClient, FakeStream]:
+    client = ClaudeClient(api_key=None)
+    messages = FakeStreamingMessages(chunks)
+    client._client = SimpleNamespace(messages=messages)
+    client.enabled = True
+    return client, messages.stream_obj
+
+
+class JsonStreamTest(unittest.IsolatedAsyncioTestCase):
+    def test_scanner_collects_fields_across_chunks(self) -> None:
+        text = '```json\n{"intervention_type": "dig_deeper", "content": "「a」\\"b\\"", "mention_users": ["1"], "confidence": 0.8}\n```'
+        scanner = JsonFieldScanner()
+        for index in range(0, len(text), 4):
+            scanner.feed(text[index : index + 4])
+        self.assertTrue(scanner.complete)
+        self.assertEqual(scanner.fields["content"], '「a」"b"')
+        self.assertEqual(scanner.fields["mention_users"], ["1"])
+        self.assertEqual(scanner.fields["confidence"], 0.8)
+
+    async def test_secondary_stream_stops_once_silent(self) -> None:
+        chunks = ['{"interven', 'tion_type": "silent",', ' "tone": "warm",', ' "content": "long..."', "}"]
+        claude, stream = _streaming_claude(chunks)
+        service = SecondaryJudgeService(claude=claude, streaming=True)
+        decision = await service.judge({"message_content": "hi", "channel_type": "chat"})
+
+        self.assertEqual(decision.intervention_type, "silent")
+        self.assertEqual(decision.silence_confidence, 0.8)
+        self.assertEqual(stream.consumed, 2)
+        self.assertEqual(claude.early_exits, 1)
+
+    async def test_truncated_stream_stays_silent(self) -> None:
+        chunks = ['{"intervention_type": "answer", "tone": "helpful",', ' "content": "まずデータベースを']
+        claude, _ = _streaming_claude(chunks)
+        service = SecondaryJudgeService(claude=claude, streaming=True)
+        decision = await service.judge({"message_content": "データベースの作り方を教えて", "channel_type": "question"})
+
+        self.assertEqual(decision.intervention_type, "silent")
+        self.assertEqual(decision.content, "")
+        self.assertEqual(decision.model, "fallback-rule")
+
+    async def test_secondary_stream_reads_full_reply(self) -> None:
+        chunks = [
+            '{"intervention_type": "react_only", "tone": "warm", "content": "",',
+            ' "mention_users": [], "reaction_emoji": "🎉", "confidence": 0.7}',
+        ]
+        claude, stream = _streaming_claude(chunks)
+        service = SecondaryJudgeService(claude=claude, streaming=True)
+        decision = await service.judge({"message_content": "done!", "channel_type": "share"})
+
+        self.assertEqual(decision.intervention_type, "react_only")
+        self.assertEqual(decision.reaction_emoji, "🎉")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from types import SimpleNamespace
+
+from services.claude import ClaudeClient
+from services.gemini import GeminiClient
+
+
+class FakeAsyncMessages:
+    def __init__(self) -> None:
+        self.calls: list[dict[str, object]] = []
+
+    async def create(self, **kwargs: object) -> SimpleNamespace:
+        self.calls.append(kwargs)
+        return SimpleNamespace(
+            content=[SimpleNamespace(text='{"ok": true}')],
+            usage=SimpleNamespace(
+                input_tokens=20,
+                cache_read_input_tokens=1200 if len(self.calls) > 1 else 0,
+                cache_creation_input_tokens=0 if len(self.calls) > 1 else 1200,
+            ),
+        )
+
+
+class FakeAsyncModel:
+    async def generate_content_async(self, prompt: str) -> SimpleNamespace:
+        return SimpleNamespace(text='{"ok": true}')
+
+
+class LlmClientsTest(unittest.IsolatedAsyncioTestCase):
+    async def test_claude_awaits_native_async_client(self) -> None:
+        client = ClaudeClient(api_key=None)
+        messages = FakeAsyncMessages()
+        client._client = SimpleNamespace(messages=messages)
+        client.enabled = True
+
+        text = await client.generate_json("system", {"a": 1}, system_suffix="suffix")
+        await client.generate_json("system", {"a": 2}, system_suffix="suffix")
+        self.assertEqual(text, '{"ok": true}')
+        self.assertEqual(
+            messages.calls[0]["system"],
+            [
+                {"type": "text", "text": "system", "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": "suffix"},
+            ],
+        )
+        self.assertEqual((client.cache_stats.hits, client.cache_stats.misses), (1, 1))
+        self.assertEqual(client.cache_stats.written_tokens, 1200)
+
+    async def test_gemini_awaits_native_async_model(self) -> None:
+        client = GeminiClient(api_key=None)
+        client._model = FakeAsyncModel()
+        client._models["system"] = FakeAsyncModel()
+        client.enabled = True
+
+        self.assertEqual(await client.generate_json("system", {"a": 1}), '{"ok": true}')
+
+
+if __name__ == "__main__":
+    unittest.main()
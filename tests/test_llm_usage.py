@@ -0,0 +1,99 @@
+import unittest
+from types import SimpleNamespace
+
+from services.circuit_breaker import CircuitBreaker
+from services.claude import ClaudeClient
+from services.llm_usage import LlmUsageTracker
+from services.local_storage import MemoryStorage
+
+
+class FakeMessages:
+    async def create(self, **kwargs: object) -> SimpleNamespace:
+        return SimpleNamespace(
+            content=[SimpleNamespace(text='{"ok": true}')],
+            usage=SimpleNamespace(
+                input_tokens=20,
+                output_tokens=7,
+                cache_read_input_tokens=1200,
+                cache_creation_input_tokens=0,
+            ),
+        )
+
+
+class LlmUsageTrackerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_claude_records_tokens_and_outcomes_per_call_site(self) -> None:
+        usage = LlmUsageTracker()
+        breaker = CircuitBreaker(name="test", min_calls=1, error_rate_threshold=1.0, open_seconds=3600)
+        client = ClaudeClient(api_key=None, breaker=breaker, usage=usage)
+        client._client = SimpleNamespace(messages=FakeMessages())
+        client.enabled = True
+
+        await client.generate_json("system", {"a": 1}, call_site="quality_eval")
+        await client.generate_text("system", {"a": 1}, call_site="topic")
+        breaker._open(0.0, "test")
+        breaker._opened_at = float("inf")
+        with self.assertRaises(RuntimeError):
+            await client.generate_json("system", {"a": 1}, call_site="quality_eval")
+
+        totals = usage.totals()
+        self.assertEqual(list(totals), ["claude:quality_eval", "claude:topic"])
+        quality = totals["claude:quality_eval"]
+        self.assertEqual((quality.calls, quality.rejected, quality.errors), (2, 1, 0))
+        self.assertEqual(
+            (quality.input_tokens, quality.output_tokens, quality.cached_tokens),
+            (20, 7, 1200),
+        )
+
+    async def test_flush_persists_hourly_rollups(self) -> None:
+        storage = MemoryStorage()
+        usage = LlmUsageTracker(storage=storage)
+        usage.record("gemini", "primary_judge", "ok", 0.4, input_tokens=100, output_tokens=10)
+        usage.record("gemini", "primary_judge", "error", 1.2)
+
+        await usage.flush()
+        self.assertEqual(storage._collections.get("llm_usage", {}), {})
+
+        await usage.close()
+        [rollup] = storage._collections["llm_usage"].values()
+        site = rollup["sites"]["gemini:primary_judge"]
+        self.assertEqual((site["calls"], site["errors"], site["input_tokens"]), (2, 1, 100))
+        self.assertEqual(site["max_latency_seconds"], 1.2)
+
+    async def test_replicas_add_to_the_same_rollup(self) -> None:
+        storage = MemoryStorage()
+        first = LlmUsageTracker(storage=storage)
+        second = LlmUsageTracker(storage=storage)
+        first.record("gemini", "primary_judge", "ok", 0.4, input_tokens=100)
+        second.record("gemini", "primary_judge", "ok", 0.9, input_tokens=50)
+        await first.close()
+        await second.close()
+
+        first.record("gemini", "primary_judge", "ok", 0.2, input_tokens=10)
+        await first.flush(include_current=True)
+
+        [rollup] = storage._collections["llm_usage"].values()
+        site = rollup["sites"]["gemini:primary_judge"]
+        self.assertEqual((site["calls"], site["input_tokens"]), (3, 160))
+        self.assertEqual(site["max_latency_seconds"], 0.9)
+
+    async def test_failed_flush_keeps_deltas(self) -> None:
+        storage = MemoryStorage()
+        usage = LlmUsageTracker(storage=storage)
+        usage.record("gemini", "primary_judge", "ok", 0.4, input_tokens=100)
+        original = storage.save_llm_usage
+
+        async def unavailable(*args: object, **kwargs: object) -> None:
+            raise RuntimeError("unavailable")
+
+        storage.save_llm_usage = unavailable  # type: ignore[method-assign]
+        await usage.flush(include_current=True)
+        usage.record("gemini", "primary_judge", "ok", 0.4, input_tokens=100)
+        storage.save_llm_usage = original  # type: ignore[method-assign]
+        await usage.flush(include_current=True)
+
+        [rollup] = storage._collections["llm_usage"].values()
+        self.assertEqual(rollup["sites"]["gemini:primary_judge"]["calls"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import unittest
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+
+from services.local_storage import LocalStorage, MemoryStorage, SqliteStorage
+
+
+class LocalStorageContract(ABC):
+    @abstractmethod
+    def make_storage(self) -> LocalStorage: ...
+
+    async def test_recent_topics_are_newest_first(self) -> None:
+        storage = self.make_storage()
+        base = datetime(2026, 2, 13, 9, tzinfo=timezone.utc)
+        for index in range(3):
+            await storage.save_topic_post(
+                f"t{index}",
+                {
+                    "channel_id": "100",
+                    "content": f"topic {index}",
+                    "timestamp": base + timedelta(hours=index),
+                    "date_key": "2026-02-13",
+                    "hour_key": f"2026-02-13-{9 + index:02d}",
+                },
+            )
+        recent = await storage.list_recent_topics(limit=2)
+        self.assertEqual([item["topic_id"] for item in recent], ["t2", "t1"])
+        self.assertEqual(await storage.count_topics_for_date("2026-02-13"), 3)
+        self.assertTrue(await storage.has_topic_for_channel_hour("100", "2026-02-13-10"))
+        self.assertFalse(await storage.has_topic_for_channel_hour("200", "2026-02-13-10"))
+        self.assertTrue(await storage.has_topic_for_channel_date("100", "2026-02-13"))
+
+    async def test_inactive_cutoff_and_counters(self) -> None:
+        storage = self.make_storage()
+        now = datetime.now(timezone.utc)
+        await storage.save_member_profile(
+            "old",
+            {"display_name": "Old", "roles": ["a"], "context": {"last_active_at": now - timedelta(days=30)}},
+        )
+        await storage.save_member_profile(
+            "fresh",
+            {"display_name": "Fresh", "context": {"last_active_at": now}},
+        )
+        await storage.update_member_outreach(
+            "old",
+            {"last_outreach_at": now, "outreach_count_increment": 1},
+        )
+        await storage.update_member_outreach(
+            "old",
+            {"last_outreach_at": now, "outreach_count_increment": 1},
+        )
+
+        members = [member async for member in storage.iter_inactive_members(threshold_days=14)]
+        self.assertEqual([m["discord_user_id"] for m in members], ["old"])
+        self.assertEqual(members[0]["outreach"]["outreach_count"], 2)
+        self.assertNotIn("roles", members[0])
+
+    async def test_inactive_scan_pages_through_every_member(self) -> None:
+        storage = self.make_storage()
+        last_active = datetime.now(timezone.utc) - timedelta(days=30)
+        for member_id in ("c", "a", "b"):
+            await storage.save_member_profile(member_id, {"context": {"last_active_at": last_active}})
+
+        members = [m async for m in storage.iter_inactive_members(threshold_days=14, page_size=2)]
+        self.assertEqual([m["discord_user_id"] for m in members], ["a", "b", "c"])
+
+    async def test_config_round_trip(self) -> None:
+        storage = self.make_storage()
+        await storage.save_config_partial({"bot_enabled": False})
+        config = await storage.load_config()
+        self.assertFalse(config["bot_enabled"])
+        self.assertIsInstance(config["updated_at"], datetime)
+
+
+class MemoryStorageTest(LocalStorageContract, unittest.IsolatedAsyncioTestCase):
+    def make_storage(self) -> LocalStorage:
+        return MemoryStorage()
+
+
+class SqliteStorageTest(LocalStorageContract, unittest.IsolatedAsyncioTestCase):
+    def make_storage(self) -> LocalStorage:
+        return SqliteStorage(path=":memory:")
+
+    async def test_queries_run_off_the_event_loop_in_call_order(self) -> None:
+        storage = SqliteStorage(path=":memory:")
+        threads: list[int] = []
+        put = storage._put
+
+        def recording_put(*args: object, **kwargs: object) -> None:
+            threads.append(threading.get_ident())
+            put(*args, **kwargs)
+
+        storage._put = recording_put  # type: ignore[method-assign]
+        await asyncio.gather(
+            *(storage.save_config_partial({"step": step}) for step in range(5))
+        )
+
+        self.assertNotIn(threading.get_ident(), threads)
+        self.assertEqual((await storage.load_config())["step"], 4)
+        await storage.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
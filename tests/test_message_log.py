@@ -0,0 +1,77 @@
+import unittest
+from datetime import datetime, timezone
+
+from models.decision import PrimaryDecision
+from models.message import MessageRecord
+from services.local_storage import MemoryStorage
+from services.message_log import MessageLogWriter
+
+
+def _record() -> MessageRecord:
+    return MessageRecord(
+        message_id="m1",
+        channel_id="c1",
+        channel_name="general",
+        author_id="u1",
+        author_name="alice",
+        content="help",
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        is_reply=False,
+        reply_to_id=None,
+        reply_count=0,
+        reactions={},
+    )
+
+
+class MessageLogWriterTest(unittest.IsolatedAsyncioTestCase):
+    async def _run_lifecycle(self, mode: str) -> MemoryStorage:
+        storage = MemoryStorage()
+        lifecycle = MessageLogWriter(storage=storage, mode=mode).begin(_record())
+        now = datetime(2024, 1, 1, 0, 1, tzinfo=timezone.utc)
+        await lifecycle.ingest()
+        await lifecycle.primary(
+            {"message_content": "help"},
+            PrimaryDecision(needs_intervention=True, reason="question", priority=2, model="m"),
+        )
+        await lifecycle.mark_bot_action(action_type="answer", action_at=now)
+        await lifecycle.action(
+            "m1-abc",
+            {
+                "type": "answer",
+                "content": "hi",
+                "secondary_decision": {"content": "hi"},
+                "outcome": {"status": "answer"},
+            },
+        )
+        await lifecycle.commit()
+        return storage
+
+    async def test_single_mode_writes_one_document(self) -> None:
+        storage = await self._run_lifecycle("single")
+        self.assertEqual(set(storage._collections), {"messages", "bot_actions"})
+        doc = storage._get("messages", "m1")
+        self.assertEqual(doc["channel_id"], "c1")
+        self.assertEqual(doc["bot_action"], "answer")
+        self.assertTrue(doc["primary_decision"]["decision"]["needs_intervention"])
+        self.assertEqual(doc["action"]["action_id"], "m1-abc")
+        self.assertEqual(doc["action"]["secondary_decision"], {"content": "hi"})
+
+    async def test_single_mode_keeps_a_lightweight_action_index(self) -> None:
+        storage = await self._run_lifecycle("single")
+        index = storage._get("bot_actions", "m1-abc")
+        self.assertEqual(index["type"], "answer")
+        self.assertEqual(index["content"], "hi")
+        self.assertEqual(index["outcome"], {"status": "answer"})
+        self.assertNotIn("secondary_decision", index)
+
+    async def test_split_mode_keeps_separate_collections(self) -> None:
+        storage = await self._run_lifecycle("split")
+        self.assertEqual(
+            set(storage._collections),
+            {"messages", "decision_logs", "bot_actions"},
+        )
+        self.assertEqual(storage._get("messages", "m1")["bot_action"], "answer")
+
+
+if __name__ == "__main__":
+    unittest.main()
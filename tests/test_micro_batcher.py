@@ -0,0 +1,37 @@
+import asyncio
+import unittest
+
+from services.primary_judge import PrimaryJudgeService
+from tests.primary_fakes import BatchGemini, primary_payload
+
+
+class MicroBatcherTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_judgments_share_one_request(self) -> None:
+        gemini = BatchGemini()
+        service = PrimaryJudgeService(gemini=gemini, batch_max_size=3, batch_max_wait_seconds=1.0)
+        results = await asyncio.gather(
+            service.judge(primary_payload("help?", activity=0)),
+            service.judge(primary_payload("hello", activity=0)),
+            service.judge(primary_payload("why?", activity=0)),
+        )
+        self.assertEqual(len(gemini.payloads), 1)
+        self.assertEqual([r.needs_intervention for r in results], [True, False, True])
+        self.assertEqual(service.batcher.batches_sent, 1)
+
+    async def test_failed_batch_falls_back_per_item(self) -> None:
+        gemini = BatchGemini(fail=True)
+        service = PrimaryJudgeService(
+            gemini=gemini,
+            batch_max_size=8,
+            batch_max_wait_seconds=0.01,
+            prefilter_rules=[],
+        )
+        mention = {**primary_payload("hey"), "is_bot_mentioned": True}
+        results = await asyncio.gather(service.judge(mention), service.judge(primary_payload("hi")))
+        self.assertEqual([r.stage for r in results], ["fallback", "fallback"])
+        self.assertEqual([r.needs_intervention for r in results], [True, False])
+        self.assertEqual(len(service.cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
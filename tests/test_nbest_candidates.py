@@ -0,0 +1,66 @@
+import json
+import unittest
+
+from services.quality_scorer import QualityScorer
+from services.secondary_judge import SecondaryJudgeService
+
+PAYLOAD = {"message_content": "DBの関係が組めません", "channel_type": "question"}
+CLEAN = "「関係が組めない」件、両方のDBが同じワークスペースにあるか見てみると原因が分かるかもしれません。"
+
+
+class NBestClaude:
+    enabled = True
+    model_name = "nbest"
+
+    def __init__(self, first_content: str, eval_score: float = 0.9) -> None:
+        self.first_content = first_content
+        self.eval_score = eval_score
+        self.calls: list[dict[str, object]] = []
+
+    async def generate_json(self, system_prompt: str, payload: dict[str, object], **kwargs: object) -> str:
+        self.calls.append(kwargs)
+        if kwargs.get("call_site") == "quality_eval":
+            first = payload["generated_content"] == self.first_content
+            score = self.eval_score if first else 0.9
+            return json.dumps({"quality_score": score, "needs_regeneration": score < 0.7})
+        return json.dumps(
+            {
+                "intervention_type": "supplement",
+                "content": self.first_content,
+                "confidence": 0.8,
+                "alternatives": [
+                    {"intervention_type": "supplement", "content": "そんなの常識です。"},
+                    {"intervention_type": "empathy", "tone": "warm", "content": CLEAN},
+                ],
+            }
+        )
+
+
+class NBestCandidatesTest(unittest.IsolatedAsyncioTestCase):
+    async def test_skips_ng_candidates_without_another_request(self) -> None:
+        claude = NBestClaude(first_content="「DB」普通はこうします。")
+        service = SecondaryJudgeService(claude=claude, candidates=3)
+
+        decision = await service.judge(dict(PAYLOAD))
+
+        self.assertEqual(decision.content, CLEAN)
+        self.assertEqual(decision.intervention_type, "empathy")
+        self.assertEqual(decision.confidence, 0.8)
+        self.assertEqual([call["call_site"] for call in claude.calls], ["secondary_generate"])
+        self.assertEqual(claude.calls[0]["max_tokens"], 1200)
+        self.assertEqual(service.alternatives_used, 1)
+
+    async def test_failed_evaluation_falls_back_to_next_alternative(self) -> None:
+        first = "「DB」の件、リレーションのプロパティ設定画面を開いて対象DBを選んでみてください。"
+        claude = NBestClaude(first_content=first, eval_score=0.3)
+        llm_only = QualityScorer(uncertain_low=0.0, uncertain_high=1.01)
+        service = SecondaryJudgeService(claude=claude, candidates=3, quality_scorer=llm_only)
+
+        decision = await service.judge(dict(PAYLOAD))
+
+        self.assertEqual(decision.content, CLEAN)
+        self.assertNotIn("secondary_retry", [call["call_site"] for call in claude.calls])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+
+from services.primary_judge import PrimaryJudgeService
+from tests.primary_fakes import FakeGemini, primary_payload
+
+
+class PrefilterTest(unittest.IsolatedAsyncioTestCase):
+    async def test_prefilter_decides_before_llm(self) -> None:
+        gemini = FakeGemini()
+        service = PrimaryJudgeService(gemini=gemini)
+        busy = await service.judge(primary_payload("+1", activity=4))
+        mention = await service.judge({**primary_payload("hey", activity=0), "is_bot_mentioned": True})
+        ambiguous = await service.judge(primary_payload("hmm", activity=0))
+
+        self.assertEqual(gemini.calls, 1)
+        self.assertEqual((busy.stage, busy.needs_intervention), ("rule", False))
+        self.assertEqual((mention.stage, mention.needs_intervention), ("rule", True))
+        self.assertEqual(ambiguous.stage, "llm")
+        self.assertEqual(service.stage_counts["rule"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
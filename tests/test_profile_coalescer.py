@@ -0,0 +1,159 @@
+import asyncio
+import unittest
+
+from services.profile_coalescer import ProfileCoalescer
+
+
+class RecordingStorage:
+    def __init__(self) -> None:
+        self.saved: list[tuple[str, dict[str, object]]] = []
+        self.counters: list[dict[str, object] | None] = []
+
+    async def save_member_profile(
+        self,
+        member_id: str,
+        payload: dict[str, object],
+        counters: dict[str, object] | None = None,
+    ) -> None:
+        self.saved.append((member_id, payload))
+        self.counters.append(counters)
+
+
+class FailingStorage(RecordingStorage):
+    def __init__(self) -> None:
+        super().__init__()
+        self.fail = True
+
+    async def save_member_profile(
+        self,
+        member_id: str,
+        payload: dict[str, object],
+        counters: dict[str, object] | None = None,
+    ) -> None:
+        if self.fail:
+            raise RuntimeError("unavailable")
+        await super().save_member_profile(member_id, payload, counters)
+
+
+class SlowStorage(RecordingStorage):
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def save_member_profile(
+        self,
+        member_id: str,
+        payload: dict[str, object],
+        counters: dict[str, object] | None = None,
+    ) -> None:
+        self.started.set()
+        await self.release.wait()
+        await super().save_member_profile(member_id, payload, counters)
+
+
+class ProfileCoalescerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_coalesces_writes_within_window(self) -> None:
+        storage = RecordingStorage()
+        coalescer = ProfileCoalescer(storage=storage, window_seconds=3600)
+        for index in range(5):
+            await coalescer.submit("u1", {"total_posts": index})
+        self.assertEqual(storage.saved, [("u1", {"total_posts": 0})])
+        self.assertEqual(coalescer.dirty_count, 1)
+
+        await coalescer.close()
+        self.assertEqual(storage.saved[-1], ("u1", {"total_posts": 4}))
+        self.assertEqual(coalescer.dirty_count, 0)
+
+    async def test_eviction_flushes_dirty_profile(self) -> None:
+        storage = RecordingStorage()
+        coalescer = ProfileCoalescer(storage=storage, window_seconds=3600, max_members=1)
+        await coalescer.submit("u1", {"v": 1})
+        await coalescer.submit("u1", {"v": 2})
+        await coalescer.submit("u2", {"v": 1})
+        self.assertIn(("u1", {"v": 2}), storage.saved)
+        self.assertEqual(len(storage.saved), 3)
+
+    async def test_failed_save_during_eviction_keeps_the_profile(self) -> None:
+        storage = FailingStorage()
+        coalescer = ProfileCoalescer(storage=storage, window_seconds=3600, max_members=1)
+        await coalescer.submit("u1", {"v": 1}, counters={"stats": {"total_posts": 1}})
+        await coalescer.submit("u2", {"v": 1})
+        self.assertEqual(coalescer.dirty_count, 2)
+
+        storage.fail = False
+        await coalescer.flush_all()
+        self.assertIn(("u1", {"v": 1}), storage.saved)
+        self.assertIn({"stats": {"total_posts": 1}}, storage.counters)
+
+    async def test_persists_only_changed_fields(self) -> None:
+        storage = RecordingStorage()
+        coalescer = ProfileCoalescer(storage=storage, window_seconds=0)
+        base = {
+            "display_name": "alice",
+            "interests": {"topics": ["python"], "expertise": []},
+            "updated_at": 1,
+        }
+        await coalescer.submit("u1", base)
+        await coalescer.submit("u1", {**base, "updated_at": 2})
+        await coalescer.submit(
+            "u1",
+            {**base, "interests": {"topics": ["python", "rust"], "expertise": []}, "updated_at": 3},
+        )
+
+        self.assertEqual(len(storage.saved), 2)
+        self.assertEqual(
+            storage.saved[1],
+            ("u1", {"interests": {"topics": ["python", "rust"]}, "updated_at": 3}),
+        )
+
+    async def test_counters_accumulate_into_the_debounced_write(self) -> None:
+        storage = RecordingStorage()
+        coalescer = ProfileCoalescer(storage=storage, window_seconds=3600)
+        for channel in ["general", "general", "help"]:
+            await coalescer.submit(
+                "u1",
+                {"bio": "a"},
+                counters={"stats": {"total_posts": 1, "active_channel_counts": {channel: 1}}},
+            )
+        await coalescer.close()
+
+        self.assertEqual(len(storage.saved), 2)
+        self.assertEqual(
+            storage.counters[0],
+            {"stats": {"total_posts": 1, "active_channel_counts": {"general": 1}}},
+        )
+        self.assertEqual(storage.saved[1], ("u1", {}))
+        self.assertEqual(
+            storage.counters[1],
+            {"stats": {"total_posts": 2, "active_channel_counts": {"general": 1, "help": 1}}},
+        )
+
+    async def test_failed_write_keeps_pending_counters(self) -> None:
+        storage = FailingStorage()
+        coalescer = ProfileCoalescer(storage=storage, window_seconds=0)
+        await coalescer.submit("u1", {"bio": "a"}, counters={"stats": {"total_posts": 1}})
+        await coalescer.submit("u1", {"bio": "a"}, counters={"stats": {"total_posts": 1}})
+        storage.fail = False
+        await coalescer.flush_all()
+
+        self.assertEqual(storage.counters, [{"stats": {"total_posts": 2}}])
+
+    async def test_submit_during_slow_save_is_not_lost(self) -> None:
+        storage = SlowStorage()
+        coalescer = ProfileCoalescer(storage=storage, window_seconds=3600)
+        first = asyncio.create_task(coalescer.submit("u1", {"bio": "a", "posts": 1}))
+        await storage.started.wait()
+        await coalescer.submit("u1", {"bio": "b", "posts": 1})
+        storage.release.set()
+        await first
+
+        await coalescer.flush_all()
+        self.assertEqual(
+            storage.saved,
+            [("u1", {"bio": "a", "posts": 1}), ("u1", {"bio": "b"})],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
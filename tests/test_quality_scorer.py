@@ -0,0 +1,42 @@
+import unittest
+
+from services.quality_scorer import QualityScorer, calibration_report
+
+GOOD_REPLY = "「リレーションが組めない」とのこと、まず両方のDBが同じワークスペースにあるか確認してみてください。"
+
+
+class QualityScorerTest(unittest.TestCase):
+    def test_rubric_checks(self) -> None:
+        scorer = QualityScorer()
+
+        good = scorer.score(GOOD_REPLY)
+        self.assertEqual(good.failed, [])
+        self.assertFalse(scorer.is_uncertain(good.score))
+
+        bossy = scorer.score("そんなの常識です。自分で調べてください？本当に？")
+        self.assertIn("ng_pattern", bossy.failed)
+        self.assertIn("condescending", bossy.failed)
+        self.assertIn("extra_questions", bossy.failed)
+        self.assertLess(bossy.score, scorer.uncertain_low)
+
+        repeated = scorer.score(GOOD_REPLY, recent_posts=[GOOD_REPLY])
+        self.assertEqual(repeated.failed, ["repetition"])
+        # "おもしろい" must not trip the "しろ" ending.
+        self.assertEqual(scorer.score("「テンプレ」おもしろいですね、どこで見つけましたか").failed, [])
+
+    def test_calibration_report_fits_logged_scores(self) -> None:
+        records = [
+            {"type": "supplement", "content": GOOD_REPLY, "quality_score": 0.9},
+            {"type": "empathy", "content": "常識です", "quality_score": 0.2},
+            {"type": "silent", "content": "", "quality_score": 0.9},
+        ]
+
+        report = calibration_report(QualityScorer(), records)
+
+        self.assertEqual(report["samples"], 2)
+        self.assertAlmostEqual(report["mean_abs_error"], 0.0, places=3)
+        self.assertEqual(report["decided_agreement"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import time
+import unittest
+
+import anthropic
+import httpx
+
+from services.claude import _retry_delay
+from services.rate_limiter import RateLimiter, TokenBucket
+
+
+class RateLimiterTest(unittest.IsolatedAsyncioTestCase):
+    async def test_retries_retryable_errors_then_succeeds(self) -> None:
+        limiter = RateLimiter(name="test", max_retries=3, base_backoff_seconds=0.01)
+        attempts = 0
+
+        async def flaky() -> str:
+            nonlocal attempts
+            attempts += 1
+            if attempts < 3:
+                raise RuntimeError("overloaded")
+            return "ok"
+
+        result = await limiter.call(flaky, estimated_tokens=10, classify=lambda exc: 0.01)
+        self.assertEqual(result, "ok")
+        self.assertEqual(limiter.retries, 2)
+
+    async def test_non_retryable_error_is_raised_immediately(self) -> None:
+        limiter = RateLimiter(name="test", max_retries=3)
+        attempts = 0
+
+        async def broken() -> str:
+            nonlocal attempts
+            attempts += 1
+            raise ValueError("bad request")
+
+        with self.assertRaises(ValueError):
+            await limiter.call(broken, estimated_tokens=10, classify=lambda exc: None)
+        self.assertEqual(attempts, 1)
+
+    async def test_token_bucket_waits_for_refill(self) -> None:
+        bucket = TokenBucket(per_minute=6000)
+        self.assertEqual(await bucket.acquire(6000), 0.0)
+        started = time.monotonic()
+        waited = await bucket.acquire(10)
+        self.assertGreater(waited, 0.0)
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    def test_claude_rate_limit_honours_retry_after(self) -> None:
+        response = httpx.Response(
+            429,
+            headers={"retry-after": "7"},
+            request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"),
+        )
+        exc = anthropic.RateLimitError("rate limited", response=response, body=None)
+        self.assertEqual(_retry_delay(exc), 7.0)
+        self.assertIsNone(_retry_delay(ValueError("nope")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import unittest
+
+from services.quality_scorer import QualityScorer
+from services.secondary_judge import SecondaryJudgeService
+
+# Always defer to the scripted LLM evaluator.
+LLM_ONLY = QualityScorer(uncertain_low=0.0, uncertain_high=1.01)
+
+PAYLOAD = {"message_content": "DBの関係が組めません", "channel_type": "question"}
+
+
+class ScriptedClaude:
+    enabled = True
+    model_name = "scripted"
+
+    def __init__(self, first_type: str, first_score: float, retry_score: float = 0.9) -> None:
+        self.first_type = first_type
+        self.first_score = first_score
+        self.retry_score = retry_score
+        self.call_sites: list[object] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+
+    async def generate_json(self, system_prompt: str, payload: dict[str, object], **kwargs: object) -> str:
+        self.call_sites.append(kwargs.get("call_site"))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        call_site = kwargs.get("call_site")
+        if call_site == "quality_eval":
+            first = payload["generated_content"].endswith("first")
+            score = self.first_score if first else self.retry_score
+            return json.dumps({"quality_score": score, "needs_regeneration": score < 0.7})
+        retry = call_site == "secondary_retry"
+        return json.dumps(
+            {
+                "intervention_type": "supplement" if retry else self.first_type,
+                "content": "「DB」retry" if retry else "「DB」first",
+                "quality_score": 0.5,
+            }
+        )
+
+
+class SpeculativeQualityGateTest(unittest.IsolatedAsyncioTestCase):
+    async def test_evaluates_both_candidates_in_parallel(self) -> None:
+        claude = ScriptedClaude(first_type="supplement", first_score=0.3)
+        service = SecondaryJudgeService(claude=claude, speculative=True, quality_scorer=LLM_ONLY)
+
+        decision = await service.judge(dict(PAYLOAD))
+
+        self.assertEqual(decision.content, "「DB」retry")
+        self.assertEqual(claude.max_in_flight, 2)
+        self.assertEqual(service.speculation_stats, {"started": 1, "used": 1, "cancelled": 0})
+
+    async def test_silent_first_candidate_starts_no_speculation(self) -> None:
+        claude = ScriptedClaude(first_type="silent", first_score=0.9)
+        service = SecondaryJudgeService(claude=claude, speculative=True, quality_scorer=LLM_ONLY)
+
+        decision = await service.judge(dict(PAYLOAD))
+
+        self.assertEqual(decision.intervention_type, "silent")
+        self.assertEqual(claude.call_sites, ["secondary_generate"])
+        self.assertEqual(service.speculation_stats, {"started": 0, "used": 0, "cancelled": 0})
+
+    async def test_cancels_spare_candidate_when_first_passes(self) -> None:
+        claude = ScriptedClaude(first_type="supplement", first_score=0.9)
+        service = SecondaryJudgeService(claude=claude, speculative=True, quality_scorer=LLM_ONLY)
+
+        decision = await service.judge(dict(PAYLOAD))
+        await asyncio.sleep(0)
+
+        self.assertEqual(decision.content, "「DB」first")
+        self.assertEqual(service.speculation_stats, {"started": 1, "used": 0, "cancelled": 1})
+        self.assertEqual(claude.cancelled, 1)
+
+    async def test_worse_retry_is_not_counted_as_used(self) -> None:
+        claude = ScriptedClaude(first_type="supplement", first_score=0.5, retry_score=0.3)
+        service = SecondaryJudgeService(claude=claude, speculative=True, quality_scorer=LLM_ONLY)
+
+        decision = await service.judge(dict(PAYLOAD))
+
+        self.assertEqual(decision.content, "「DB」first")
+        self.assertEqual(service.speculation_stats, {"started": 1, "used": 0, "cancelled": 0})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from datetime import datetime, timezone
+
+from services.topic_ledger import TopicLedger
+
+
+class TopicLedgerTest(unittest.TestCase):
+    def test_record_answers_counts_and_slots(self) -> None:
+        ledger = TopicLedger()
+        ledger.record(
+            "t1",
+            {"channel_id": "100", "date_key": "2026-02-13", "hour_key": "2026-02-13-09"},
+        )
+        ledger.record(
+            "t2",
+            {"channel_id": "200", "date_key": "2026-02-13", "hour_key": "2026-02-13-10"},
+        )
+        ledger.record(
+            "t2",
+            {"channel_id": "200", "date_key": "2026-02-13", "hour_key": "2026-02-13-10"},
+        )
+        self.assertEqual(ledger.count_for_date("2026-02-13"), 2)
+        self.assertTrue(ledger.has_channel_hour("100", "2026-02-13-09"))
+        self.assertFalse(ledger.has_channel_hour("200", "2026-02-13-09"))
+        self.assertTrue(ledger.has_channel_date("200", "2026-02-13"))
+
+    def test_load_orders_recent_by_timestamp(self) -> None:
+        ledger = TopicLedger()
+        ledger.load(
+            [
+                {
+                    "topic_id": "new",
+                    "content": "b",
+                    "timestamp": datetime(2026, 2, 13, 10, tzinfo=timezone.utc),
+                },
+                {
+                    "topic_id": "old",
+                    "content": "a",
+                    "timestamp": datetime(2026, 2, 12, 10, tzinfo=timezone.utc),
+                },
+            ]
+        )
+        self.assertTrue(ledger.loaded)
+        self.assertEqual([item["topic_id"] for item in ledger.recent(10)], ["new", "old"])
+        self.assertEqual(len(ledger.recent(1)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
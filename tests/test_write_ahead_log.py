@@ -0,0 +1,121 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from google.cloud import firestore
+
+from services.firestore import FirestoreService
+from services.write_ahead_log import PendingWrite, WriteAheadLog, decode_value, encode_value
+
+
+class WriteAheadLogTest(unittest.TestCase):
+    def test_entries_survive_reopen_with_encoded_values(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "wal.sqlite3")
+            timestamp = datetime(2026, 2, 13, 9, 0, tzinfo=timezone.utc)
+            wal = WriteAheadLog(path)
+            wal.append(
+                [
+                    PendingWrite(
+                        "members",
+                        "u1",
+                        {
+                            "stats": {"total_posts": firestore.Increment(2)},
+                            "max_latency_seconds": firestore.Maximum(1.5),
+                            "at": timestamp,
+                        },
+                        merge=True,
+                    )
+                ]
+            )
+            wal.close()
+
+            reopened = WriteAheadLog(path)
+            self.assertEqual(reopened.depth, 1)
+            entry = reopened.peek(10)[0]
+            self.assertEqual(entry.write.data["at"], timestamp)
+            self.assertEqual(entry.write.data["stats"]["total_posts"].value, 2)
+            self.assertIsInstance(entry.write.data["max_latency_seconds"], firestore.Maximum)
+            reopened.ack([entry.seq])
+            self.assertEqual(reopened.depth, 0)
+            reopened.close()
+
+    def test_sentinels_round_trip_and_unknown_values_fail(self) -> None:
+        data = {
+            "bio": firestore.DELETE_FIELD,
+            "seen_at": firestore.SERVER_TIMESTAMP,
+            "roles": firestore.ArrayUnion(["helper"]),
+        }
+        decoded = decode_value(json.loads(json.dumps(encode_value(data))))
+        self.assertIs(decoded["bio"], firestore.DELETE_FIELD)
+        self.assertIs(decoded["seen_at"], firestore.SERVER_TIMESTAMP)
+        self.assertEqual(decoded["roles"].values, ["helper"])
+
+        with self.assertRaises(TypeError):
+            encode_value({"tags": {"a", "b"}})
+
+
+class WriteAheadLogGroupCommitTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_appends_share_commits_in_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            wal = WriteAheadLog(str(Path(tmp) / "wal.sqlite3"))
+            commits: list[int] = []
+            insert = wal._insert
+
+            def counting_insert(rows: list[tuple[object, ...]]) -> None:
+                commits.append(len(rows))
+                insert(rows)
+
+            wal._insert = counting_insert  # type: ignore[method-assign]
+            await asyncio.gather(
+                *(
+                    wal.append_async([PendingWrite("bot_actions", f"a{index}", {"n": index}, merge=True)])
+                    for index in range(10)
+                )
+            )
+
+            self.assertEqual(wal.depth, 10)
+            self.assertLess(len(commits), 10)
+            ids = [entry.write.document_id for entry in wal.peek(20)]
+            self.assertEqual(ids, [f"a{index}" for index in range(10)])
+            wal.close()
+
+
+class FlakyFirestoreService(FirestoreService):
+    def __init__(self, wal_path: str) -> None:
+        super().__init__(project_id=None)
+        self.enabled = True
+        self._client = object()
+        self._wal = WriteAheadLog(wal_path)
+        self.fail = True
+        self.committed: list[list[str]] = []
+
+    async def _commit(self, writes: list[PendingWrite]) -> None:
+        if self.fail:
+            raise ConnectionError("firestore unavailable")
+        self.committed.append([write.document_id for write in writes])
+
+
+class FirestoreWalDrainTest(unittest.IsolatedAsyncioTestCase):
+    async def test_failed_drain_keeps_writes_until_firestore_recovers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            service = FlakyFirestoreService(str(Path(tmp) / "wal.sqlite3"))
+            await service.save_bot_action("a1", {"type": "silent"})
+            await service.save_bot_action("a2", {"type": "silent"})
+            self.assertEqual(service.pending_writes, 2)
+
+            self.assertFalse(await service.flush())
+            self.assertEqual(service.pending_writes, 2)
+
+            service.fail = False
+            self.assertTrue(await service.flush())
+            self.assertEqual(service.pending_writes, 0)
+            self.assertEqual(service.committed, [["a1"], ["a2"]])
+            await service.close()
+
+
+if __name__ == "__main__":
+    unittest.main()